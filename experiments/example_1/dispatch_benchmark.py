@@ -0,0 +1,150 @@
+import argparse
+import inspect
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple, Optional, get_type_hints
+
+from pydejavu.core.dispatch_plan import DispatchPlan, format_result, validate_result
+from pydejavu.core.verify import Verify
+from pydejavu.utils.file_utils import FileUtils
+from pydejavu.utils.logger import Logger
+
+
+class StubTraceMonitor:
+    """A stand-in for the linked TraceMonitor which returns a constant verdict.
+
+    Using a stub removes the JVM evaluation cost from the measurement, so the benchmark
+    reports only the Python per-event dispatch overhead of PyDejaVu.
+    """
+
+    def config(self, *args) -> bool:
+        return True
+
+    def eval(self, event: str) -> str:
+        return "modified=true"
+
+
+class BaselinePlan(DispatchPlan):
+    """The per-event handler resolution of PyDejaVu before the dispatch plans, kept as the benchmark baseline.
+
+    Every event looks up its handler and its signature and type hints in caches, casts each argument by its
+    type hint, calls the handler and checks and formats its result, as `Verify.process_event` did before.
+    """
+
+    def __init__(self, plan: DispatchPlan, event_map: Dict[str, Callable]):
+        for slot in DispatchPlan.__slots__:
+            setattr(self, slot, getattr(plan, slot))
+        self.event_map = event_map
+        self.handler_info_cache: Dict[Callable, Dict[str, Any]] = {}
+
+    def dispatch(self, event_args: Any) -> Optional[str]:
+        handler = self.get_handler(self.event_name)
+        handler_info = self.get_handler_info(handler)
+        if len(event_args) != self.handler_info_cache[handler]["num_of_params"]:
+            raise ValueError(f"Event '{self.event_name}' expects {handler_info['num_of_params']} argument(s)")
+        type_hints, param_names = handler_info["type_hints"], handler_info["param_names"]
+        casted_args = [self.cast_value(arg, type_hints.get(param_names[i], Any)) if i < len(param_names) else arg
+                       for i, arg in enumerate(event_args)]
+        result = validate_result(handler(*casted_args))
+        if result is None or not result:
+            return None
+        return format_result(result)
+
+    @lru_cache(maxsize=128)
+    def get_handler(self, event_name: str) -> Optional[Callable]:
+        return self.event_map.get(event_name)
+
+    @lru_cache(maxsize=128)
+    def get_handler_info(self, handler: Callable) -> Dict[str, Any]:
+        if handler not in self.handler_info_cache:
+            sig = inspect.signature(handler)
+            self.handler_info_cache[handler] = {
+                'type_hints': get_type_hints(handler),
+                'param_names': list(sig.parameters.keys()),
+                'num_of_params': sum(1 for param in sig.parameters.values()
+                                     if param.default == param.empty and param.kind != param.VAR_POSITIONAL)
+            }
+        return self.handler_info_cache[handler]
+
+    @staticmethod
+    def cast_value(value: Any, target_type: type) -> Any:
+        if target_type == Any:
+            return value
+        try:
+            if target_type == bool:
+                return str(value).lower() in ('true', 't', 'yes', 'y', '1')
+            return target_type(value)
+        except (ValueError, TypeError) as e:
+            raise TypeError(f"Failed to cast the string '{value}' into {target_type} ({str(e)})")
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments for running the dispatch micro-benchmark.
+
+    Returns:
+        argparse.Namespace: The parsed arguments containing logfile and repeat count.
+    """
+    parser = argparse.ArgumentParser(description="Measure PyDejaVu per-event dispatch overhead.")
+    parser.add_argument(
+        '-l', '--logfile',
+        type=str,
+        default='log_100K.csv',
+        help='CSV filename to read events from (default: log_100K.csv).'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=5,
+        help='Number of measured runs, the best one is reported (default: 5).'
+    )
+    parser.add_argument(
+        '-b', '--baseline',
+        action='store_true',
+        help='Also measure the per-event handler resolution before the dispatch plans, for comparison.'
+    )
+    return parser.parse_args()
+
+
+def setup_verify(baseline: bool = False) -> Verify:
+    """Create a Verify instance over the stub monitor with the example_1 operational handler.
+
+    With `baseline`, the dispatch plans are replaced by the handler resolution they replaced.
+    """
+    verify = Verify(StubTraceMonitor(), i_statistics=False)
+
+    @verify.event("q")
+    def handle_q(arg_x: int, arg_y: int) -> Optional[Tuple[str | int, ...]]:
+        if arg_y > 10:
+            return "q", arg_x
+
+    if baseline:
+        dispatch_map = verify.event_mapper.dispatch_map
+        for event_name, plan in dispatch_map.items():
+            dispatch_map[event_name] = BaselinePlan(plan, verify.event_mapper.event_map)
+    return verify
+
+
+def main() -> None:
+    """Main function to execute the dispatch micro-benchmark."""
+    args = parse_arguments()
+    Logger(i_logging_level=logging.ERROR)
+
+    events = [event for chunk in FileUtils.read_events_from_file_as_string(args.logfile) for event in chunk]
+    print(f"Events: {len(events)}")
+
+    modes = [("Baseline", True), ("Dispatch plans", False)] if args.baseline else [("Dispatch plans", False)]
+    for mode, baseline in modes:
+        verify = setup_verify(baseline)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start_time = time.perf_counter()
+            verify.process_events(events)
+            best = min(best, time.perf_counter() - start_time)
+
+        print(f"{mode}: best of {args.repeat}: {best:.3f} seconds, "
+              f"per-event overhead: {best / len(events) * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import logging
+import time
+from typing import Optional, Tuple
+
+from pydejavu.core.monitor import Monitor
+from pydejavu.utils.file_utils import FileUtils
+from pydejavu.utils.logger import Logger
+
+# The example_1 specification of the events modified by the operational handler
+SPEC = """
+    prop modified: forall x . ( p(x) -> P q(x) )
+"""
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments for running the pipeline benchmark.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Compare the sequential and the pipelined event loops.")
+    parser.add_argument(
+        '-l', '--logfile',
+        type=str,
+        default='log_100K.csv',
+        help='CSV filename to read events from (default: log_100K.csv).'
+    )
+    parser.add_argument(
+        '-j', '--jar',
+        type=str,
+        default=None,
+        help='A monitor JAR compiled from SPEC by this PyDejaVu version, linked instead of building the '
+             'monitor (default: build the monitor from SPEC).'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=3,
+        help='Number of measured runs per mode, the best one is reported (default: 3).'
+    )
+    return parser.parse_args()
+
+
+def handle_q(arg_x: int, arg_y: int) -> Optional[Tuple[str | int, ...]]:
+    if arg_y > 10:
+        return "q", arg_x
+
+
+def setup_monitor(args: argparse.Namespace) -> Monitor:
+    """Create the monitor of SPEC, with the current PyDejaVu extensions, and its operational handler.
+
+    The monitor is linked as the process wide singleton (not isolated), as in the example_1 experiments.
+    """
+    if args.jar is None:
+        monitor = Monitor(i_spec=SPEC, i_statistics=False, i_logging_level=logging.ERROR)
+    else:
+        monitor = Monitor(i_statistics=False, i_logging_level=logging.ERROR)
+        monitor.linkage_monitor(args.jar)
+    monitor.register_event("q", handle_q)
+    return monitor
+
+
+def measure(args: argparse.Namespace, monitor: Monitor, pipelined: bool) -> float:
+    """Measure the best time of verifying the trace file, read lazily, in one mode."""
+    best = float('inf')
+    for _ in range(args.repeat):
+        monitor.reset()
+        start_time = time.perf_counter()
+        events = (event for chunk in FileUtils.read_events_from_file_as_string(args.logfile) for event in chunk)
+        for _ in monitor.verify.iter_events(events, pipelined=pipelined):
+            pass
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main() -> None:
+    """Main function to execute the pipeline benchmark."""
+    args = parse_arguments()
+    Logger(i_logging_level=logging.ERROR)
+
+    monitor = setup_monitor(args)
+    sequential = measure(args, monitor, False)
+    pipelined = measure(args, monitor, True)
+
+    print(f"Sequential: {sequential:.3f} seconds")
+    print(f"Pipelined:  {pipelined:.3f} seconds")
+    print(f"Speedup:    {sequential / pipelined:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
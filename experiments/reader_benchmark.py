@@ -0,0 +1,60 @@
+import argparse
+import glob
+import os
+import time
+from typing import Callable
+
+from pydejavu.utils.file_utils import FileUtils
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command-line arguments for running the trace reader benchmark.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Compare the csv based and the raw line trace readers.")
+    parser.add_argument(
+        '-l', '--logfiles',
+        type=str,
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'example_*', 'log_100K.csv'),
+        help='Glob pattern of the CSV files to read (default: example_*/log_100K.csv next to this script).'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=5,
+        help='Number of measured runs per reader, the best one is reported (default: 5).'
+    )
+    return parser.parse_args()
+
+
+def measure(read: Callable[[], int], repeat: int) -> float:
+    """Measure the best time of reading a whole trace file."""
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        read()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main() -> None:
+    """Main function to execute the trace reader benchmark."""
+    args = parse_arguments()
+
+    print(f"{'Trace':<40} {'Events':>8} {'csv':>9} {'raw':>9} {'Speedup':>8}")
+    for logfile in sorted(glob.glob(args.logfiles)):
+        def read(raw: bool) -> int:
+            return sum(len(chunk) for chunk in FileUtils.read_events_from_file_as_string(logfile, raw=raw))
+
+        events = read(True)
+        assert events == read(False)
+        csv_time = measure(lambda: read(False), args.repeat)
+        raw_time = measure(lambda: read(True), args.repeat)
+        name = os.path.relpath(logfile)
+        print(f"{name:<40} {events:>8} {csv_time:>8.3f}s {raw_time:>8.3f}s {csv_time / raw_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,779 @@
+import ast
+import inspect
+import json
+import math
+import textwrap
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pydejavu.core.dispatch_plan import DispatchPlan
+from pydejavu.utils.logger import Logger
+
+# The Scala types of the translated values
+LONG = 'Long'
+DOUBLE = 'Double'
+BOOLEAN = 'Boolean'
+STRING = 'String'
+MAP = 'scala.collection.mutable.HashMap[Any, Any]'
+
+NUMERIC = (LONG, DOUBLE)
+
+# The handler parameter types, and how the raw event arguments are cast into them (as `DispatchPlan` casts them)
+PARAMETER_TYPES: Dict[Any, Tuple[str, str]] = {
+    Any: (STRING, '{0}'),
+    str: (STRING, '{0}'),
+    int: (LONG, '{0}.trim.toLong'),
+    float: (DOUBLE, '{0}.trim.toDouble'),
+    bool: (BOOLEAN, 'to_bool({0})'),
+}
+
+ZERO = {LONG: '0L', DOUBLE: '0.0', BOOLEAN: 'false', STRING: 'null'}
+
+# Identifies a module global or closure variable: ('global', id of the module globals, name) or ('cell', id of the cell)
+StateKey = Tuple[Any, ...]
+
+
+class HandlerTranslation(NamedTuple):
+    """The outcome of translating the operational handlers.
+
+    Attributes:
+        class_name (str): The name of the generated Scala class.
+        source (Optional[str]): The Scala source of the class, None if no handler was translated.
+        translated (Tuple[str, ...]): The events whose handlers were translated.
+        untranslated (Dict[str, str]): The events whose handlers stay in Python, with the reason.
+    """
+
+    class_name: str
+    source: Optional[str]
+    translated: Tuple[str, ...]
+    untranslated: Dict[str, str]
+
+
+class _Unsupported(Exception):
+    """Raised when a handler leaves the supported subset."""
+
+    def __init__(self, i_node: Optional[ast.AST], i_reason: str):
+        line = getattr(i_node, 'lineno', None)
+        super().__init__(i_reason if line is None else f"{i_reason} (line {line})")
+
+
+class _State:
+    """A module global or closure variable of the handlers, kept in a field of the generated class."""
+
+    __slots__ = ['field', 'scala_type', 'value']
+
+    def __init__(self, i_field: str, i_scala_type: str, i_value: Any):
+        self.field = i_field
+        self.scala_type = i_scala_type
+        self.value = i_value
+
+
+class _Handler(NamedTuple):
+    """A translated handler."""
+
+    event_name: str
+    function: str
+    method: str
+    states: Set[StateKey]
+
+
+class HandlerTranslator:
+    """Translates operational handlers into Scala, so the JVM runs them without calling back into Python.
+
+    Only a restricted subset of Python is translated, which covers the typical handlers: counters and flags in
+    module global or closure variables (`global` / `nonlocal`), dictionaries of counters, comparisons, arithmetic,
+    `if` statements, and returning a renamed event (a tuple whose first item is the event name) or None.
+    The parameters have to be annotated with `int`, `float`, `bool` or `str` (or left unannotated). Anything
+    else (loops, calls other than a few builtins and `dict.get`, `last_eval`, shared variables, ...) keeps the
+    handler in Python, and the reason is reported.
+
+    The translated handlers become methods of a generated class implementing `java.util.function.Function`,
+    with the callback protocol of the JVM-driven trace loop (see `HandlerCallback`). The variables of the
+    handlers become fields of that class, initialized with their values at translation time. Once translated,
+    the handler state lives in the JVM only, so handlers sharing a variable with a handler which stays in
+    Python are kept in Python as well.
+    """
+
+    CLASS_NAME = "PyDejaVuHandlers"
+
+    def __init__(self, i_logger: Optional[Logger] = None):
+        """
+        Args:
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_states: Dict[StateKey, _State] = {}
+        self.__m_map_types: Dict[StateKey, str] = {}
+
+    def translate(self, i_handlers: Dict[str, Callable]) -> HandlerTranslation:
+        """
+        Translates the handlers which stay within the supported subset.
+
+        Args:
+            i_handlers (Dict[str, Callable]): The handler functions, by event name.
+
+        Returns:
+            HandlerTranslation: The generated Scala class, and which handlers were (not) translated.
+        """
+        translated: Dict[str, _Handler] = {}
+        untranslated: Dict[str, str] = {}
+        for index, (event_name, handler) in enumerate(i_handlers.items()):
+            try:
+                translated[event_name] = _HandlerBody(self, event_name, handler, f"handle_{index}").translate()
+            except _Unsupported as e:
+                untranslated[event_name] = str(e)
+            except (OSError, TypeError, SyntaxError) as e:
+                untranslated[event_name] = f"source not available ({e})"
+
+        # A variable cannot live both in the JVM and in Python
+        python_states = set()
+        for event_name in untranslated:
+            python_states |= self.__referenced_states(i_handlers[event_name])
+        demoted = True
+        while demoted:
+            demoted = False
+            for event_name, handler in list(translated.items()):
+                if handler.states & python_states:
+                    untranslated[event_name] = "shares a variable with a handler which stays in Python"
+                    python_states |= handler.states
+                    del translated[event_name]
+                    demoted = True
+
+        for event_name, reason in untranslated.items():
+            self.__m_logger.warning(f"The handler of event '{event_name}' stays in Python: {reason}")
+        if translated:
+            self.__m_logger.info(f"Translated the handlers of events {', '.join(translated)} into Scala")
+
+        source = self.__class_source(list(translated.values())) if translated else None
+        return HandlerTranslation(self.CLASS_NAME, source, tuple(translated), untranslated)
+
+    def state(self, i_key: StateKey, i_value: Any, i_node: ast.AST) -> _State:
+        """
+        Returns the field of a module global or closure variable, creating it on first use.
+
+        Args:
+            i_key (StateKey): The identity of the variable.
+            i_value (Any): The current value of the variable.
+            i_node (ast.AST): The node referencing the variable, for error reporting.
+
+        Returns:
+            _State: The field.
+
+        Raises:
+            _Unsupported: If the value has no Scala counterpart.
+        """
+        state = self.__m_states.get(i_key)
+        if state is None:
+            scala_type = MAP if isinstance(i_value, dict) else _scalar(i_value, i_node)[1]
+            if isinstance(i_value, dict):
+                for key, value in i_value.items():
+                    _literal(key, i_node)
+                    self.map_value_type(i_key, _scalar(value, i_node)[1], i_node)
+            state = self.__m_states[i_key] = _State(f"state_{len(self.__m_states)}", scala_type, i_value)
+        return state
+
+    def map_value_type(self, i_key: StateKey, i_scala_type: Optional[str], i_node: ast.AST) -> str:
+        """
+        Returns the type of the values of a dictionary variable, fixing it on first use.
+
+        Args:
+            i_key (StateKey): The identity of the dictionary variable.
+            i_scala_type (Optional[str]): The type of a value stored into (or read with a default from) the
+                dictionary, None for a plain read.
+            i_node (ast.AST): The node using the dictionary, for error reporting.
+
+        Returns:
+            str: The value type.
+
+        Raises:
+            _Unsupported: If the value types are mixed or unknown.
+        """
+        known = self.__m_map_types.get(i_key)
+        if i_scala_type is None:
+            if known is None:
+                raise _Unsupported(i_node, "the value type of the dictionary is unknown at its first read")
+            return known
+        if known is None:
+            self.__m_map_types[i_key] = known = i_scala_type
+        if known != i_scala_type:
+            raise _Unsupported(i_node, f"the dictionary mixes {known} and {i_scala_type} values")
+        return known
+
+    @staticmethod
+    def __referenced_states(i_handler: Callable) -> Set[StateKey]:
+        """
+        Over-approximates the module global and closure variables a handler references.
+
+        Args:
+            i_handler (Callable): The handler function.
+
+        Returns:
+            Set[StateKey]: The identities of the variables.
+        """
+        handler = inspect.unwrap(i_handler)
+        code = getattr(handler, '__code__', None)
+        if code is None:
+            return set()
+        module_globals = handler.__globals__
+        states = {('cell', id(cell)) for cell in handler.__closure__ or ()}
+        codes = [code]
+        while codes:
+            current = codes.pop()
+            states |= {('global', id(module_globals), name) for name in current.co_names if name in module_globals}
+            codes.extend(const for const in current.co_consts if inspect.iscode(const))
+        return states
+
+    def __class_source(self, i_handlers: List[_Handler]) -> str:
+        """
+        Generates the Scala class of the translated handlers.
+
+        Args:
+            i_handlers (List[_Handler]): The translated handlers.
+
+        Returns:
+            str: The Scala source.
+        """
+        used = set().union(*(handler.states for handler in i_handlers))
+        fields = []
+        for key, state in self.__m_states.items():
+            if key not in used:
+                continue
+            if state.scala_type == MAP:
+                entries = ", ".join(f"{_literal(k, None)[0]} -> {_literal(v, None)[0]}" for k, v in state.value.items())
+                fields.append(f"  private val {state.field} = {MAP}({entries})")
+            else:
+                fields.append(f"  private var {state.field}: {state.scala_type} = {_literal(state.value, None)[0]}")
+
+        cases = "\n".join(
+            f"      case {_string(handler.event_name)} => guarded(event, {handler.function}(fields))"
+            for handler in i_handlers)
+        methods = "\n".join(handler.method for handler in i_handlers)
+        return f"""// Generated by PyDejaVu from the operational handlers of events: {', '.join(h.event_name for h in i_handlers)}
+class {self.CLASS_NAME}(fallback: java.util.function.Function[String, String])
+    extends java.util.function.Function[String, String] {{
+{chr(10).join(fields)}
+
+  // A request holds the verdict mask of the previous event and the event, separated by a newline. Events
+  // without a translated handler are passed on to the fallback (the Python handlers).
+  override def apply(request: String): String = {{
+    val event = request.substring(request.indexOf('\\n') + 1)
+    val fields = event.split(",", -1)
+    fields(0) match {{
+{cases}
+      case _ => if (fallback == null) event else fallback.apply(request)
+    }}
+  }}
+
+  // As with the Python handlers, an argument which cannot be cast fails the evaluation, while any other
+  // error evaluates the original event.
+  private def guarded(event: String, handle: => String): String = {{
+    try {{
+      handle
+    }} catch {{
+      case e: IllegalArgumentException => throw e
+      case _: Exception => event
+    }}
+  }}
+
+  private def to_bool(value: String): Boolean = value.toLowerCase match {{
+    case "true" | "t" | "yes" | "y" | "1" => true
+    case _ => false
+  }}
+
+{methods}}}
+"""
+
+
+class _HandlerBody:
+    """Translates the body of a single handler."""
+
+    def __init__(self, i_translator: HandlerTranslator, i_event_name: str, i_handler: Callable, i_method: str):
+        self.__m_translator = i_translator
+        self.__m_event_name = i_event_name
+        self.__m_handler = inspect.unwrap(i_handler)
+        self.__m_method = i_method
+        self.__m_params: Dict[str, str] = {}
+        self.__m_locals: Dict[str, Optional[str]] = {}
+        self.__m_declared: Set[str] = set()
+        self.__m_states: Set[StateKey] = set()
+
+    def translate(self) -> _Handler:
+        """
+        Translates the handler into a method of the generated class.
+
+        Returns:
+            _Handler: The translated handler.
+
+        Raises:
+            _Unsupported: If the handler leaves the supported subset.
+        """
+        handler = self.__m_handler
+        if inspect.iscoroutinefunction(handler):
+            raise _Unsupported(None, "coroutine functions are not supported")
+        tree = ast.parse(textwrap.dedent(inspect.getsource(handler)))
+        ast.increment_lineno(tree, handler.__code__.co_firstlineno - 1)
+        function = tree.body[0]
+        if not isinstance(function, ast.FunctionDef):
+            raise _Unsupported(function, "only functions defined with 'def' are supported")
+
+        arguments = function.args
+        if arguments.vararg or arguments.kwarg or arguments.kwonlyargs or arguments.defaults or arguments.posonlyargs:
+            raise _Unsupported(function, "only plain positional parameters are supported")
+        type_hints = DispatchPlan(self.__m_event_name, handler).type_hints
+        lines = [f"    if (fields.length != {len(arguments.args) + 1}) throw new IllegalArgumentException("
+                 f"\"Event '{self.__m_event_name}' expects {len(arguments.args)} argument(s), but \" + "
+                 f"(fields.length - 1) + \" were given.\")"]
+        for index, argument in enumerate(arguments.args, 1):
+            parameter_type = PARAMETER_TYPES.get(type_hints.get(argument.arg, Any))
+            if parameter_type is None:
+                raise _Unsupported(argument, f"parameter '{argument.arg}' has an unsupported type annotation")
+            scala_type, cast = parameter_type
+            self.__m_params[argument.arg] = scala_type
+            lines.append(f"    var p_{argument.arg}: {scala_type} = {cast.format(f'fields({index})')}")
+
+        self.__scan_scope(function.body)
+        body = self.__block(function.body, 2)
+        for name, scala_type in self.__m_locals.items():
+            if scala_type is not None:
+                lines.append(f"    var l_{name}: {scala_type} = {ZERO[scala_type]}")
+        lines.extend(body)
+        lines.append("    null")
+
+        method = (f"  // {handler.__qualname__}, the handler of event '{self.__m_event_name}'\n"
+                  f"  private def {self.__m_method}(fields: Array[String]): String = {{\n"
+                  + "\n".join(lines) + "\n  }\n")
+        return _Handler(self.__m_event_name, self.__m_method, method, self.__m_states)
+
+    def __scan_scope(self, i_body: List[ast.stmt]) -> None:
+        """
+        Collects the `global` / `nonlocal` declarations and the local variables of the handler.
+
+        Args:
+            i_body (List[ast.stmt]): The function body.
+        """
+        for node in ast.walk(ast.Module(body=i_body, type_ignores=[])):
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                self.__m_declared.update(node.names)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                raise _Unsupported(node, "nested functions and classes are not supported")
+        for node in ast.walk(ast.Module(body=i_body, type_ignores=[])):
+            targets = node.targets if isinstance(node, ast.Assign) else \
+                [node.target] if isinstance(node, ast.AugAssign) else []
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id not in self.__m_declared \
+                        and target.id not in self.__m_params:
+                    self.__m_locals.setdefault(target.id, None)
+
+    def __block(self, i_body: List[ast.stmt], i_depth: int) -> List[str]:
+        """
+        Translates a list of statements.
+
+        Args:
+            i_body (List[ast.stmt]): The statements.
+            i_depth (int): The indentation depth.
+
+        Returns:
+            List[str]: The Scala lines.
+        """
+        lines = []
+        for statement in i_body:
+            lines.extend(self.__statement(statement, i_depth))
+        return lines
+
+    def __statement(self, i_node: ast.stmt, i_depth: int) -> List[str]:
+        """
+        Translates a statement.
+
+        Args:
+            i_node (ast.stmt): The statement.
+            i_depth (int): The indentation depth.
+
+        Returns:
+            List[str]: The Scala lines.
+        """
+        indent = "  " * i_depth
+        if isinstance(i_node, (ast.Pass, ast.Global, ast.Nonlocal)):
+            return []
+        if isinstance(i_node, ast.Expr) and isinstance(i_node.value, ast.Constant) \
+                and isinstance(i_node.value.value, str):
+            return []  # A docstring
+        if isinstance(i_node, ast.Assign):
+            if len(i_node.targets) != 1:
+                raise _Unsupported(i_node, "chained assignments are not supported")
+            return [indent + self.__assign(i_node.targets[0], self.__expression(i_node.value), i_node)]
+        if isinstance(i_node, ast.AugAssign):
+            value = self.__expression(ast.BinOp(left=i_node.target, op=i_node.op, right=i_node.value,
+                                                lineno=i_node.lineno, col_offset=i_node.col_offset))
+            return [indent + self.__assign(i_node.target, value, i_node)]
+        if isinstance(i_node, ast.If):
+            condition = self.__condition(i_node.test)
+            lines = [f"{indent}if ({condition}) {{"] + self.__block(i_node.body, i_depth + 1)
+            if i_node.orelse:
+                lines.append(f"{indent}}} else {{")
+                lines.extend(self.__block(i_node.orelse, i_depth + 1))
+            lines.append(f"{indent}}}")
+            return lines
+        if isinstance(i_node, ast.Return):
+            return [f"{indent}return {self.__result(i_node.value)}"]
+        if isinstance(i_node, ast.Delete) and len(i_node.targets) == 1 \
+                and isinstance(i_node.targets[0], ast.Subscript):
+            state, key = self.__map_subscript(i_node.targets[0])
+            return [f"{indent}if ({state.field}.remove({key}).isEmpty) "
+                    f"throw new NoSuchElementException(String.valueOf({key}))"]
+        if isinstance(i_node, ast.Expr):
+            raise _Unsupported(i_node, "expression statements (e.g., calls for their side effects) are not supported")
+        raise _Unsupported(i_node, f"'{type(i_node).__name__}' statements are not supported")
+
+    def __assign(self, i_target: ast.expr, i_value: Tuple[str, str], i_node: ast.AST) -> str:
+        """
+        Translates an assignment.
+
+        Args:
+            i_target (ast.expr): The assignment target.
+            i_value (Tuple[str, str]): The translated value and its type.
+            i_node (ast.AST): The assignment, for error reporting.
+
+        Returns:
+            str: The Scala statement.
+        """
+        code, scala_type = i_value
+        if isinstance(i_target, ast.Subscript):
+            state, key = self.__map_subscript(i_target)
+            self.__m_translator.map_value_type(self.__state_key(i_target.value), scala_type, i_node)
+            return f"{state.field}({key}) = {code}"
+        if not isinstance(i_target, ast.Name):
+            raise _Unsupported(i_node, "only assignments to variables and dictionary items are supported")
+
+        name = i_target.id
+        if name in self.__m_params:
+            return f"p_{name} = {self.__coerce(code, scala_type, self.__m_params[name], i_node)}"
+        if name in self.__m_locals:
+            if self.__m_locals[name] is None:
+                self.__m_locals[name] = scala_type
+            return f"l_{name} = {self.__coerce(code, scala_type, self.__m_locals[name], i_node)}"
+        state = self.__state(i_target)
+        if state.scala_type == MAP:
+            raise _Unsupported(i_node, f"reassigning the dictionary '{name}' is not supported")
+        return f"{state.field} = {self.__coerce(code, scala_type, state.scala_type, i_node)}"
+
+    @staticmethod
+    def __coerce(i_code: str, i_type: str, i_target_type: str, i_node: ast.AST) -> str:
+        """
+        Converts a value into the type of the variable it is assigned to.
+
+        Returns:
+            str: The converted value.
+
+        Raises:
+            _Unsupported: If the variable would change its type.
+        """
+        if i_type == i_target_type:
+            return i_code
+        if i_type == LONG and i_target_type == DOUBLE:
+            return f"({i_code}).toDouble"
+        raise _Unsupported(i_node, f"a {i_target_type} variable cannot be assigned a {i_type} value")
+
+    def __result(self, i_node: Optional[ast.expr]) -> str:
+        """
+        Translates the value returned by the handler into the modified event (null to skip the event).
+
+        Args:
+            i_node (Optional[ast.expr]): The returned value.
+
+        Returns:
+            str: The Scala expression.
+        """
+        if i_node is None or (isinstance(i_node, ast.Constant) and i_node.value is None):
+            return "null"
+        if not isinstance(i_node, (ast.Tuple, ast.List)) or not i_node.elts:
+            raise _Unsupported(i_node, "only None or a tuple starting with the event name can be returned")
+        items = [self.__expression(item) for item in i_node.elts]
+        if items[0][1] != STRING:
+            raise _Unsupported(i_node, "the first item of the returned tuple must be a string")
+        # The items are formatted as by `format_result`
+        return " + \",\" + ".join(f"({code}).toLong" if scala_type == DOUBLE else f"({code})"
+                                  for code, scala_type in items)
+
+    def __condition(self, i_node: ast.expr) -> str:
+        code, scala_type = self.__expression(i_node)
+        if scala_type != BOOLEAN:
+            raise _Unsupported(i_node, "conditions must be boolean expressions")
+        return code
+
+    def __expression(self, i_node: ast.expr) -> Tuple[str, str]:
+        """
+        Translates an expression.
+
+        Args:
+            i_node (ast.expr): The expression.
+
+        Returns:
+            Tuple[str, str]: The Scala expression and its type.
+        """
+        if isinstance(i_node, ast.Constant):
+            return _scalar(i_node.value, i_node)
+        if isinstance(i_node, ast.Name):
+            return self.__name(i_node)
+        if isinstance(i_node, ast.BinOp):
+            return self.__binary(i_node)
+        if isinstance(i_node, ast.UnaryOp):
+            code, scala_type = self.__expression(i_node.operand)
+            if isinstance(i_node.op, ast.Not) and scala_type == BOOLEAN:
+                return f"!({code})", BOOLEAN
+            if isinstance(i_node.op, ast.USub) and scala_type in NUMERIC:
+                return f"-({code})", scala_type
+            raise _Unsupported(i_node, f"unsupported unary operation on a {scala_type} value")
+        if isinstance(i_node, ast.BoolOp):
+            operator = " && " if isinstance(i_node.op, ast.And) else " || "
+            return operator.join(f"({self.__condition(value)})" for value in i_node.values), BOOLEAN
+        if isinstance(i_node, ast.Compare):
+            return self.__compare(i_node)
+        if isinstance(i_node, ast.IfExp):
+            condition = self.__condition(i_node.test)
+            (body, body_type), (orelse, orelse_type) = self.__expression(i_node.body), self.__expression(i_node.orelse)
+            if body_type != orelse_type:
+                raise _Unsupported(i_node, "both branches of a conditional expression must have the same type")
+            return f"(if ({condition}) {body} else {orelse})", body_type
+        if isinstance(i_node, ast.Subscript):
+            state, key = self.__map_subscript(i_node)
+            scala_type = self.__m_translator.map_value_type(self.__state_key(i_node.value), None, i_node)
+            return f"{state.field}({key}).asInstanceOf[{scala_type}]", scala_type
+        if isinstance(i_node, ast.Call):
+            return self.__call(i_node)
+        raise _Unsupported(i_node, f"'{type(i_node).__name__}' expressions are not supported")
+
+    def __name(self, i_node: ast.Name) -> Tuple[str, str]:
+        name = i_node.id
+        if name in self.__m_params:
+            return f"p_{name}", self.__m_params[name]
+        if name in self.__m_locals:
+            if self.__m_locals[name] is None:
+                raise _Unsupported(i_node, f"variable '{name}' is used before it is assigned")
+            return f"l_{name}", self.__m_locals[name]
+        state = self.__state(i_node)
+        if state.scala_type == MAP:
+            raise _Unsupported(i_node, f"the dictionary '{name}' can only be indexed or used with 'get' and 'in'")
+        return state.field, state.scala_type
+
+    def __binary(self, i_node: ast.BinOp) -> Tuple[str, str]:
+        (left, left_type), (right, right_type) = self.__expression(i_node.left), self.__expression(i_node.right)
+        operator = i_node.op
+        if isinstance(operator, ast.Add) and left_type == right_type == STRING:
+            return f"({left} + {right})", STRING
+        if left_type not in NUMERIC or right_type not in NUMERIC:
+            raise _Unsupported(i_node, f"unsupported operation on {left_type} and {right_type} values")
+        result_type = LONG if left_type == right_type == LONG else DOUBLE
+        if isinstance(operator, (ast.Add, ast.Sub, ast.Mult)):
+            symbol = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*'}[type(operator)]
+            return f"({left} {symbol} {right})", result_type
+        if isinstance(operator, ast.Div):
+            return f"(({left}).toDouble / {right})", DOUBLE
+        if result_type == LONG and isinstance(operator, ast.FloorDiv):
+            return f"Math.floorDiv({left}, {right})", LONG
+        if result_type == LONG and isinstance(operator, ast.Mod):
+            return f"Math.floorMod({left}, {right})", LONG
+        raise _Unsupported(i_node, f"the '{type(operator).__name__}' operation is not supported")
+
+    def __compare(self, i_node: ast.Compare) -> Tuple[str, str]:
+        operands = [i_node.left] + i_node.comparators
+        parts = []
+        for left_node, operator, right_node in zip(operands, i_node.ops, operands[1:]):
+            if isinstance(operator, (ast.In, ast.NotIn)):
+                negation = "!" if isinstance(operator, ast.NotIn) else ""
+                if isinstance(right_node, ast.Name) and self.__is_map(right_node):
+                    parts.append(f"{negation}{self.__state(right_node).field}.contains({self.__key(left_node)})")
+                    continue
+                (left, left_type), (right, right_type) = self.__expression(left_node), self.__expression(right_node)
+                if left_type != STRING or right_type != STRING:
+                    raise _Unsupported(i_node, "'in' is only supported on dictionaries and strings")
+                parts.append(f"{negation}{right}.contains({left})")
+                continue
+
+            (left, left_type), (right, right_type) = self.__expression(left_node), self.__expression(right_node)
+            comparable = (left_type in NUMERIC and right_type in NUMERIC) or left_type == right_type
+            if not comparable:
+                raise _Unsupported(i_node, f"cannot compare {left_type} and {right_type} values")
+            if isinstance(operator, (ast.Eq, ast.NotEq)):
+                parts.append(f"({left} {'==' if isinstance(operator, ast.Eq) else '!='} {right})")
+                continue
+            symbol = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>='}.get(type(operator))
+            if symbol is None:
+                raise _Unsupported(i_node, f"the '{type(operator).__name__}' comparison is not supported")
+            if left_type == STRING:
+                parts.append(f"({left}.compareTo({right}) {symbol} 0)")
+            elif left_type in NUMERIC:
+                parts.append(f"({left} {symbol} {right})")
+            else:
+                raise _Unsupported(i_node, f"cannot order {left_type} values")
+        return " && ".join(parts), BOOLEAN
+
+    def __call(self, i_node: ast.Call) -> Tuple[str, str]:
+        if i_node.keywords:
+            raise _Unsupported(i_node, "keyword arguments are not supported")
+        function = i_node.func
+        if isinstance(function, ast.Attribute) and function.attr == 'get' \
+                and isinstance(function.value, ast.Name) and self.__is_map(function.value):
+            if len(i_node.args) != 2:
+                raise _Unsupported(i_node, "'get' is only supported with a default value")
+            state = self.__state(function.value)
+            default, default_type = self.__expression(i_node.args[1])
+            scala_type = self.__m_translator.map_value_type(self.__state_key(function.value), default_type, i_node)
+            return (f"{state.field}.getOrElse({self.__key(i_node.args[0])}, {default}).asInstanceOf[{scala_type}]",
+                    scala_type)
+
+        handler = self.__m_handler
+        if not isinstance(function, ast.Name) or function.id in self.__m_params or function.id in self.__m_locals \
+                or function.id in handler.__code__.co_freevars or function.id in handler.__globals__:
+            raise _Unsupported(i_node, "only the builtins abs, int, len, max, min, str and dict.get can be called")
+        arguments = [self.__expression(argument) for argument in i_node.args]
+        types = {scala_type for _, scala_type in arguments}
+        name = function.id
+        if name == 'len' and len(i_node.args) == 1 and isinstance(i_node.args[0], ast.Name) \
+                and self.__is_map(i_node.args[0]):
+            return f"{self.__state(i_node.args[0]).field}.size.toLong", LONG
+        if len(arguments) == 1:
+            code, scala_type = arguments[0]
+            if name == 'len' and scala_type == STRING:
+                return f"{code}.length.toLong", LONG
+            if name == 'abs' and scala_type in NUMERIC:
+                return f"Math.abs({code})", scala_type
+            if name == 'str' and scala_type in (LONG, STRING):
+                return f"String.valueOf({code})", STRING
+            if name == 'int' and scala_type in NUMERIC:
+                return f"({code}).toLong", LONG
+            if name == 'int' and scala_type == STRING:
+                return f"{code}.trim.toLong", LONG
+            if name == 'int' and scala_type == BOOLEAN:
+                return f"(if ({code}) 1L else 0L)", LONG
+        if name in ('min', 'max') and len(arguments) >= 2 and len(types) == 1 and types <= set(NUMERIC):
+            code = arguments[0][0]
+            for argument, _ in arguments[1:]:
+                code = f"Math.{name}({code}, {argument})"
+            return code, types.pop()
+        raise _Unsupported(i_node, f"unsupported call of '{name}'")
+
+    def __key(self, i_node: ast.expr) -> str:
+        """
+        Translates a dictionary key, a value or a tuple of values (a Scala tuple, compared by value).
+
+        Returns:
+            str: The Scala expression.
+        """
+        if isinstance(i_node, ast.Tuple):
+            items = ", ".join(self.__expression(item)[0] for item in i_node.elts)
+            if len(i_node.elts) == 1:
+                return f"Tuple1({items})"
+            if not 1 < len(i_node.elts) <= 22:
+                raise _Unsupported(i_node, "unsupported dictionary key")
+            return f"({items})"
+        return self.__expression(i_node)[0]
+
+    def __map_subscript(self, i_node: ast.Subscript) -> Tuple[_State, str]:
+        if not isinstance(i_node.value, ast.Name) or not self.__is_map(i_node.value):
+            raise _Unsupported(i_node, "only dictionary variables can be indexed")
+        key = i_node.slice.value if isinstance(i_node.slice, ast.Index) else i_node.slice  # Python < 3.9
+        return self.__state(i_node.value), self.__key(key)
+
+    def __is_map(self, i_node: ast.Name) -> bool:
+        name = i_node.id
+        if name in self.__m_params or name in self.__m_locals:
+            return False
+        return self.__state(i_node).scala_type == MAP
+
+    def __state_key(self, i_node: ast.expr) -> StateKey:
+        """
+        Resolves a module global or closure variable of the handler.
+
+        Args:
+            i_node (ast.expr): The variable reference.
+
+        Returns:
+            StateKey: The identity of the variable.
+
+        Raises:
+            _Unsupported: If the name is not a module global or closure variable.
+        """
+        if not isinstance(i_node, ast.Name):
+            raise _Unsupported(i_node, "unsupported variable reference")
+        handler = self.__m_handler
+        name = i_node.id
+        free_variables = handler.__code__.co_freevars
+        if name in free_variables:
+            return ('cell', id(handler.__closure__[free_variables.index(name)]))
+        if name in handler.__globals__:
+            return ('global', id(handler.__globals__), name)
+        raise _Unsupported(i_node, f"'{name}' is not a parameter, a local, a global or a closure variable")
+
+    def __variable_value(self, i_node: ast.Name) -> Any:
+        handler = self.__m_handler
+        free_variables = handler.__code__.co_freevars
+        if i_node.id in free_variables:
+            try:
+                return handler.__closure__[free_variables.index(i_node.id)].cell_contents
+            except ValueError:
+                raise _Unsupported(i_node, f"closure variable '{i_node.id}' is not assigned yet")
+        return handler.__globals__[i_node.id]
+
+    def __state(self, i_node: ast.Name) -> _State:
+        key = self.__state_key(i_node)
+        self.__m_states.add(key)
+        return self.__m_translator.state(key, self.__variable_value(i_node), i_node)
+
+
+def _string(i_value: str) -> str:
+    """
+    Returns a Scala string literal.
+
+    Args:
+        i_value (str): The string.
+
+    Returns:
+        str: The literal.
+    """
+    return json.dumps(i_value)
+
+
+def _scalar(i_value: Any, i_node: Optional[ast.AST]) -> Tuple[str, str]:
+    """
+    Translates a constant value which is not a tuple.
+
+    Args:
+        i_value (Any): The value.
+        i_node (Optional[ast.AST]): The node holding the value, for error reporting.
+
+    Returns:
+        Tuple[str, str]: The Scala literal and its type.
+
+    Raises:
+        _Unsupported: If the value has no Scala counterpart.
+    """
+    if isinstance(i_value, tuple):
+        raise _Unsupported(i_node, "tuples are only supported as dictionary keys")
+    return _literal(i_value, i_node)
+
+
+def _literal(i_value: Any, i_node: Optional[ast.AST]) -> Tuple[str, str]:
+    """
+    Translates a constant value.
+
+    Args:
+        i_value (Any): The value.
+        i_node (Optional[ast.AST]): The node holding the value, for error reporting.
+
+    Returns:
+        Tuple[str, str]: The Scala literal and its type (the tuple type for tuples, which are dictionary keys).
+
+    Raises:
+        _Unsupported: If the value has no Scala counterpart.
+    """
+    if isinstance(i_value, bool):
+        return ("true" if i_value else "false"), BOOLEAN
+    if isinstance(i_value, int) and -2 ** 63 <= i_value < 2 ** 63:
+        return (f"{i_value}L" if i_value > -2 ** 63 else "Long.MinValue"), LONG
+    if isinstance(i_value, float) and math.isfinite(i_value):
+        return repr(i_value), DOUBLE
+    if isinstance(i_value, str):
+        return _string(i_value), STRING
+    if isinstance(i_value, tuple) and 0 < len(i_value) <= 22:
+        items = [_literal(item, i_node)[0] for item in i_value]
+        return (f"Tuple1({items[0]})" if len(items) == 1 else f"({', '.join(items)})"), 'Tuple'
+    raise _Unsupported(i_node, f"values of type '{type(i_value).__name__}' are not supported")
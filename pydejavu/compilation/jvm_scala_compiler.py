@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from typing import List, Optional
+
+from pydejavu.jni.jni_config import JNIConfig
+from pydejavu.utils.logger import Logger
+
+
+class JVMScalaCompiler:
+    """Class to compile Scala sources with the Scala compiler (`scala.tools.nsc`) inside the embedded JVM.
+
+    Running `scalac` as a subprocess boots a new compiler JVM for every monitor. This class instead keeps
+    a single `scala.tools.nsc.Global` per process and runs each compilation as a new `Run` of it, so the
+    compiler classes are loaded (and JIT compiled) only once. This makes repeated compilations (e.g.,
+    regenerating monitors for many specifications in one process) much faster.
+
+    The Scala compiler JARs (`scala-compiler.jar` and `scala-reflect.jar`) are taken from `$SCALA_HOME/lib`,
+    or from the `lib` directory of the installation the `scalac` on the PATH belongs to. They must be on the
+    classpath of the JVM, so `register_classpath` has to be called before the JVM is started.
+    """
+
+    COMPILER_JARS = ('scala-compiler.jar', 'scala-reflect.jar')
+
+    # The warm compiler is shared by the whole process. The compiler is not thread safe, hence the lock.
+    __global = None
+    __reporter = None
+    __classpath: Optional[str] = None
+    __lock = threading.Lock()
+
+    def __init__(self, i_dejavu_jar: str, i_logger: Optional[Logger] = None):
+        """
+        Initializes the JVMScalaCompiler.
+
+        Args:
+            i_dejavu_jar (str): Path to the dejavu.jar file, which is on the classpath of the compiled sources.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_dejavu_jar = i_dejavu_jar
+
+    @staticmethod
+    def compiler_jars() -> Optional[List[str]]:
+        """
+        Locates the Scala compiler JARs.
+
+        Returns:
+            Optional[List[str]]: The paths to the Scala compiler JARs, or None if they could not be found.
+        """
+        lib_dirs = []
+        if os.environ.get('SCALA_HOME'):
+            lib_dirs.append(os.path.join(os.environ['SCALA_HOME'], 'lib'))
+        scalac = shutil.which("scalac")
+        if scalac is not None:
+            lib_dirs.append(os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(scalac))), 'lib'))
+
+        for lib_dir in lib_dirs:
+            jars = [os.path.join(lib_dir, jar) for jar in JVMScalaCompiler.COMPILER_JARS]
+            if all(os.path.isfile(jar) for jar in jars):
+                return jars
+        return None
+
+    @staticmethod
+    def register_classpath() -> bool:
+        """
+        Registers the Scala compiler JARs for the classpath of the embedded JVM.
+
+        Returns:
+            bool: True if the compiler is (or will be) available inside the JVM, False otherwise.
+        """
+        jars = JVMScalaCompiler.compiler_jars()
+        return jars is not None and all([JNIConfig.register_path(jar) for jar in jars])
+
+    def compile_to_jar(self, i_source: str, i_jar_path: str) -> str:
+        """
+        Compiles a Scala source file into a JAR file.
+
+        Args:
+            i_source (str): Path to the Scala source file.
+            i_jar_path (str): Path to the JAR file to generate.
+
+        Returns:
+            str: Path to the compiled JAR file.
+
+        Raises:
+            RuntimeError: If the compiler is not available in the JVM or the compilation fails.
+        """
+        classes_dir = tempfile.mkdtemp(prefix='pydejavu-scalac-')
+        try:
+            self.compile_to_dir(i_source, classes_dir)
+            with zipfile.ZipFile(i_jar_path, 'w', zipfile.ZIP_DEFLATED) as jar:
+                for root, _, files in os.walk(classes_dir):
+                    for name in files:
+                        path = os.path.join(root, name)
+                        jar.write(path, os.path.relpath(path, classes_dir))
+        finally:
+            shutil.rmtree(classes_dir, ignore_errors=True)
+
+        self.__m_logger.info(f"In-JVM compilation successful. JAR file generated at: {i_jar_path}")
+        return i_jar_path
+
+    def compile_to_dir(self, i_source: str, i_dest_dir: str) -> None:
+        """
+        Compiles a Scala source file into class files.
+
+        Args:
+            i_source (str): Path to the Scala source file.
+            i_dest_dir (str): The directory for the class files.
+
+        Raises:
+            RuntimeError: If the compiler is not available in the JVM or the compilation fails.
+        """
+        if not self.register_classpath():
+            raise RuntimeError("The Scala compiler is not on the classpath of the JVM")
+
+        with JVMScalaCompiler.__lock:
+            compiler = self.__warm_compiler()
+            reporter = JVMScalaCompiler.__reporter
+
+            from jnius import autoclass
+            reporter.reset()
+            compiler.settings().outputDirs().setSingleOutput(i_dest_dir)
+            sources = getattr(autoclass('scala.collection.immutable.Nil$'), 'MODULE$')
+            sources = getattr(sources, '$colon$colon')(os.path.abspath(i_source))
+            autoclass('scala.tools.nsc.Global$Run')(compiler).compile(sources)
+
+            if reporter.hasErrors():
+                raise RuntimeError(f"Compilation of {i_source} failed:\n{reporter.infos().mkString(os.linesep)}")
+
+    def __warm_compiler(self):
+        """
+        Returns the process wide compiler instance, creating it on first use (or when the classpath changed).
+
+        Returns:
+            The `scala.tools.nsc.Global` instance.
+        """
+        classpath = os.pathsep.join(['.', self.__m_dejavu_jar])
+        if JVMScalaCompiler.__global is not None and JVMScalaCompiler.__classpath == classpath:
+            return JVMScalaCompiler.__global
+
+        JNIConfig(i_logger=self.__m_logger).init_jnius_config()
+        from jnius import autoclass
+        settings = autoclass('scala.tools.nsc.Settings')()
+        settings.processArgumentString(f"-classpath {classpath} -nowarn")
+        reporter_class = autoclass('scala.tools.nsc.reporters.StoreReporter')
+        try:
+            reporter = reporter_class(settings)  # Scala 2.13
+        except Exception:
+            reporter = reporter_class()  # Scala 2.12
+
+        JVMScalaCompiler.__global = autoclass('scala.tools.nsc.Global')(settings, reporter)
+        JVMScalaCompiler.__reporter = reporter
+        JVMScalaCompiler.__classpath = classpath
+        self.__m_logger.info("Scala compiler instance created inside the JVM")
+        return JVMScalaCompiler.__global
@@ -0,0 +1,313 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
+from pydejavu.utils.file_lock import FileLock
+from pydejavu.utils.logger import Logger
+
+
+class MonitorCache:
+    """A persistent, content-addressed cache of compiled monitors.
+
+    Each entry is keyed by a hash of the specification text, the dejavu.jar content, the PyDejaVu
+    monitor extensions (and their rewrite of the synthesized source) and the Scala compiler in use
+    (`scalac`, or the compiler JARs of the in-JVM compilation). A warm start can therefore link the cached
+    `TraceMonitor.jar` directly, skipping both the synthesis and the compilation subprocesses.
+
+    The cache directory defaults to `$PYDEJAVU_CACHE_DIR`, or `~/.cache/pydejavu/monitors` if unset.
+    Every entry is a sub-directory named by its key, holding `TraceMonitor.jar` and `meta.json`.
+    """
+
+    JAR_NAME = "TraceMonitor.jar"
+    META_NAME = "meta.json"
+
+    def __init__(
+            self,
+            i_cache_dir: Optional[str] = None,
+            i_dejavu_jar: Optional[str] = None,
+            i_compiler_jars: Optional[List[str]] = None,
+            i_logger: Optional[Logger] = None):
+        """
+        Initializes the MonitorCache.
+
+        Args:
+            i_cache_dir (str, optional): The cache directory. Defaults to `$PYDEJAVU_CACHE_DIR` or
+                `~/.cache/pydejavu/monitors`.
+            i_dejavu_jar (str, optional): Path to the dejavu.jar file. Defaults to 'libs/dejavu.jar'.
+            i_compiler_jars (List[str], optional): The Scala compiler JARs, if the monitors are compiled inside
+                the JVM (see `JVMScalaCompiler`). Defaults to None, for monitors compiled by `scalac`.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_cache_dir = self.default_dir() if i_cache_dir is None else i_cache_dir
+        self.__m_dejavu_jar = os.path.join(Path(__file__).resolve().parent.parent, 'libs', 'dejavu.jar')\
+            if i_dejavu_jar is None else i_dejavu_jar
+        self.__m_compiler_jars = i_compiler_jars
+        self.__m_toolchain_digest: Optional[str] = None
+
+    @staticmethod
+    def default_dir() -> str:
+        """
+        Returns:
+            str: The default cache directory.
+        """
+        return os.environ.get('PYDEJAVU_CACHE_DIR',
+                              os.path.join(os.path.expanduser('~'), '.cache', 'pydejavu', 'monitors'))
+
+    @property
+    def directory(self) -> str:
+        return self.__m_cache_dir
+
+    def key(self, i_specification: str, i_operational_spec: Optional[str] = None) -> str:
+        """
+        Computes the cache key of a specification.
+
+        Args:
+            i_specification (str): The QTL specification.
+            i_operational_spec (str, optional): The declarative operational-phase specification (pqtl) synthesized
+                into the monitor, if any. Defaults to None.
+
+        Returns:
+            str: The hexadecimal cache key.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.__toolchain_digest().encode())
+        digest.update(i_specification.strip().encode())
+        if i_operational_spec is not None:
+            digest.update(b"\0pqtl\0")
+            digest.update(i_operational_spec.strip().encode())
+        return digest.hexdigest()
+
+    def lookup(self, i_key: str) -> Optional[str]:
+        """
+        Looks up a compiled monitor in the cache.
+
+        Args:
+            i_key (str): The cache key.
+
+        Returns:
+            Optional[str]: The path to the cached monitor JAR, or None on a cache miss.
+        """
+        jar_path = os.path.join(self.__m_cache_dir, i_key, self.JAR_NAME)
+        if not os.path.isfile(jar_path):
+            self.__m_logger.info(f"Monitor cache miss ({i_key[:12]})")
+            return None
+
+        # Record the access time, used for eviction of the least recently used entries
+        os.utime(jar_path)
+        self.__m_logger.info(f"Monitor cache hit ({i_key[:12]}): {jar_path}")
+        return jar_path
+
+    def store(self, i_key: str, i_jar_path: str, i_specification: str) -> str:
+        """
+        Stores a compiled monitor in the cache.
+
+        The JAR is copied next to its final location and then atomically renamed into place,
+        so readers never observe a partially written entry. Writers of the same entry are serialized
+        by a lock file, and an entry already published by a concurrent build is kept as is.
+
+        Args:
+            i_key (str): The cache key.
+            i_jar_path (str): The path to the compiled monitor JAR.
+            i_specification (str): The specification the monitor was synthesized from.
+
+        Returns:
+            str: The path to the cached monitor JAR.
+        """
+        entry_dir = os.path.join(self.__m_cache_dir, i_key)
+        jar_path = os.path.join(entry_dir, self.JAR_NAME)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        with FileLock(os.path.join(self.__m_cache_dir, f".{i_key}.lock")):
+            if os.path.isfile(jar_path):
+                self.__m_logger.info(f"Monitor already published to cache ({i_key[:12]}): {jar_path}")
+                return jar_path
+            self.__publish(entry_dir, i_key, i_jar_path, i_specification)
+
+        self.__m_logger.info(f"Monitor stored in cache ({i_key[:12]}): {jar_path}")
+        return jar_path
+
+    def __publish(self, i_entry_dir: str, i_key: str, i_jar_path: str, i_specification: str) -> None:
+        """
+        Writes the metadata and the JAR of an entry. The JAR is written last, as its presence marks a complete entry.
+
+        Args:
+            i_entry_dir (str): The entry directory.
+            i_key (str): The cache key.
+            i_jar_path (str): The path to the compiled monitor JAR.
+            i_specification (str): The specification the monitor was synthesized from.
+        """
+        meta = {
+            'key': i_key,
+            'created': time.time(),
+            'dejavu_jar': self.__m_dejavu_jar,
+            'specification': i_specification,
+        }
+        self.__atomic_write(i_entry_dir, self.META_NAME, lambda f: f.write(json.dumps(meta, indent=2).encode()))
+
+        with open(i_jar_path, 'rb') as source:
+            self.__atomic_write(i_entry_dir, self.JAR_NAME, lambda f: shutil.copyfileobj(source, f))
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Lists the cache entries.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per entry with its 'key', 'size' (bytes), 'created' and
+            'last_used' timestamps and the 'specification', sorted from the most recently used.
+        """
+        if not os.path.isdir(self.__m_cache_dir):
+            return []
+
+        entries = []
+        for key in os.listdir(self.__m_cache_dir):
+            jar_path = os.path.join(self.__m_cache_dir, key, self.JAR_NAME)
+            if not os.path.isfile(jar_path):
+                continue
+            meta = self.__read_meta(key)
+            stat = os.stat(jar_path)
+            entries.append({
+                'key': key,
+                'size': stat.st_size,
+                'created': meta.get('created', stat.st_mtime),
+                'last_used': stat.st_mtime,
+                'specification': meta.get('specification', ''),
+            })
+        return sorted(entries, key=lambda entry: entry['last_used'], reverse=True)
+
+    def evict(self, i_key: str) -> bool:
+        """
+        Removes a single entry from the cache.
+
+        Args:
+            i_key (str): The cache key, or a unique prefix of it.
+
+        Returns:
+            bool: True if an entry was removed, False otherwise.
+        """
+        matches = [entry['key'] for entry in self.entries() if entry['key'].startswith(i_key)]
+        if len(matches) != 1:
+            if matches:
+                self.__m_logger.warning(f"Cache key prefix '{i_key}' is ambiguous: {len(matches)} entries match")
+            return False
+
+        shutil.rmtree(os.path.join(self.__m_cache_dir, matches[0]), ignore_errors=True)
+        self.__m_logger.info(f"Monitor evicted from cache ({matches[0][:12]})")
+        return True
+
+    def prune(self, i_max_age_days: Optional[float] = None, i_max_entries: Optional[int] = None) -> int:
+        """
+        Evicts entries not used for a while, and/or the least recently used entries beyond a limit.
+
+        Args:
+            i_max_age_days (float, optional): Entries not used for longer than this are evicted.
+            i_max_entries (int, optional): At most this number of most recently used entries are kept.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        entries = self.entries()
+        stale = []
+        if i_max_age_days is not None:
+            threshold = time.time() - i_max_age_days * 24 * 60 * 60
+            stale.extend(entry for entry in entries if entry['last_used'] < threshold)
+        if i_max_entries is not None:
+            stale.extend(entries[i_max_entries:])
+
+        keys = {entry['key'] for entry in stale}
+        for key in keys:
+            self.evict(key)
+        return len(keys)
+
+    def clear(self) -> int:
+        """
+        Removes all entries from the cache.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        return self.prune(i_max_entries=0)
+
+    def __toolchain_digest(self) -> str:
+        """
+        Computes (once) the digest of everything besides the specification which affects the compiled monitor.
+
+        Returns:
+            str: The hexadecimal digest.
+        """
+        if self.__m_toolchain_digest is None:
+            digest = hashlib.sha256()
+            if os.path.isfile(self.__m_dejavu_jar):
+                with open(self.__m_dejavu_jar, 'rb') as jar:
+                    for block in iter(lambda: jar.read(1 << 20), b''):
+                        digest.update(block)
+            digest.update("".join(MonitorExtensions.EXTENSIONS + [MonitorExtensions.PRE_SUBMIT]).encode())
+
+            # The source rewrite, which changes the compiled monitor just as much as the injected extensions
+            digest.update(f"\0rewrite-{MonitorExtensions.VERSION}\0".encode())
+            for pattern in (MonitorExtensions.PRE_MONITOR, MonitorExtensions.PROPERTY_MONITOR,
+                            MonitorExtensions.SUBMIT_CALL, MonitorExtensions.ONLINE_MONITOR):
+                digest.update(f"{pattern.pattern}\0".encode())
+            try:
+                digest.update(inspect.getsource(MonitorExtensions.extend_source).encode())
+            except (OSError, TypeError):
+                # No source is available (e.g., a bytecode-only installation), the version stands for the rewrite
+                pass
+
+            # The compiler backend, and the version of its files
+            if self.__m_compiler_jars is not None:
+                digest.update(b"\0jvm\0")
+                compiler_files = list(self.__m_compiler_jars)
+            else:
+                digest.update(b"\0scalac\0")
+                scalac = shutil.which("scalac")
+                compiler_files = [] if scalac is None else [scalac]
+            for path in map(os.path.realpath, compiler_files):
+                stat = os.stat(path)
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\0".encode())
+
+            self.__m_toolchain_digest = digest.hexdigest()
+        return self.__m_toolchain_digest
+
+    def __read_meta(self, i_key: str) -> Dict[str, Any]:
+        """
+        Reads the metadata of an entry.
+
+        Args:
+            i_key (str): The cache key.
+
+        Returns:
+            Dict[str, Any]: The metadata, or an empty dictionary if it is missing or unreadable.
+        """
+        try:
+            with open(os.path.join(self.__m_cache_dir, i_key, self.META_NAME), 'r') as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def __atomic_write(i_dir: str, i_name: str, i_write) -> None:
+        """
+        Writes a file through a temporary file in the same directory, renamed into place once complete.
+
+        Args:
+            i_dir (str): The target directory.
+            i_name (str): The target file name.
+            i_write (Callable): Writes the content into the given binary file object.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=i_dir, prefix=f".{i_name}.")
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                i_write(tmp_file)
+            os.replace(tmp_path, os.path.join(i_dir, i_name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
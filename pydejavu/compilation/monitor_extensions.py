@@ -0,0 +1,352 @@
+import re
+from typing import List, Optional
+
+from pydejavu.utils.logger import Logger
+
+
+class MonitorExtensions:
+    """Class to extend a synthesized TraceMonitor.scala with PyDejaVu specific entry points.
+
+    DejaVu synthesizes a `TraceMonitor` Scala object which only exposes a single event `eval` method.
+    This class injects additional methods into that object (before it is compiled), which are then
+    available through JNI once the monitor is linked. The injection is idempotent, so running it
+    twice on the same source file leaves the file unchanged.
+    """
+
+    MARKER = "// PyDejaVu extensions"
+
+    # The version of the source rewrite (`extend_source`), part of the monitor cache key. Bump it with every change
+    # to the rewrite that does not change the injected extensions.
+    VERSION = 1
+
+    SUBMIT = """
+  // Submits an event to the online monitor.
+  private def submit_event(name: String, args: List[Any]): Map[String, Boolean] = online_monitor.submit(name, args)
+"""
+
+    PRE_SUBMIT = """
+  // The verdicts of the last submitted event, returned for the events the pre-monitor skips (all properties hold
+  // before the first event)
+  private var last_verdicts: Map[String, Boolean] = null
+
+  // Submits an event to the online monitor through the pre-monitor synthesized from the operational specification,
+  // as submitCSVFile does: the pre-monitor may replace the event by its output, or skip it.
+  private def submit_event(name: String, args: List[Any]): Map[String, Boolean] = {
+    if (last_verdicts == null) last_verdicts = online_monitor.formulae.map(formula => formula.name -> true).toMap
+    if (Options.PRE_PREDICTION) {
+      online_monitor.preMonitor_(name, args: _*) match {
+        case Some(first :: second :: _) =>
+          last_verdicts = online_monitor.submit(first.toString, second.asInstanceOf[List[Any]])
+        case Some(event_name: String) =>
+          if (event_name != "skip") last_verdicts = online_monitor.submit(event_name, Nil)
+        case Some(other) =>
+          throw new IllegalStateException(s"Unexpected event structure output from the pre processing: $other")
+        case None =>
+          last_verdicts = online_monitor.submit(name, args)
+      }
+    } else {
+      last_verdicts = online_monitor.submit(name, args)
+    }
+    last_verdicts
+  }
+"""
+
+    BATCH_EVAL = """
+  // Evaluates a whole chunk of events in a single call.
+  // A null entry in the returned array marks an event whose evaluation failed.
+  def eval_batch(events: Array[String]): Array[String] = {
+    val results = new Array[String](events.length)
+    var i = 0
+    while (i < events.length) {
+      results(i) = try {
+        eval(events(i))
+      } catch {
+        case _: Throwable => null
+      }
+      i += 1
+    }
+    results
+  }
+"""
+
+    STRUCTURED_EVAL = """
+  // Returns the property names in the fixed order used by the verdict bitmasks.
+  def properties(): Array[String] = online_monitor.formulae.map(_.name).toArray
+
+  // The mask of a control event whose result is not a verdict of the properties (e.g. #end#)
+  val CONTROL_MASK: Long = -2L
+
+  // The control events of the template
+  private def control_event(name: String): Boolean = name == "#init#" || name == "#end#" || name == "#skip#"
+
+  // Evaluates an event and returns its verdicts as a bitmask, where bit i holds the verdict
+  // of the i-th property returned by properties(). The control events of the template (#init#, #end#
+  // and #skip#) are evaluated by eval, and yield the mask of its result if it holds the verdicts of
+  // all the properties, or CONTROL_MASK otherwise.
+  def eval_mask(event: String): Long = {
+    val input = event.split(",")
+    val name = input.headOption.getOrElse("")
+    if (control_event(name)) {
+      val verdicts = eval(event).split(",").map(_.split("=")).collect {
+        case Array(property, verdict) => property -> (verdict == "true")
+      }.toMap
+      if (online_monitor.formulae.forall(formula => verdicts.contains(formula.name))) {
+        var mask = 0L
+        var bit = 0
+        for (formula <- online_monitor.formulae) {
+          if (verdicts(formula.name)) mask |= (1L << bit)
+          bit += 1
+        }
+        mask
+      } else {
+        CONTROL_MASK
+      }
+    } else {
+      val args = if (input.length > 1 && input(1).startsWith("[")) {
+        List(input.tail.mkString(", "))
+      } else {
+        input.tail.toList
+      }
+      online_monitor.lineNr += 1
+      val resultMap: Map[String, Boolean] = submit_event(name, args)
+      var mask = 0L
+      var bit = 0
+      for (formula <- online_monitor.formulae) {
+        if (resultMap(formula.name)) mask |= (1L << bit)
+        bit += 1
+      }
+      mask
+    }
+  }
+
+  // Batch variant of eval_mask. An entry of -1 marks an event whose evaluation failed.
+  def eval_batch_mask(events: Array[String]): Array[Long] = {
+    val results = new Array[Long](events.length)
+    var i = 0
+    while (i < events.length) {
+      results(i) = try {
+        eval_mask(events(i))
+      } catch {
+        case _: Throwable => -1L
+      }
+      i += 1
+    }
+    results
+  }
+"""
+
+    LINES_EVAL = """
+  // Variants of the batch entry points taking the events as one newline separated string, for callers
+  // which reach the monitor through reflection and cannot pass arrays (e.g., an isolated class loader).
+  def eval_batch_lines(events: String): Array[String] = eval_batch(events.split("\\n"))
+
+  def eval_batch_mask_lines(events: String): Array[Long] = eval_batch_mask(events.split("\\n"))
+"""
+
+    RESET = """
+  // Replaces the online monitor by a fresh instance (new property state, line number and error counters),
+  // so another trace can be verified in the same JVM. As with the original lazy val, the instance is created
+  // on first use, i.e., under the configuration set by config().
+  final class PyDejaVuLazy[T](create: () => T) {
+    lazy val value: T = create()
+  }
+
+  private var online_monitor_holder = new PyDejaVuLazy(() => new_online_monitor())
+
+  def reset(): Unit = {
+    online_monitor_holder = new PyDejaVuLazy(() => new_online_monitor())
+  }
+"""
+
+    FILE_EVAL = """
+  // Evaluates all the events of a CSV trace file inside the JVM, so no event crosses JNI. Empty lines are
+  // skipped and the records are parsed as Python's csv module does (see csv_event). Control events are
+  // evaluated, but hold no verdicts. Returns the number of events, then the number of violations of each
+  // property (in the order of properties()), then the indices of the first maxIndices violating events.
+  def eval_file(path: String, maxIndices: Int): Array[Long] = eval_file_with(path, maxIndices, "", null)
+
+  // Like eval_file, but the events whose name is one of the (newline separated) handled names are first passed
+  // to the callback, as "<verdict mask of the previous event>\\n<event>". The callback returns the event to
+  // evaluate, or null to skip it. The other events never leave the JVM.
+  def eval_file_with(
+      path: String,
+      maxIndices: Int,
+      handled: String,
+      callback: java.util.function.Function[String, String]): Array[Long] = {
+    val handledNames = handled.split("\\n").filter(_.nonEmpty).toSet
+    val counts = new Array[Long](online_monitor.formulae.length)
+    val indices = scala.collection.mutable.ArrayBuffer[Long]()
+    val reader = new java.io.BufferedReader(new java.io.FileReader(path), 1 << 16)
+    var events = 0L
+    var lastMask = 0L
+    try {
+      var line = reader.readLine()
+      while (line != null) {
+        if (!line.isEmpty) {
+          var event = csv_event(line, reader)
+          if (handledNames.nonEmpty && handledNames.contains(event_name(event))) {
+            event = callback.apply(lastMask.toString + "\\n" + event)
+          }
+          // Control events hold no verdicts, so the verdicts of the previous event remain the last ones
+          val mask = if (event == null) CONTROL_MASK else eval_mask(event)
+          if (mask != CONTROL_MASK && !control_event(event_name(event))) {
+            lastMask = mask
+            var violated = false
+            var bit = 0
+            while (bit < counts.length) {
+              if ((mask & (1L << bit)) == 0) {
+                counts(bit) += 1
+                violated = true
+              }
+              bit += 1
+            }
+            if (violated && indices.length < maxIndices) indices += events
+          }
+          events += 1
+        }
+        line = reader.readLine()
+      }
+    } finally {
+      reader.close()
+    }
+    (Array(events) ++ counts ++ indices).toArray
+  }
+
+  private def event_name(event: String): String = {
+    val comma = event.indexOf(',')
+    if (comma < 0) event else event.substring(0, comma)
+  }
+
+  // Parses the CSV record starting with the given line into an event, as Python's csv module does: a quote
+  // opens a quoted field only at the start of a field, and a quoted field may span several lines, which are
+  // then read from the reader as well.
+  private def csv_event(line: String, reader: java.io.BufferedReader): String = {
+    if (line.indexOf('"') < 0) {
+      line
+    } else {
+      val fields = scala.collection.mutable.ArrayBuffer[String]()
+      val field = new StringBuilder
+      // 0: start of a field, 1: unquoted field, 2: quoted field, 3: quote within a quoted field
+      var state = 0
+      var current = line
+      while (current != null) {
+        var i = 0
+        while (i < current.length) {
+          val c = current.charAt(i)
+          if (state == 2) {
+            if (c == '"') state = 3 else field += c
+          } else if (state == 3 && c == '"') {
+            field += '"'
+            state = 2
+          } else if (c == ',') {
+            fields += field.toString
+            field.clear()
+            state = 0
+          } else if (state == 0 && c == '"') {
+            state = 2
+          } else {
+            field += c
+            state = 1
+          }
+          i += 1
+        }
+        if (state == 2) {
+          current = reader.readLine()
+          if (current != null) field += '\n'
+        } else {
+          current = null
+        }
+      }
+      fields += field.toString
+      fields.mkString(",")
+    }
+  }
+"""
+
+    EXTENSIONS: List[str] = [SUBMIT, BATCH_EVAL, STRUCTURED_EVAL, LINES_EVAL, RESET, FILE_EVAL]
+
+    # The pre-monitor DejaVu synthesizes from an operational specification (`--prefile`)
+    PRE_MONITOR = re.compile(r'^object PreMonitor extends PreMonitorTrait\b', re.MULTILINE)
+    PROPERTY_MONITOR = re.compile(r'new PropertyMonitor\(\s*null\s*\)')
+    SUBMIT_CALL = re.compile(r'\bonline_monitor\.submit\(')
+
+    # The single line `lazy val online_monitor` definition, which RESET turns into a resettable definition
+    ONLINE_MONITOR = re.compile(
+        r'^(?P<indent>[ \t]*)(?P<modifiers>(?:private |protected )?)lazy val online_monitor'
+        r'(?P<type>\s*:\s*[^=\n]+?)?\s*=\s*(?P<expression>[^\n]+)$',
+        re.MULTILINE)
+
+    def __init__(self, i_logger: Optional[Logger] = None):
+        """
+        Initializes the MonitorExtensions instance.
+
+        Args:
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+
+    def extend(self, i_source: str) -> bool:
+        """
+        Injects the PyDejaVu extensions into the given TraceMonitor.scala file.
+
+        Args:
+            i_source (str): Path to the synthesized TraceMonitor.scala file.
+
+        Returns:
+            bool: True if the extensions are present in the source after the call, False if the source
+            does not define a `TraceMonitor` object and therefore could not be extended.
+        """
+        with open(i_source, 'r') as source_file:
+            source = source_file.read()
+
+        if self.MARKER in source:
+            return True
+
+        extended = self.extend_source(source)
+        if extended is None:
+            self.__m_logger.warning(f"No TraceMonitor object found in {i_source}, extensions were not injected")
+            return False
+
+        with open(i_source, 'w') as source_file:
+            source_file.write(extended)
+
+        self.__m_logger.info(f"PyDejaVu extensions injected into {i_source}")
+        return True
+
+    def extend_source(self, i_source_code: str) -> Optional[str]:
+        """
+        Returns the given Scala source code with the PyDejaVu extensions injected into the `TraceMonitor` object.
+
+        Args:
+            i_source_code (str): The synthesized Scala source code.
+
+        Returns:
+            Optional[str]: The extended source code, or None if no `TraceMonitor` object was found.
+        """
+        match = re.search(r'^object TraceMonitor \{[^\n]*\n', i_source_code, re.MULTILINE)
+        if match is None:
+            return None
+
+        extensions = self.EXTENSIONS
+        body = i_source_code[match.end():]
+        resettable = self.ONLINE_MONITOR.search(body)
+        if self.PRE_MONITOR.search(i_source_code) is not None:
+            # The online monitor is created without the pre-monitor, and the synthesized eval submits events to it
+            # directly, so both are routed through the pre-monitor. The pre-monitor is a singleton object whose
+            # state cannot be recreated, so such a monitor cannot be reset.
+            extensions = [self.PRE_SUBMIT if extension is self.SUBMIT else extension
+                          for extension in extensions if extension is not self.RESET]
+            body = self.PROPERTY_MONITOR.sub('new PropertyMonitor(PreMonitor)', body)
+            body = self.SUBMIT_CALL.sub('submit_event(', body)
+        elif resettable is None:
+            self.__m_logger.info("No single line online_monitor definition found, the monitor cannot be reset")
+            extensions = [extension for extension in extensions if extension is not self.RESET]
+        else:
+            indent, modifiers, result_type = resettable.group('indent', 'modifiers', 'type')
+            result_type = result_type.strip() if result_type else ""
+            body = body[:resettable.start()] + (
+                f"{indent}{modifiers}def online_monitor{result_type} = online_monitor_holder.value\n"
+                f"{indent}private def new_online_monitor(){result_type} = {resettable.group('expression')}"
+            ) + body[resettable.end():]
+
+        return i_source_code[:match.end()] + f"  {self.MARKER}\n" + "".join(extensions) + "\n" + body
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from pydejavu.utils.logger import Logger
+
+
+class MonitorWorkspace:
+    """A private build directory for the synthesis and compilation of a single monitor.
+
+    DejaVu and scalac write their artifacts (`output/TraceMonitor.scala`, `output/TraceMonitor.jar`, ...)
+    relative to the working directory, so monitors built concurrently (a process pool, pytest-xdist,
+    batch jobs) would overwrite each other's files. Each workspace is a uniquely named directory with
+    its own `output` sub-directory, which the build steps use instead of the shared working directory.
+
+    Layout:
+        <root>/pydejavu-build-XXXXXXXX/
+            output/
+                TraceMonitor.scala
+                TraceMonitor.jar
+                ast.dot
+    """
+
+    OUTPUT_DIR = "output"
+    SOURCE_NAME = "TraceMonitor.scala"
+    JAR_NAME = "TraceMonitor.jar"
+
+    def __init__(self, i_root: Optional[str] = None, i_logger: Optional[Logger] = None):
+        """
+        Creates a new workspace.
+
+        Args:
+            i_root (str, optional): The directory the workspace is created in. Defaults to the system
+                temporary directory.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        if i_root is not None:
+            os.makedirs(i_root, exist_ok=True)
+        self.__m_directory = os.path.abspath(tempfile.mkdtemp(prefix='pydejavu-build-', dir=i_root))
+        os.makedirs(self.output_dir)
+        self.__m_logger.debug(f"Monitor workspace created: {self.__m_directory}")
+
+    @property
+    def directory(self) -> str:
+        return self.__m_directory
+
+    @property
+    def output_dir(self) -> str:
+        return os.path.join(self.__m_directory, self.OUTPUT_DIR)
+
+    @property
+    def source(self) -> str:
+        return os.path.join(self.output_dir, self.SOURCE_NAME)
+
+    @property
+    def jar(self) -> str:
+        return os.path.join(self.output_dir, self.JAR_NAME)
+
+    def cleanup(self) -> None:
+        """
+        Removes the workspace with all of its artifacts.
+        """
+        shutil.rmtree(self.__m_directory, ignore_errors=True)
+        self.__m_logger.debug(f"Monitor workspace removed: {self.__m_directory}")
+
+    def __enter__(self) -> 'MonitorWorkspace':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cleanup()
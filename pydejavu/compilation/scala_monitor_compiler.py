@@ -4,6 +4,8 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+from pydejavu.compilation.jvm_scala_compiler import JVMScalaCompiler
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
 from pydejavu.utils.logger import Logger
 
 
@@ -17,15 +19,20 @@ class ScalaMonitorCompiler:
             i_dejavu: Optional[str] = None,
             i_source: Optional[str] = None,
             i_dest: str = "output",
-            i_logger: Optional[Logger] = None):
+            i_logger: Optional[Logger] = None,
+            i_in_process: bool = False):
         """
         Initialize the DejaVuMonitorCompiler.
 
         Args:
             i_dejavu (str): Path to the dejavu.jar file.
             i_source (str): Path to the scala source file that needs to be compiled
-            i_dest (str): Path to the output directory containing TraceMonitor.scala.
+            i_dest (str): Path to the output directory containing TraceMonitor.scala, into which the
+                monitor is compiled.
             i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+            i_in_process (bool, optional): Whether to compile with a warm Scala compiler inside the embedded JVM
+                instead of a `scalac` subprocess. The subprocess is used as a fallback if the in-process
+                compilation fails. Defaults to False.
         """
 
         self.__m_logger = Logger() if i_logger is None else i_logger
@@ -34,6 +41,7 @@ class ScalaMonitorCompiler:
         self.__m_dest = i_dest
         self.__m_compiled_jar_path = os.path.join(self.__m_dest, "TraceMonitor.jar")
         self.__m_source = os.path.join(self.__m_dest, "TraceMonitor.scala") if i_source is None else i_source
+        self.__m_in_process = i_in_process
 
     @property
     def jar(self) -> str:
@@ -57,18 +65,21 @@ class ScalaMonitorCompiler:
         if not os.path.exists(self.__m_source):
             raise FileNotFoundError(f"TraceMonitor.scala not found in {self.__m_dest}")
 
+        # Inject the PyDejaVu entry points (e.g., batch evaluation) before compiling
+        MonitorExtensions(i_logger=self.__m_logger).extend(self.__m_source)
+
         res = None
         if generate_jar:
             res = self._compile_to_jar(self.__m_source)
+            self.__cleanup()
         else:
             self._compile_to_class(self.__m_source)
 
-        self.__cleanup()
         return res
 
     def _compile_to_class(self, trace_monitor_path: str) -> None:
         """
-        Compile TraceMonitor.scala to class files.
+        Compile TraceMonitor.scala to class files in the output directory.
 
         Args:
             trace_monitor_path (str): Path to TraceMonitor.scala file.
@@ -76,10 +87,18 @@ class ScalaMonitorCompiler:
         Raises:
             subprocess.CalledProcessError: If compilation fails.
         """
+        if self.__m_in_process:
+            try:
+                JVMScalaCompiler(self.__m_dejavu_jar, i_logger=self.__m_logger).compile_to_dir(trace_monitor_path, self.__m_dest)
+                return
+            except Exception as e:
+                self.__m_logger.warning(f"In-JVM compilation failed ({e}), falling back to scalac")
+
         cmd = [
             "scalac",
             "-cp", f".:{self.__m_dejavu_jar}",
-            trace_monitor_path
+            trace_monitor_path,
+            "-d", self.__m_dest
         ]
 
         try:
@@ -102,6 +121,12 @@ class ScalaMonitorCompiler:
         Raises:
             subprocess.CalledProcessError: If compilation fails.
         """
+        if self.__m_in_process:
+            try:
+                return JVMScalaCompiler(self.__m_dejavu_jar, i_logger=self.__m_logger)\
+                    .compile_to_jar(trace_monitor_path, self.__m_compiled_jar_path)
+            except Exception as e:
+                self.__m_logger.warning(f"In-JVM compilation failed ({e}), falling back to scalac")
 
         cmd = [
             "scalac",
@@ -120,16 +145,14 @@ class ScalaMonitorCompiler:
 
     def __cleanup(self) -> None:
         """
-        Remove all .class files in the current directory and the output directory.
+        Remove stray .class files from the output directory after a JAR compilation.
+
+        Only the output directory of this compiler is touched (never the current working directory),
+        so compilers working on different output directories do not interfere with each other.
         """
-        # Remove .class files in the current directory
-        for class_file in glob.glob("*.class"):
+        for class_file in glob.glob(os.path.join(self.__m_dest, "*.class")):
             os.remove(class_file)
 
-        # # Remove .class files in the output directory
-        # for class_file in glob.glob(os.path.join(self.output_dir, "*.class")):
-        #     os.remove(class_file)
-
         self.__m_logger.info("Cleanup completed. All .class files have been removed.")
 
 
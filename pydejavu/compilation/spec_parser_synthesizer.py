@@ -1,13 +1,40 @@
 import os
 import re
+import shutil
 import subprocess
 import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 
+from pydejavu.utils.file_lock import FileLock
 from pydejavu.utils.logger import Logger
 
 
+@lru_cache(maxsize=None)
+def _scala_thunk_class() -> type:
+    """
+    Defines (once) the jnius proxy class implementing `scala.Function0`, which requires a running JVM.
+
+    Returns:
+        type: The proxy class, constructed with the Python function it runs.
+    """
+    from jnius import PythonJavaClass, java_method
+
+    class ScalaThunk(PythonJavaClass):
+        __javainterfaces__ = ['scala/Function0']
+
+        def __init__(self, i_run: Callable[[], None]):
+            super().__init__()
+            self.run = i_run
+
+        @java_method('()Ljava/lang/Object;')
+        def apply(self) -> None:
+            self.run()
+
+    return ScalaThunk
+
+
 class SpecParserSynthesizer:
     """Class to parse and synthesize QTL specifications using DejaVu's Verify tool.
 
@@ -15,15 +42,23 @@ class SpecParserSynthesizer:
     to parse and synthesize it, and returns the output from the tool.
     """
 
-    def __init__(self, i_dejavu_jar_path: Optional[str] = None, i_logger: Optional[Logger] = None):
+    def __init__(
+            self,
+            i_dejavu_jar_path: Optional[str] = None,
+            i_logger: Optional[Logger] = None,
+            i_in_process: bool = False):
         """
         Initializes the SpecParserSynthesizer with the path to the DejaVu JAR file.
 
         Args:
             i_dejavu_jar_path (str): The file path to the DejaVu JAR file. Defaults to 'libs/dejavu.jar'.
             i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+            i_in_process (bool, optional): Whether to run DejaVu's synthesis inside the embedded JVM (through
+                jnius) instead of spawning a `java` subprocess. The subprocess is used as a fallback if the
+                in-process synthesis fails. Defaults to False.
         """
         self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_in_process = i_in_process
         self.__m_dejavu_jar_path = os.path.join(Path(__file__).resolve().parent.parent, 'libs', 'dejavu.jar')\
             if i_dejavu_jar_path is None else i_dejavu_jar_path
         self.__m_spec_names: List[str] = []
@@ -58,16 +93,24 @@ class SpecParserSynthesizer:
         # Store the matched names
         self.__m_spec_names = matches
 
-    def parse_and_synthesize(self, i_specification: str) -> str:
+    def parse_and_synthesize(
+            self,
+            i_specification: str,
+            i_workspace: Optional[str] = None,
+            i_operational_spec: Optional[str] = None) -> str:
         """
         Parses and synthesizes a QTL specification using the DejaVu tool.
 
         This method writes the provided QTL specification to a temporary file, then
-        invokes the DejaVu Verify tool using the Java command. The tool's output is captured
-        and returned.
+        invokes the DejaVu Verify tool using the Java command (or directly inside the embedded
+        JVM if in-process synthesis is enabled). The tool's output is captured and returned.
 
         Args:
             i_specification (str): The QTL specification to parse and synthesize.
+            i_workspace (str, optional): The directory in which DejaVu creates its `output` directory
+                (with the synthesized `TraceMonitor.scala`). Defaults to the current working directory.
+            i_operational_spec (str, optional): A declarative operational-phase specification (pqtl), passed to
+                DejaVu as `--prefile` and synthesized into the pre-monitor of the generated monitor. Defaults to None.
 
         Returns:
             str: The output from the DejaVu tool.
@@ -83,16 +126,29 @@ class SpecParserSynthesizer:
             spec_file.write(i_specification)
             spec_file_path = spec_file.name
 
+        verify_args = ["--specfile", spec_file_path, "--execution", "1"]
+        operational_file_path = None
+        if i_operational_spec is not None:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.pqtl', delete=False) as operational_file:
+                operational_file.write(i_operational_spec)
+                operational_file_path = operational_file.name
+            verify_args += ["--prefile", operational_file_path]
+        dejavu_jar_path = self.__m_dejavu_jar_path if i_workspace is None else os.path.abspath(self.__m_dejavu_jar_path)
         cmd = [
             "java",
-            "-cp", f".:{self.__m_dejavu_jar_path}",
+            "-cp", f".:{dejavu_jar_path}",
             "dejavu.Verify",
-            "--specfile", spec_file_path,
-            "--execution", "1",
+            *verify_args,
         ]
 
         try:
-            stdout = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            if self.__m_in_process:
+                try:
+                    return self.__synthesize_in_process(verify_args, i_workspace)
+                except Exception as e:
+                    self.__m_logger.warning(f"In-process synthesis failed ({e}), falling back to a java subprocess")
+
+            stdout = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=i_workspace)
             return stdout.stdout
 
         except subprocess.CalledProcessError as e:
@@ -106,10 +162,86 @@ class SpecParserSynthesizer:
             raise RuntimeError(error_message) from e
 
         finally:
+            for path in (spec_file_path, operational_file_path):
+                if path is None:
+                    continue
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    self.__m_logger.warning(f"Failed to delete temporary spec file {path}: {e}")
+
+    def __synthesize_in_process(self, i_verify_args: List[str], i_workspace: Optional[str] = None) -> str:
+        """
+        Runs `dejavu.Verify` inside the embedded JVM, avoiding the start of a second JVM.
+
+        The embedded JVM is started (with the PyDejaVu classpath) if it is not running yet.
+        The standard output of DejaVu is captured for the duration of the call, and DejaVu runs in its unit test
+        mode, so a specification error raises an exception instead of exiting the process.
+
+        The JVM always writes into the `output` directory of the current working directory. When a
+        workspace is given, that directory is locked for the duration of the synthesis and its
+        artifacts are moved into the workspace.
+
+        Args:
+            i_verify_args (List[str]): The command line arguments for `dejavu.Verify`.
+            i_workspace (str, optional): The directory the `output` directory is moved into.
+
+        Returns:
+            str: The output from the DejaVu tool.
+
+        Raises:
+            RuntimeError: If DejaVu fails, or does not generate a monitor.
+        """
+        from pydejavu.jni.jni_config import JNIConfig
+        JNIConfig(i_logger=self.__m_logger).init_jnius_config()
+
+        if i_workspace is not None:
+            with FileLock(os.path.join("output", ".synthesis.lock")):
+                output = self.__synthesize_in_process(i_verify_args)
+                workspace_output = os.path.join(i_workspace, "output")
+                os.makedirs(workspace_output, exist_ok=True)
+                for name in ("TraceMonitor.scala", "ast.dot"):
+                    if os.path.exists(os.path.join("output", name)):
+                        shutil.move(os.path.join("output", name), os.path.join(workspace_output, name))
+                return output
+
+        # A monitor left by an earlier synthesis would hide a failure of this one
+        trace_monitor = os.path.join("output", "TraceMonitor.scala")
+        if os.path.exists(trace_monitor):
+            os.unlink(trace_monitor)
+
+        from jnius import autoclass
+        options = autoclass('dejavu.Options')
+        system = autoclass('java.lang.System')
+        buffer = autoclass('java.io.ByteArrayOutputStream')()
+        stream = autoclass('java.io.PrintStream')(buffer, True)
+        errors: List[Exception] = []
+
+        def verify() -> None:
+            # An exception cannot cross back into the JVM, so it is raised once the JVM returns
             try:
-                os.unlink(spec_file_path)
-            except OSError as e:
-                self.__m_logger.warning(f"Failed to delete temporary spec file {spec_file_path}: {e}")
+                autoclass('dejavu.Verify').main(i_verify_args)
+            except Exception as e:
+                errors.append(e)
+
+        # DejaVu exits the JVM (and so the Python process) on a specification error, unless it runs as a unit test
+        unit_test = getattr(options, 'UNIT_TEST')()
+        getattr(options, 'UNIT_TEST_$eq')(True)
+        original_out = system.out
+        system.setOut(stream)
+        try:
+            # Scala's println writes to Console.out, which does not follow System.setOut
+            autoclass('scala.Console').withOut(stream, _scala_thunk_class()(verify))
+        finally:
+            system.setOut(original_out)
+            getattr(options, 'UNIT_TEST_$eq')(unit_test)
+
+        output = buffer.toString()
+        if errors:
+            raise RuntimeError(f"DejaVu failed to synthesize the monitor ({errors[0]}):\n{output}") from errors[0]
+        if not os.path.exists(trace_monitor):
+            raise RuntimeError(f"DejaVu did not generate a monitor:\n{output}")
+        return output
 
 
 # Usage Example:
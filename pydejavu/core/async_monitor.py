@@ -0,0 +1,279 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+from pydejavu.core.verify import Verify
+from pydejavu.utils.logger import Logger
+
+Event = Union[Dict[str, Any], str]
+
+
+class AsyncMonitor:
+    """An asyncio front-end for online monitoring.
+
+    Events are submitted with `await submit(event)` into a bounded queue (a full queue suspends the
+    producer, i.e., backpressure), and a single consumer task evaluates them in the submission order.
+    The events queued at a time are evaluated as one micro-batch, so runs of events without async
+    handlers reach the monitor in a single `process_events` call. Evaluation runs on a dedicated
+    thread, so the event loop is never blocked by the JVM.
+
+    Handlers may be `async def`. An event with an async handler (or a custom parser, which has to run to
+    tell the handler) is processed on the event loop, where its handler is awaited, and evaluated on the
+    evaluation thread, after all preceding events were evaluated, so the event order is kept.
+
+    The results are consumed with `async for verdict in monitor.verdicts()`, one result dictionary per
+    event (as returned by `Monitor.verify`), in the submission order.
+
+    An evaluation error stops the monitoring: `verdicts` raises it after the results of the preceding events,
+    and `submit` and `close` raise a RuntimeError caused by it. The events submitted after it are discarded.
+
+    Example:
+        async with AsyncMonitor(monitor.verify) as async_monitor:
+            await async_monitor.submit("p,1")
+            ...
+    """
+
+    __END = object()
+
+    def __init__(
+            self,
+            i_verify: Verify,
+            i_max_queue_size: int = 10000,
+            i_max_batch_size: int = 1000,
+            i_collect_verdicts: bool = True,
+            i_logger: Optional[Logger] = None):
+        """
+        Initializes the AsyncMonitor. The consumer task starts on `start` (or when entering the context).
+
+        Args:
+            i_verify (Verify): The Verify object of a linked monitor (e.g., `monitor.verify`).
+            i_max_queue_size (int, optional): The capacity of the submission queue (and of the verdict queue).
+                Defaults to 10000.
+            i_max_batch_size (int, optional): The maximal number of queued events evaluated as one micro-batch.
+                Defaults to 1000.
+            i_collect_verdicts (bool, optional): Whether the results are queued for `verdicts`. If `verdicts`
+                is not consumed, set it to False, otherwise the full verdict queue blocks the evaluation.
+                Defaults to True.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_verify = i_verify
+        self.__m_max_queue_size = i_max_queue_size
+        self.__m_max_batch_size = i_max_batch_size
+        self.__m_collect_verdicts = i_collect_verdicts
+        self.__m_events: Optional[asyncio.Queue] = None
+        self.__m_verdicts: Optional[asyncio.Queue] = None
+        self.__m_consumer: Optional[asyncio.Task] = None
+        self.__m_executor: Optional[ThreadPoolExecutor] = None
+        self.__m_closed = False
+        self.__m_error: Optional[Exception] = None
+
+    def event(self, event_name: str) -> Callable:
+        """
+        A decorator to register an event handler, which may be a coroutine function.
+
+        Args:
+            event_name (str): The name of the event to handle.
+
+        Returns:
+            Callable: The decorator function that registers the event handler.
+        """
+        return self.__m_verify.event(event_name)
+
+    async def start(self) -> None:
+        """
+        Starts the consumer task on the running event loop.
+        """
+        if self.__m_consumer is not None:
+            return
+        self.__m_events = asyncio.Queue(maxsize=self.__m_max_queue_size)
+        self.__m_verdicts = asyncio.Queue(maxsize=self.__m_max_queue_size)
+        # A single evaluation thread, since the monitor is not thread safe
+        self.__m_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pydejavu-eval')
+        self.__m_consumer = asyncio.create_task(self.__consume())
+
+    async def submit(self, i_event: Event) -> None:
+        """
+        Submits an event for evaluation, waiting while the queue is full.
+
+        Args:
+            i_event (Event): The event, as a dictionary or as a string.
+
+        Raises:
+            RuntimeError: If the monitor is closed, or stopped by an evaluation error.
+        """
+        self.__raise_error()
+        if self.__m_closed:
+            raise RuntimeError("Cannot submit events to a closed AsyncMonitor")
+        if self.__m_consumer is None:
+            await self.start()
+        await self.__m_events.put(i_event)
+
+    async def verdicts(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterates over the results of the submitted events, in the submission order, until the monitor is closed.
+
+        Yields:
+            Dict[str, Any]: The result of each event, with its original event, modified event and evaluation result.
+
+        Raises:
+            RuntimeError: If the verdicts are not collected (see `i_collect_verdicts`).
+            Exception: The evaluation error which stopped the monitor, after the results of the preceding events.
+        """
+        if not self.__m_collect_verdicts:
+            raise RuntimeError("The verdicts are not collected, create the AsyncMonitor with i_collect_verdicts=True")
+        if self.__m_consumer is None:
+            await self.start()
+        while True:
+            verdict = await self.__m_verdicts.get()
+            if verdict is self.__END or isinstance(verdict, Exception):
+                # Leave the end marker (or the error) for any other consumer
+                self.__m_verdicts.put_nowait(verdict)
+                if verdict is self.__END:
+                    return
+                raise verdict
+            yield verdict
+
+    async def close(self) -> None:
+        """
+        Evaluates all the submitted events, then stops the consumer task and ends `verdicts`.
+
+        Raises:
+            RuntimeError: If the monitor was stopped by an evaluation error.
+        """
+        if self.__m_closed:
+            return
+        self.__m_closed = True
+        if self.__m_consumer is None:
+            return
+        await self.__m_events.put(self.__END)
+        await self.__m_consumer
+        self.__m_executor.shutdown(wait=True)
+        self.__raise_error()
+
+    async def __aenter__(self) -> 'AsyncMonitor':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def __consume(self) -> None:
+        """
+        The consumer task: takes the queued events as micro-batches and evaluates them in order.
+        """
+        loop = asyncio.get_running_loop()
+        ended = False
+        while not ended:
+            batch = [await self.__m_events.get()]
+            while len(batch) < self.__m_max_batch_size and not self.__m_events.empty():
+                batch.append(self.__m_events.get_nowait())
+            if batch[-1] is self.__END:
+                batch.pop()
+                ended = True
+            if self.__m_error is not None:
+                # The events submitted after an error are discarded, which releases the waiting producers
+                continue
+
+            try:
+                await self.__evaluate(loop, batch)
+            except Exception as e:
+                self.__m_logger.error(f"Error in async evaluation of {len(batch)} events: {str(e)}")
+                self.__m_error = e
+                if self.__m_collect_verdicts:
+                    await self.__m_verdicts.put(e)
+
+        if self.__m_collect_verdicts and self.__m_error is None:
+            await self.__m_verdicts.put(self.__END)
+
+    async def __evaluate(self, i_loop: asyncio.AbstractEventLoop, i_batch: List[Event]) -> None:
+        """
+        Evaluates a micro-batch. Runs of events without async handlers are evaluated in one call on the
+        evaluation thread, while the handlers of events with async handlers (or with a custom parser, which
+        is then called once) run on the event loop, before their evaluation on the evaluation thread.
+
+        Args:
+            i_loop (asyncio.AbstractEventLoop): The running event loop.
+            i_batch (List[Event]): The events.
+        """
+        dispatch_map = self.__m_verify.event_mapper.dispatch_map
+        if not any(plan.is_async for plan in dispatch_map.values()):
+            await self.__run(i_loop, i_batch)
+            return
+
+        parser_map = self.__m_verify.event_mapper.parser_map
+        run: List[Event] = []
+        for event in i_batch:
+            if isinstance(event, str):
+                plan, parsed = dispatch_map.get(event.split(',', 1)[0]), False
+            else:
+                plan, parsed = dispatch_map.get(event.get('name')), event.get('name') in parser_map
+            if not parsed and (plan is None or not plan.is_async):
+                run.append(event)
+                continue
+
+            if run:
+                await self.__run(i_loop, run)
+                run = []
+            await self.__publish([await self.__m_verify.process_event_async(event, self.__m_executor)])
+
+        if run:
+            await self.__run(i_loop, run)
+
+    async def __run(self, i_loop: asyncio.AbstractEventLoop, i_events: List[Event]) -> None:
+        """
+        Evaluates a run of events without async handlers on the evaluation thread, and publishes their results.
+
+        Args:
+            i_loop (asyncio.AbstractEventLoop): The running event loop.
+            i_events (List[Event]): The events.
+
+        Raises:
+            Exception: The evaluation error of an event, after the results of the preceding events were published.
+        """
+        results, error = await i_loop.run_in_executor(self.__m_executor, self.__evaluate_run, i_events)
+        await self.__publish(results)
+        if error is not None:
+            raise error
+
+    def __evaluate_run(self, i_events: List[Event]) -> Tuple[List[Dict[str, Any]], Optional[Exception]]:
+        """
+        Evaluates a run of events without async handlers (on the evaluation thread).
+
+        Args:
+            i_events (List[Event]): The events.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[Exception]]: The result of each event up to the first evaluation
+            error, and that error (None if all the events were evaluated).
+        """
+        results = []
+        try:
+            for origin_eval_input, modified_eval_input, eval_result in self.__m_verify.iter_events(i_events):
+                results.append({
+                    "Original Event": origin_eval_input,
+                    "Modified Event": modified_eval_input,
+                    "Eval result": eval_result
+                })
+        except Exception as e:
+            return results, e
+        return results, None
+
+    async def __publish(self, i_results: List[Dict[str, Any]]) -> None:
+        """
+        Queues the results for `verdicts`.
+
+        Args:
+            i_results (List[Dict[str, Any]]): The results of a run of events.
+        """
+        if not self.__m_collect_verdicts:
+            return
+        for result in i_results:
+            await self.__m_verdicts.put(result)
+
+    def __raise_error(self) -> None:
+        """
+        Raises a RuntimeError if the monitor was stopped by an evaluation error.
+        """
+        if self.__m_error is not None:
+            raise RuntimeError("The AsyncMonitor stopped on an evaluation error") from self.__m_error
@@ -0,0 +1,322 @@
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+from pydejavu.utils.logger import Logger
+
+# The monitor linked by a batch worker process, and the number of traces it verified
+_worker_monitor = None
+_worker_traces = 0
+_worker_result_dir: Optional[str] = None
+# The common directory of the traces, which the result files are named relative to
+_worker_trace_root: Optional[str] = None
+# The error which stopped the worker from linking its monitor, reported for each of its traces
+_worker_error: Optional[str] = None
+
+
+class TraceReport(NamedTuple):
+    """The outcome of verifying a single trace file.
+
+    Attributes:
+        path (str): The trace file.
+        events (int): The number of events read from the trace.
+        violations (Dict[str, int]): The number of violations per violated property.
+        seconds (float): The verification time.
+        error (Optional[str]): The error which stopped the verification, None on success.
+    """
+
+    path: str
+    events: int
+    violations: Dict[str, int]
+    seconds: float
+    error: Optional[str] = None
+
+
+class OperationalFile:
+    """A batch worker setup which registers the operational-phase handlers of a handler file.
+
+    The file holds Python code defining handlers with the `event` and `parser` decorators (as passed to the
+    `--operational` command line option). The code is executed once per worker, after its monitor was linked.
+    """
+
+    def __init__(self, i_path: str):
+        """
+        Args:
+            i_path (str): The path to the handler file.
+        """
+        self.path = i_path
+
+    def __call__(self, i_monitor: Any) -> None:
+        from pydejavu.core.monitor import event, parser
+        with open(self.path, 'r') as handler_file:
+            code = compile(handler_file.read(), self.path, 'exec')
+        exec(code, {'__name__': '__pydejavu_operational__', 'monitor': i_monitor, 'event': event, 'parser': parser})
+
+
+def _init_worker(
+        i_spec: str,
+        i_options: Dict[str, Any],
+        i_setup: Optional[Callable],
+        i_result_dir: Optional[str],
+        i_trace_root: Optional[str] = None) -> None:
+    """
+    Links the monitor of a batch worker process, once, and lets the setup callable register the handlers.
+
+    An error is recorded instead of raised, since the pool would replace a worker whose initializer fails by
+    another one, forever. The traces of the worker then report it.
+
+    Args:
+        i_spec (str): The specification.
+        i_options (Dict[str, Any]): Additional `Monitor` options.
+        i_setup (Callable, optional): Called with the worker's monitor, e.g., to register handlers.
+        i_result_dir (str, optional): The directory of the per-trace result files.
+        i_trace_root (str, optional): The common directory of the traces. Defaults to None, naming the result
+            files after the file names of the traces.
+    """
+    global _worker_monitor, _worker_traces, _worker_result_dir, _worker_trace_root, _worker_error
+    _worker_traces = 0
+    _worker_result_dir = i_result_dir
+    _worker_trace_root = i_trace_root
+    _worker_error = None
+    try:
+        from pydejavu.core.monitor import Monitor
+        _worker_monitor = Monitor(i_spec=i_spec, **i_options)
+        if i_setup is not None:
+            i_setup(_worker_monitor)
+    except Exception as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+def _verify_trace(i_path: str) -> TraceReport:
+    """
+    Verifies a trace file with the monitor of the worker process, resetting it first if it verified a trace before.
+    Without handlers, the file is evaluated inside the JVM (see `Monitor.verify_file`).
+
+    Args:
+        i_path (str): The trace file.
+
+    Returns:
+        TraceReport: The outcome of the verification.
+    """
+    global _worker_traces
+    start_time = time.perf_counter()
+    if _worker_error is not None:
+        return TraceReport(i_path, 0, {}, 0.0, _worker_error)
+    try:
+        result_file = None
+        if _worker_result_dir is not None:
+            name = os.path.basename(i_path) if _worker_trace_root is None \
+                else os.path.relpath(os.path.abspath(i_path), _worker_trace_root)
+            result_file = os.path.join(_worker_result_dir, f"{name}.result")
+            os.makedirs(os.path.dirname(result_file), exist_ok=True)
+        if _worker_traces > 0 or result_file is not None:
+            _worker_monitor.reset(i_result_file=result_file)
+        _worker_traces += 1
+
+        summary = _worker_monitor.verify_file(i_path, 0)
+        _worker_monitor.verify.end_eval()
+    except Exception as e:
+        return TraceReport(i_path, 0, {}, time.perf_counter() - start_time, f"{type(e).__name__}: {e}")
+    violations = {property_name: count for property_name, count in summary.violations.items() if count}
+    return TraceReport(i_path, summary.events, violations, time.perf_counter() - start_time)
+
+
+class BatchSummary:
+    """The aggregated outcome of a batch verification."""
+
+    def __init__(self, i_reports: List[TraceReport], i_seconds: float, i_workers: int):
+        """
+        Args:
+            i_reports (List[TraceReport]): The report of each trace, in the order of the traces.
+            i_seconds (float): The wall clock time of the batch.
+            i_workers (int): The number of worker processes.
+        """
+        self.reports = i_reports
+        self.seconds = i_seconds
+        self.workers = i_workers
+
+    @property
+    def events(self) -> int:
+        return sum(report.events for report in self.reports)
+
+    @property
+    def violations(self) -> Dict[str, int]:
+        """The number of violations per property, over all traces."""
+        totals: Dict[str, int] = {}
+        for report in self.reports:
+            for property_name, count in report.violations.items():
+                totals[property_name] = totals.get(property_name, 0) + count
+        return totals
+
+    @property
+    def failed(self) -> List[TraceReport]:
+        return [report for report in self.reports if report.error is not None]
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the summary as a JSON serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: The totals, throughput figures and per-trace reports.
+        """
+        return {
+            "traces": len(self.reports),
+            "failed": len(self.failed),
+            "events": self.events,
+            "workers": self.workers,
+            "seconds": round(self.seconds, 3),
+            "events_per_second": round(self.events_per_second, 1),
+            "violations": self.violations,
+            "per_trace": [
+                {
+                    "path": report.path,
+                    "events": report.events,
+                    "seconds": round(report.seconds, 3),
+                    "violations": report.violations,
+                    "error": report.error
+                }
+                for report in self.reports
+            ]
+        }
+
+    def write(self, i_path: str) -> None:
+        """
+        Writes the summary into a JSON file.
+
+        Args:
+            i_path (str): The summary file.
+        """
+        with open(i_path, 'w') as summary_file:
+            json.dump(self.to_dict(), summary_file, indent=2)
+
+    def format(self) -> str:
+        """
+        Formats the summary as a human readable report.
+
+        Returns:
+            str: The report, one line per violating or failed trace followed by the totals.
+        """
+        lines = []
+        for report in self.reports:
+            if report.error is not None:
+                lines.append(f"{report.path}: FAILED ({report.error})")
+            elif report.violations:
+                counts = ", ".join(f"{name}={count}" for name, count in sorted(report.violations.items()))
+                lines.append(f"{report.path}: {counts}")
+        totals = ", ".join(f"{name}={count}" for name, count in sorted(self.violations.items())) or "none"
+        lines.append(f"{len(self.reports)} trace(s), {len(self.failed)} failed, {self.events} events "
+                     f"in {self.seconds:.2f} seconds on {self.workers} worker(s) "
+                     f"({self.events_per_second:,.0f} events/s)")
+        lines.append(f"Violations: {totals}")
+        return "\n".join(lines)
+
+
+class BatchVerifier:
+    """Verifies many trace files against one specification on a pool of worker processes.
+
+    Each worker process links the monitor once (the compiled monitor is shared through the monitor cache, which
+    the workers use unless `i_cache=False` is given),
+    registers the handlers through the setup callable, and then verifies one trace file after the other,
+    resetting the monitor between traces (see `Monitor.reset`). Only the violation counts are sent back to
+    the parent process, which aggregates them into a `BatchSummary`.
+
+    The setup callable runs in the workers, so it has to be picklable (e.g., a module level function or an
+    `OperationalFile`), and handler state is per worker: it is kept across the traces of a worker unless it
+    lives in the shared variables, which are cleared on every reset.
+    """
+
+    def __init__(
+            self,
+            i_spec: str,
+            i_workers: Optional[int] = None,
+            i_setup: Optional[Callable] = None,
+            i_result_dir: Optional[str] = None,
+            i_logging_level: int = logging.WARNING,
+            **i_monitor_options: Any):
+        """
+        Initializes the BatchVerifier. The worker processes are started by `verify`.
+
+        Args:
+            i_spec (str): The specification.
+            i_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            i_setup (Callable, optional): Called with the monitor of each worker, e.g., to register handlers.
+            i_result_dir (str, optional): A directory for the result file of each trace, named after the path of
+                the trace relative to the common directory of the traces (e.g., `a/x.csv.result` and `b/x.csv.result`).
+                Defaults to the result file of the `Monitor` options, overwritten by each trace.
+            i_logging_level (int): The logging level of the workers. Defaults to WARNING level.
+            **i_monitor_options (Any): Additional `Monitor` options (e.g., `i_bits`) for the workers.
+
+        Raises:
+            ValueError: If `i_operational_spec` is given, since the monitor of a declarative operational phase
+                cannot be reset between traces.
+        """
+        if i_monitor_options.get('i_operational_spec') is not None:
+            raise ValueError("BatchVerifier does not support i_operational_spec: the pre-monitor of a declarative "
+                             "operational phase cannot be reset between traces. Register the operational phase as "
+                             "Python handlers through i_setup instead.")
+        self.__m_logger = Logger(i_logging_level=i_logging_level)
+        self.__m_spec = i_spec
+        self.__m_workers = i_workers or os.cpu_count() or 1
+        self.__m_setup = i_setup
+        self.__m_result_dir = i_result_dir
+        self.__m_options = dict(i_monitor_options, i_logging_level=i_logging_level)
+        self.__m_options.setdefault('i_cache', True)
+
+    @staticmethod
+    def expand(i_traces: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Expands glob patterns into the sorted list of matching trace files.
+
+        Args:
+            i_traces (Union[str, Iterable[str]]): A glob pattern (e.g., 'logs/**/*.csv'), or several patterns or paths.
+
+        Returns:
+            List[str]: The trace files, without duplicates.
+        """
+        patterns = [i_traces] if isinstance(i_traces, str) else list(i_traces)
+        paths = []
+        for pattern in patterns:
+            paths.extend(sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern])
+        return list(dict.fromkeys(path for path in paths if os.path.isfile(path)))
+
+    def verify(self, i_traces: Union[str, Iterable[str]]) -> BatchSummary:
+        """
+        Verifies the trace files on the worker processes.
+
+        Args:
+            i_traces (Union[str, Iterable[str]]): A glob pattern, or several patterns or trace paths.
+
+        Returns:
+            BatchSummary: The per-trace reports (in the order of the traces) and the aggregated figures.
+        """
+        paths = self.expand(i_traces)
+        workers = max(1, min(self.__m_workers, len(paths)))
+        trace_root = None
+        if self.__m_result_dir is not None:
+            os.makedirs(self.__m_result_dir, exist_ok=True)
+            if paths:
+                trace_root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+
+        self.__m_logger.info(f"Verifying {len(paths)} trace(s) on {workers} worker(s)")
+        start_time = time.perf_counter()
+        reports: List[TraceReport] = []
+        if paths:
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(
+                    workers,
+                    initializer=_init_worker,
+                    initargs=(self.__m_spec, self.__m_options, self.__m_setup, self.__m_result_dir,
+                              trace_root)) as pool:
+                for report in pool.imap(_verify_trace, paths, chunksize=1):
+                    if report.error is not None:
+                        self.__m_logger.error(f"Failed to verify {report.path}: {report.error}")
+                    reports.append(report)
+        return BatchSummary(reports, time.perf_counter() - start_time, workers)
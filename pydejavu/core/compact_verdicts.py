@@ -0,0 +1,219 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class CompactVerdicts:
+    """A compact, position indexed representation of the verdicts of a chunk of events.
+
+    Instead of one result dictionary per event, the verdicts of all properties are kept in a
+    single `array('b')` laid out row by row (one row per event, one column per property).
+    A cell holds 1 for a satisfied property, 0 for a violated one and -1 when the event was
+    not evaluated (skipped by its handler or failed in evaluation). The original and modified
+    event text is kept only for events that violate at least one property.
+    """
+
+    __slots__ = ['properties', '_data', '_violations', '_size', '_rows']
+
+    TRUE = 1
+    FALSE = 0
+    NOT_EVALUATED = -1
+
+    def __init__(self, i_properties: Optional[Tuple[str, ...]] = None):
+        """
+        Initializes an empty CompactVerdicts instance.
+
+        Args:
+            i_properties (Tuple[str, ...], optional): The property names in column order. If not provided,
+                the order is taken from the first evaluation result appended.
+        """
+        self.properties: Tuple[str, ...] = () if i_properties is None else tuple(i_properties)
+        self._data = array('b')
+        self._violations: Dict[int, Tuple[str, str]] = {}
+        self._size = 0
+        # Cache of parsed evaluation result strings, since the distinct verdict combinations are few
+        self._rows: Dict[Optional[str], Tuple[bytes, bool]] = {}
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of events stored.
+        """
+        return self._size
+
+    def append(self, i_original_event: str, i_modified_event: str, i_eval_result: Optional[str]) -> None:
+        """
+        Appends the verdicts of a single event.
+
+        Args:
+            i_original_event (str): The original event.
+            i_modified_event (str): The event passed to the monitor ("skip" if skipped by its handler).
+            i_eval_result (Optional[str]): The evaluation result in the format 'property1=verdict1,...',
+                or None / "Error in eval" if the event was not evaluated.
+        """
+        row = self._rows.get(i_eval_result)
+        if row is None:
+            row = self.__parse_row(i_eval_result)
+        self._data.frombytes(row[0])
+        if row[1]:
+            self._violations[self._size] = (i_original_event, i_modified_event)
+        self._size += 1
+
+    def append_row(self, i_cells: array, i_event: Optional[Tuple[str, str]] = None) -> None:
+        """
+        Appends the verdict cells of a single event, e.g., as merged from other `CompactVerdicts` instances.
+
+        Args:
+            i_cells (array): The `array('b')` verdict cells of the event, in the column order of the properties.
+            i_event (Tuple[str, str], optional): The original and modified event, kept if a property is violated.
+        """
+        self._data.extend(i_cells)
+        if self.FALSE in i_cells:
+            self._violations[self._size] = i_event
+        self._size += 1
+
+    def row(self, i_index: int) -> array:
+        """
+        Returns the verdict cells of the event at a given position.
+
+        Args:
+            i_index (int): The event position within the chunk.
+
+        Returns:
+            array: An `array('b')` with one cell per property, in the column order of the properties.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if not 0 <= i_index < self._size:
+            raise IndexError(f"Event index {i_index} out of range")
+        width = len(self.properties)
+        return self._data[i_index * width:(i_index + 1) * width]
+
+    def verdict(self, i_property: str, i_index: int) -> Optional[bool]:
+        """
+        Returns the verdict of a property for the event at a given position.
+
+        Args:
+            i_property (str): The property name.
+            i_index (int): The event position within the chunk.
+
+        Returns:
+            Optional[bool]: The verdict, or None if the event was not evaluated.
+
+        Raises:
+            KeyError: If the property is unknown.
+            IndexError: If the index is out of range.
+        """
+        if not 0 <= i_index < self._size:
+            raise IndexError(f"Event index {i_index} out of range")
+        cell = self._data[i_index * len(self.properties) + self.__column(i_property)]
+        return None if cell == self.NOT_EVALUATED else cell == self.TRUE
+
+    def verdicts(self, i_property: str) -> array:
+        """
+        Returns the verdicts of a property for all events.
+
+        Args:
+            i_property (str): The property name.
+
+        Returns:
+            array: An `array('b')` indexed by event position (1 true, 0 false, -1 not evaluated).
+
+        Raises:
+            KeyError: If the property is unknown.
+        """
+        if not self.properties:
+            return array('b')
+        return self._data[self.__column(i_property)::len(self.properties)]
+
+    def violations(self, i_property: Optional[str] = None) -> List[int]:
+        """
+        Returns the positions of the events which violate a property.
+
+        Args:
+            i_property (str, optional): The property name. If not provided, events violating any property
+                are returned.
+
+        Returns:
+            List[int]: The sorted event positions.
+        """
+        if i_property is None:
+            return sorted(self._violations)
+        return [index for index, verdict in enumerate(self.verdicts(i_property)) if verdict == self.FALSE]
+
+    def event(self, i_index: int) -> Optional[Tuple[str, str]]:
+        """
+        Returns the original and modified event text of a violating event.
+
+        Args:
+            i_index (int): The event position.
+
+        Returns:
+            Optional[Tuple[str, str]]: The original and modified event, or None if the event violated nothing.
+        """
+        return self._violations.get(i_index)
+
+    def __getstate__(self) -> Tuple:
+        # The parsed rows are a cache of the producer, they are not sent along (e.g., to another process)
+        return self.properties, self._data, self._violations, self._size
+
+    def __setstate__(self, i_state: Tuple) -> None:
+        self.properties, self._data, self._violations, self._size = i_state
+        self._rows = {}
+
+    def __column(self, i_property: str) -> int:
+        """
+        Resolves a property name into its column.
+
+        Args:
+            i_property (str): The property name.
+
+        Returns:
+            int: The column index.
+
+        Raises:
+            KeyError: If the property is unknown.
+        """
+        try:
+            return self.properties.index(i_property)
+        except ValueError:
+            raise KeyError(f"Unknown property '{i_property}'. Valid properties are: {self.properties}")
+
+    def __parse_row(self, i_eval_result: Optional[str]) -> Tuple[bytes, bool]:
+        """
+        Parses an evaluation result string into a row of verdicts and caches it.
+
+        Args:
+            i_eval_result (Optional[str]): The evaluation result.
+
+        Returns:
+            Tuple[bytes, bool]: The row of verdict cells and whether any property is violated.
+
+        Raises:
+            ValueError: If the evaluation result is malformed or refers to an unknown property.
+        """
+        verdicts: Dict[str, bool] = {}
+        if i_eval_result is not None and i_eval_result != "Error in eval":
+            for spec in i_eval_result.split(','):
+                try:
+                    name, verdict = spec.split('=')
+                except ValueError:
+                    raise ValueError(f"Invalid format in evaluation result: '{spec}'")
+                # The results of control events (e.g. '#end#=true') are not property verdicts
+                if not name.startswith('#'):
+                    verdicts[name] = verdict == "true"
+
+        if verdicts and not self.properties:
+            self.properties = tuple(verdicts)
+            # Events appended before the properties were known were not evaluated
+            self._data.extend([self.NOT_EVALUATED] * (self._size * len(self.properties)))
+        if not verdicts.keys() <= set(self.properties):
+            raise ValueError(f"Evaluation result '{i_eval_result}' does not match properties {self.properties}")
+
+        cells = [self.NOT_EVALUATED if name not in verdicts else self.TRUE if verdicts[name] else self.FALSE
+                 for name in self.properties]
+
+        row = (array('b', cells).tobytes(), self.FALSE in cells)
+        if verdicts or self.properties:
+            self._rows[i_eval_result] = row
+        return row
@@ -0,0 +1,315 @@
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
+
+
+def to_bool(value: Any) -> bool:
+    """
+    Converts a raw event argument into a boolean.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        bool: True if the value represents a true literal ('true', 't', 'yes', 'y', '1'), False otherwise.
+    """
+    return str(value).lower() in ('true', 't', 'yes', 'y', '1')
+
+
+def format_result(result: List[Any]) -> str:
+    """
+    Formats the result of an operational handler into a monitor event string.
+
+    Args:
+        result (List[Any]): The result to format.
+
+    Returns:
+        str: The formatted result as a string.
+    """
+    formatted_result = []
+    for item in result:
+        if isinstance(item, bool):
+            formatted_result.append(str(item).lower())
+        elif isinstance(item, float):
+            formatted_result.append(str(int(item)))
+        else:
+            formatted_result.append(str(item))
+    return ','.join(formatted_result)
+
+
+def validate_result(result: Any) -> Any:
+    """
+    Validates the return value of an operational handler.
+
+    Args:
+        result (Any): The value returned by the handler.
+
+    Returns:
+        Any: The result itself if it is valid.
+
+    Raises:
+        TypeError: If the result is not None, or a tuple/list which starts with a string.
+    """
+    # Allow None as a valid return value
+    if result is None:
+        return result
+
+    # Check if the result is a tuple
+    if isinstance(result, tuple):
+        # Ensure the first element is a string
+        if not result or not isinstance(result[0], str):
+            raise TypeError("The first item of the return tuple must be a string.")
+        return result
+
+    # Check if the result is a list
+    if isinstance(result, list):
+        # Ensure the first element is a string
+        if not result or not isinstance(result[0], str):
+            raise TypeError("The first item of the return list must be a string.")
+        return result
+
+    # If result is neither a tuple, list, nor None, raise an error
+    raise TypeError("The return value must be a tuple, list, or None.")
+
+
+class DispatchPlan:
+    """A precompiled dispatch plan for a single operational event handler.
+
+    The plan is built once, when the handler is registered, and holds everything the hot
+    event loop needs: the handler itself, the number of required arguments and a tuple of
+    converter callables (one per handler parameter) derived from the handler type hints.
+    Dispatching an event is therefore a sequence of direct calls with no introspection.
+    """
+
+    __slots__ = ['event_name', 'handler', 'is_async', 'arity', 'param_names', 'type_hints', 'converters', 'formatter']
+
+    def __init__(self, i_event_name: str, i_handler: Callable):
+        """
+        Builds the dispatch plan for the given handler.
+
+        Args:
+            i_event_name (str): The name of the event the handler is registered for.
+            i_handler (Callable): The user defined handler function.
+        """
+        sig = inspect.signature(i_handler)
+        self.event_name = i_event_name
+        self.handler = i_handler
+        self.is_async = inspect.iscoroutinefunction(i_handler)
+        self.arity = sum(1 for param in sig.parameters.values()
+                         if param.default == param.empty and param.kind != param.VAR_POSITIONAL)
+        self.param_names: Tuple[str, ...] = tuple(sig.parameters.keys())
+        self.type_hints = self.__resolve_type_hints(i_handler)
+        self.converters: Tuple[Optional[Callable[[Any], Any]], ...] = tuple(
+            self.converter_for(self.type_hints.get(name, Any)) for name in self.param_names)
+        self.formatter: Callable[[List[Any]], str] = format_result
+
+    @staticmethod
+    def converter_for(target_type: Any) -> Optional[Callable[[Any], Any]]:
+        """
+        Returns the callable used to cast a raw argument into the given type.
+
+        Args:
+            target_type (Any): The type hint of the handler parameter.
+
+        Returns:
+            Optional[Callable[[Any], Any]]: The converter, or None if the argument is passed as is.
+        """
+        if target_type == Any:
+            return None
+        if target_type == bool:
+            return to_bool
+        return target_type
+
+    def dispatch(self, event_args: Any) -> Optional[str]:
+        """
+        Casts the event arguments, calls the handler and formats its result.
+
+        Args:
+            event_args (Any): The raw event arguments.
+
+        Returns:
+            Optional[str]: The modified event to evaluate, or None if the handler skipped the event.
+
+        Raises:
+            TypeError: If an argument cannot be cast, the handler returns an invalid value, or the handler
+                is a coroutine function (which is only supported through `dispatch_async`).
+        """
+        if self.is_async:
+            raise TypeError(f"The handler of event '{self.event_name}' is a coroutine function, "
+                            f"it can only be used through an AsyncMonitor")
+        return self.__finish(self.__call(event_args))
+
+    async def dispatch_async(self, event_args: Any) -> Optional[str]:
+        """
+        Casts the event arguments, calls (and awaits, for a coroutine function) the handler and formats its result.
+
+        Args:
+            event_args (Any): The raw event arguments.
+
+        Returns:
+            Optional[str]: The modified event to evaluate, or None if the handler skipped the event.
+
+        Raises:
+            TypeError: If an argument cannot be cast or the handler returns an invalid value.
+        """
+        result = self.__call(event_args)
+        if self.is_async:
+            result = await result
+        return self.__finish(result)
+
+    def __call(self, event_args: Any) -> Any:
+        """
+        Casts the event arguments and calls the handler.
+
+        Args:
+            event_args (Any): The raw event arguments.
+
+        Returns:
+            Any: The value returned by the handler.
+        """
+        if isinstance(event_args, (list, tuple)):
+            return self.handler(*self.__cast_positional(event_args))
+        if isinstance(event_args, dict):
+            return self.handler(**self.__cast_keywords(event_args))
+        converter = self.converters[0] if self.converters else None
+        return self.handler(self.__cast(converter, event_args))
+
+    def __finish(self, result: Any) -> Optional[str]:
+        """
+        Validates and formats the value returned by the handler.
+
+        Args:
+            result (Any): The value returned by the handler.
+
+        Returns:
+            Optional[str]: The modified event to evaluate, or None if the handler skipped the event.
+
+        Raises:
+            TypeError: If the handler returned an invalid value.
+        """
+        if result is None:
+            return None
+        if type(result) not in (tuple, list) or not result or not isinstance(result[0], str):
+            validate_result(result)
+        return self.formatter(result)
+
+    def __cast_positional(self, event_args: Any) -> List[Any]:
+        """
+        Casts positional arguments using the per parameter converters.
+
+        Args:
+            event_args (Any): A list or tuple of raw arguments.
+
+        Returns:
+            List[Any]: The casted arguments. Arguments beyond the handler parameters are kept as is.
+        """
+        try:
+            casted_args = [arg if converter is None else converter(arg)
+                           for converter, arg in zip(self.converters, event_args)]
+        except (ValueError, TypeError):
+            casted_args = [self.__cast(converter, arg) for converter, arg in zip(self.converters, event_args)]
+
+        if len(event_args) > len(self.converters):
+            casted_args.extend(event_args[len(self.converters):])
+        return casted_args
+
+    def __cast_keywords(self, event_args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Casts keyword arguments according to the handler type hints.
+
+        Args:
+            event_args (Dict[str, Any]): The raw arguments keyed by parameter name.
+
+        Returns:
+            Dict[str, Any]: The casted arguments.
+        """
+        return {k: self.__cast(self.converter_for(self.type_hints.get(k, Any)), v) for k, v in event_args.items()}
+
+    @staticmethod
+    def __cast(converter: Optional[Callable[[Any], Any]], value: Any) -> Any:
+        """
+        Casts a single value, reporting a descriptive error on failure.
+
+        Args:
+            converter (Optional[Callable[[Any], Any]]): The converter to apply, None to keep the value.
+            value (Any): The value to cast.
+
+        Returns:
+            Any: The casted value.
+
+        Raises:
+            TypeError: If the value cannot be cast.
+        """
+        if converter is None:
+            return value
+        try:
+            return converter(value)
+        except (ValueError, TypeError) as e:
+            raise TypeError(f"Failed to cast the string '{value}' into {converter} ({str(e)})")
+
+    @staticmethod
+    def __resolve_type_hints(handler: Callable) -> Dict[str, Any]:
+        """
+        Resolves the type hints of the handler.
+
+        Forward references which cannot be resolved at registration time are ignored,
+        so the corresponding arguments are passed to the handler uncasted.
+
+        Args:
+            handler (Callable): The handler function.
+
+        Returns:
+            Dict[str, Any]: A dictionary of type hints.
+        """
+        try:
+            return get_type_hints(handler)
+        except NameError:
+            return {name: hint for name, hint in getattr(handler, '__annotations__', {}).items()
+                    if not isinstance(hint, str)}
+
+
+class TranslatedPlan(DispatchPlan):
+    """The dispatch plan of a handler translated into Scala (see `HandlerTranslator`).
+
+    The handler state lives in the JVM once the handler is translated, so the events which reach the handler
+    from Python (e.g., through `Verify.process_event`) run the translated handler as well, through the given
+    apply function, instead of the Python handler.
+    """
+
+    __slots__ = ['apply']
+
+    def __init__(self, i_plan: DispatchPlan, i_apply: Callable[[str], Optional[str]]):
+        """
+        Args:
+            i_plan (DispatchPlan): The dispatch plan of the Python handler.
+            i_apply (Callable[[str], Optional[str]]): Runs the translated handler on a callback request (the
+                verdict mask of the previous event and the event, separated by a newline).
+        """
+        for slot in DispatchPlan.__slots__:
+            setattr(self, slot, getattr(i_plan, slot))
+        self.apply = i_apply
+
+    def dispatch(self, event_args: Any) -> Optional[str]:
+        """
+        Runs the translated handler.
+
+        Args:
+            event_args (Any): The raw event arguments.
+
+        Returns:
+            Optional[str]: The modified event to evaluate, or None if the handler skipped the event.
+
+        Raises:
+            TypeError: If an argument cannot be cast.
+        """
+        if isinstance(event_args, dict):
+            event_args = [event_args[name] for name in self.param_names]
+        elif not isinstance(event_args, (list, tuple)):
+            event_args = [event_args]
+        # The arguments are cast again inside the JVM, so floats keep their fraction (unlike `format_result`)
+        event = ','.join([self.event_name] + [str(arg).lower() if isinstance(arg, bool) else str(arg)
+                                              for arg in event_args])
+        # The translated handlers do not observe verdicts, so no verdict mask is passed
+        return self.apply(f"0\n{event}")
+
+    async def dispatch_async(self, event_args: Any) -> Optional[str]:
+        return self.dispatch(event_args)
@@ -0,0 +1,189 @@
+import itertools
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from pydejavu.core.verify import Verify
+from pydejavu.utils.logger import Logger
+
+Event = Union[Dict[str, Any], str]
+
+
+class EventIngestor:
+    """A thread-safe entry point for events emitted by many producer threads.
+
+    `Verify`, the event mapper and the shared state are not synchronized, so the events have to reach them
+    from a single thread. Producers call `submit`, which only assigns the event the next sequence number and
+    appends it to a queue (a short critical section of two constant-time operations). A single consumer
+    thread drains the queue in batches into `Verify.iter_events`, so the handlers, the shared state and
+    the monitor are only used by that thread.
+
+    The sequence numbers define the global order of the events: events are evaluated in increasing sequence
+    number, which is the order in which `submit` calls entered the queue.
+
+    Example:
+        with EventIngestor(monitor.verify, i_on_result=report) as ingestor:
+            # In any thread
+            sequence_number = ingestor.submit("login,alice")
+    """
+
+    def __init__(
+            self,
+            i_verify: Verify,
+            i_max_batch_size: int = 1000,
+            i_on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+            i_logger: Optional[Logger] = None):
+        """
+        Initializes the EventIngestor and starts its consumer thread.
+
+        Args:
+            i_verify (Verify): The Verify object of a linked monitor (e.g., `monitor.verify`).
+            i_max_batch_size (int, optional): The maximal number of events evaluated in one batch. Defaults to 1000.
+            i_on_result (Callable[[int, Dict[str, Any]], None], optional): Called on the consumer thread with the
+                sequence number and the result of every event, in the sequence order. The result of an event whose
+                evaluation failed holds the error (under "Error") instead of the evaluation result. Defaults to None.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_verify = i_verify
+        self.__m_max_batch_size = i_max_batch_size
+        self.__m_on_result = i_on_result
+
+        self.__m_sequence = itertools.count()
+        self.__m_queue: deque = deque()
+        self.__m_enqueue_lock = threading.Lock()
+        self.__m_pending = threading.Event()
+        self.__m_progress = threading.Condition()
+        self.__m_taken = 0
+        self.__m_processed = 0
+        self.__m_closed = False
+
+        self.__m_consumer = threading.Thread(target=self.__consume, name='pydejavu-ingestor', daemon=True)
+        self.__m_consumer.start()
+
+    @property
+    def processed(self) -> int:
+        """The number of events evaluated so far (all events with a lower sequence number)."""
+        return self.__m_processed
+
+    def submit(self, i_event: Event) -> int:
+        """
+        Submits an event for evaluation. Safe to call from any thread, never waits for the evaluation.
+
+        Args:
+            i_event (Event): The event, as a dictionary or as a string.
+
+        Returns:
+            int: The sequence number of the event.
+
+        Raises:
+            RuntimeError: If the ingestor is closed.
+        """
+        with self.__m_enqueue_lock:
+            if self.__m_closed:
+                raise RuntimeError("Cannot submit events to a closed EventIngestor")
+            sequence_number = next(self.__m_sequence)
+            self.__m_queue.append((sequence_number, i_event))
+        if not self.__m_pending.is_set():
+            self.__m_pending.set()
+        return sequence_number
+
+    def flush(self, i_timeout: Optional[float] = None) -> bool:
+        """
+        Waits until all the events submitted before the call are evaluated.
+
+        Args:
+            i_timeout (float, optional): The maximal time to wait, in seconds. Defaults to no limit.
+
+        Returns:
+            bool: True if the events were evaluated, False on timeout.
+        """
+        with self.__m_enqueue_lock:
+            target = len(self.__m_queue) + self.__m_taken
+        with self.__m_progress:
+            return self.__m_progress.wait_for(lambda: self.__m_processed >= target, i_timeout)
+
+    def close(self) -> None:
+        """
+        Evaluates all the submitted events and stops the consumer thread.
+        """
+        with self.__m_enqueue_lock:
+            if self.__m_closed:
+                return
+            self.__m_closed = True
+        self.__m_pending.set()
+        self.__m_consumer.join()
+
+    def __enter__(self) -> 'EventIngestor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __consume(self) -> None:
+        """
+        The consumer thread: drains the queue in batches, in the sequence order, until the ingestor is closed.
+        """
+        while True:
+            self.__m_pending.wait()
+            self.__m_pending.clear()
+            while self.__m_queue:
+                self.__process(self.__take_batch())
+            if self.__m_closed and not self.__m_queue:
+                return
+
+    def __take_batch(self) -> List[Tuple[int, Event]]:
+        """
+        Takes the next batch out of the queue.
+
+        Returns:
+            List[Tuple[int, Event]]: The sequence numbers and events, in the sequence order.
+        """
+        popleft = self.__m_queue.popleft
+        with self.__m_enqueue_lock:
+            size = min(len(self.__m_queue), self.__m_max_batch_size)
+            self.__m_taken += size
+            return [popleft() for _ in range(size)]
+
+    def __process(self, i_batch: List[Tuple[int, Event]]) -> None:
+        """
+        Evaluates a batch of events and reports the results.
+
+        An error stops the evaluation of the events by `Verify.iter_events`, so the evaluation resumes after the
+        failing event, which is reported with the error (and without a result). The events are evaluated
+        sequentially even by a pipelined `Verify`, whose stages would lose the results of the in-flight chunk
+        of a failing event.
+
+        Args:
+            i_batch (List[Tuple[int, Event]]): The sequence numbers and events.
+        """
+        events = [event for _, event in i_batch]
+        results = self.__m_verify.iter_events(events, pipelined=False)
+        for position, (sequence_number, event) in enumerate(i_batch):
+            try:
+                original, modified, eval_result = next(results)
+                result = {"Original Event": original, "Modified Event": modified, "Eval result": eval_result}
+            except Exception as e:
+                self.__m_logger.error(f"Error in evaluation of event {sequence_number}: {str(e)}")
+                result = {"Original Event": event, "Modified Event": None, "Eval result": None, "Error": str(e)}
+                results = self.__m_verify.iter_events(events[position + 1:], pipelined=False)
+            self.__report(sequence_number, result)
+
+        with self.__m_progress:
+            self.__m_processed += len(i_batch)
+            self.__m_progress.notify_all()
+
+    def __report(self, i_sequence_number: int, i_result: Dict[str, Any]) -> None:
+        """
+        Passes the result of an event to the result callback, if any.
+
+        Args:
+            i_sequence_number (int): The sequence number of the event.
+            i_result (Dict[str, Any]): The result of the event.
+        """
+        if self.__m_on_result is None:
+            return
+        try:
+            self.__m_on_result(i_sequence_number, i_result)
+        except Exception as e:
+            self.__m_logger.error(f"Error in the result callback of event {i_sequence_number}: {str(e)}")
@@ -1,16 +1,18 @@
 from typing import Callable, Dict, Any, List, Tuple, Optional, Union
 from functools import wraps
 
+from pydejavu.core.dispatch_plan import DispatchPlan, validate_result
 from pydejavu.core.shared_state import SharedState
 from pydejavu.utils.logger import Logger
 
 
 class EventOperationalMapper:
-    __slots__ = ['event_map', 'parser_map', 'shared_state', '__m_logger']
+    __slots__ = ['event_map', 'dispatch_map', 'parser_map', 'shared_state', '__m_logger']
 
     def __init__(self, i_logger: Logger = None):
         self.__m_logger = Logger() if i_logger is None else i_logger
         self.event_map: Dict[str, Callable] = {}
+        self.dispatch_map: Dict[str, DispatchPlan] = {}
         self.parser_map: Dict[str, Callable[[Any], Tuple[str, List[Any], str]]] = {}
         self.shared_state = SharedState()
         self.__m_logger.info("EventOperationalMapper instance initialized")
@@ -30,30 +32,10 @@ class EventOperationalMapper:
             @wraps(func)
             def wrapper(*args, **kwargs) -> Optional[Union[Tuple[str, ...], List[Union[str, int, bool]], None]]:
                 self.__m_logger.debug(f"Executing event handler for {event_name}")
-                result = func(*args, **kwargs)
-
-                # Allow None as a valid return value
-                if result is None:
-                    return result
-
-                # Check if the result is a tuple
-                if isinstance(result, tuple):
-                    # Ensure the first element is a string
-                    if not result or not isinstance(result[0], str):
-                        raise TypeError("The first item of the return tuple must be a string.")
-                    return result
-
-                # Check if the result is a list
-                if isinstance(result, list):
-                    # Ensure the first element is a string
-                    if not result or not isinstance(result[0], str):
-                        raise TypeError("The first item of the return list must be a string.")
-                    return result
-
-                # If result is neither a tuple, list, nor None, raise an error
-                raise TypeError("The return value must be a tuple, list, or None.")
+                return validate_result(func(*args, **kwargs))
 
             self.event_map[event_name] = wrapper
+            self.dispatch_map[event_name] = DispatchPlan(event_name, func)
             return wrapper
 
         return decorator
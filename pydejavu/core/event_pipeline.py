@@ -0,0 +1,186 @@
+import queue
+import sys
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from pydejavu.utils.logger import Logger
+
+Stage = Callable[[List[Any]], List[Any]]
+
+
+class _StageError:
+    """Carries an exception raised by a stage thread to the consumer."""
+
+    __slots__ = ['error']
+
+    def __init__(self, i_error: BaseException):
+        self.error = i_error
+
+
+class EventPipeline:
+    """Runs a chain of stages, each on its own thread, connected by bounded queues.
+
+    The items of the source are passed through the stages in chunks, so the queue overhead is paid once per
+    chunk rather than once per item. The first stage thread also iterates the source (e.g., reads the trace
+    file). While one stage works on a chunk, the previous stage already works on the next one, so stages
+    that release the GIL (e.g., JNI calls into the JVM) overlap the Python work of the other stages.
+
+    Each stage is a callable taking a chunk (a list of items) and returning the processed chunk. The order
+    of the items is kept, and an exception raised by any stage is re-raised by the consumer.
+    """
+
+    __END = object()
+
+    def __init__(
+            self,
+            i_stages: List[Stage],
+            i_chunk_size: int = 1000,
+            i_queue_size: int = 4,
+            i_logger: Optional[Logger] = None):
+        """
+        Initializes the EventPipeline.
+
+        Args:
+            i_stages (List[Stage]): The stages, in processing order.
+            i_chunk_size (int, optional): The number of source items per chunk. Defaults to 1000.
+            i_queue_size (int, optional): The number of chunks each queue holds before the producing stage
+                waits. Defaults to 4.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+
+        Raises:
+            ValueError: If no stage is given.
+        """
+        if not i_stages:
+            raise ValueError("A pipeline requires at least one stage")
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_stages = i_stages
+        self.__m_chunk_size = i_chunk_size
+        self.__m_queue_size = i_queue_size
+
+    def run(self, i_source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Passes the source items through the stages and yields the results, in the source order.
+
+        Closing the returned iterator before it is exhausted stops the stage threads.
+
+        Args:
+            i_source (Iterable[Any]): The items to process.
+
+        Yields:
+            Any: The items produced by the last stage.
+
+        Raises:
+            Exception: Any exception raised by a stage.
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.__m_queue_size) for _ in self.__m_stages]
+        inputs = [self.__chunks(i_source)] + [self.__drain(q, stop) for q in queues[:-1]]
+        threads = [
+            threading.Thread(
+                target=self.__run_stage,
+                args=(stage, chunks, output, stop),
+                name=f"pydejavu-stage-{index}",
+                daemon=True)
+            for index, (stage, chunks, output) in enumerate(zip(self.__m_stages, inputs, queues))
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for chunk in self.__drain(queues[-1], stop):
+                yield from chunk
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def __chunks(self, i_source: Iterable[Any]) -> Iterator[List[Any]]:
+        """
+        Splits the source into chunks.
+
+        Args:
+            i_source (Iterable[Any]): The items to process.
+
+        Yields:
+            List[Any]: The chunks.
+        """
+        chunk = []
+        for item in i_source:
+            chunk.append(item)
+            if len(chunk) >= self.__m_chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __drain(self, i_queue: queue.Queue, i_stop: threading.Event) -> Iterator[List[Any]]:
+        """
+        Takes the chunks out of a queue until the end marker, re-raising a stage error.
+
+        Args:
+            i_queue (queue.Queue): The queue.
+            i_stop (threading.Event): Set when the pipeline is stopped.
+
+        Yields:
+            List[Any]: The chunks.
+        """
+        while not i_stop.is_set():
+            try:
+                chunk = i_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if chunk is self.__END:
+                return
+            if isinstance(chunk, _StageError):
+                raise chunk.error
+            yield chunk
+
+    def __run_stage(
+            self,
+            i_stage: Stage,
+            i_chunks: Iterator[List[Any]],
+            i_output: queue.Queue,
+            i_stop: threading.Event) -> None:
+        """
+        The main loop of a stage thread.
+
+        Args:
+            i_stage (Stage): The stage.
+            i_chunks (Iterator[List[Any]]): The input chunks.
+            i_output (queue.Queue): The queue of the next stage.
+            i_stop (threading.Event): Set when the pipeline is stopped.
+        """
+        try:
+            for chunk in i_chunks:
+                if not self.__put(i_output, i_stage(chunk), i_stop):
+                    return
+            self.__put(i_output, self.__END, i_stop)
+        except Exception as e:
+            self.__m_logger.debug(f"Pipeline stage failed: {str(e)}")
+            self.__put(i_output, _StageError(e), i_stop)
+        finally:
+            # A thread which called into the JVM must detach from it before it exits
+            jnius = sys.modules.get('jnius')
+            if jnius is not None:
+                jnius.detach()
+
+    @staticmethod
+    def __put(i_queue: queue.Queue, i_item: Any, i_stop: threading.Event) -> bool:
+        """
+        Puts an item into a queue, waiting while it is full unless the pipeline is stopped.
+
+        Args:
+            i_queue (queue.Queue): The queue.
+            i_item (Any): The item.
+            i_stop (threading.Event): Set when the pipeline is stopped.
+
+        Returns:
+            bool: True if the item was queued, False if the pipeline was stopped.
+        """
+        while not i_stop.is_set():
+            try:
+                i_queue.put(i_item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
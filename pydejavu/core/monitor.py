@@ -1,14 +1,25 @@
 import argparse
+import atexit
 import logging
+import os
 import subprocess
 import sys
 import time
-from typing import List, Optional, Any, Callable, Iterator, Dict, Tuple
+from typing import List, Optional, Any, Callable, Iterator, Dict, Tuple, Iterable, Union
 
+from pydejavu.compilation.handler_translator import HandlerTranslation
+from pydejavu.compilation.jvm_scala_compiler import JVMScalaCompiler
+from pydejavu.compilation.monitor_cache import MonitorCache
+from pydejavu.compilation.monitor_workspace import MonitorWorkspace
 from pydejavu.compilation.scala_monitor_compiler import ScalaMonitorCompiler
 from pydejavu.compilation.spec_parser_synthesizer import SpecParserSynthesizer
 from pydejavu.jni.linkage_monitor import LinkageMonitor
+from pydejavu.core.batch_verifier import BatchVerifier, OperationalFile
+from pydejavu.core.property_groups import PropertyGroups
+from pydejavu.core.trace_summary import TraceSummary
 from pydejavu.core.verify import Verify
+from pydejavu.core.violation import Violation
+from pydejavu.utils.binary_trace import BinaryTrace
 from pydejavu.utils.file_utils import FileUtils
 from pydejavu.utils.logger import Logger
 from pydejavu.utils.monitor_generator import MonitorGenerator
@@ -34,6 +45,11 @@ class Monitor:
     __pending_parser_handlers: List[Tuple[str, Callable]] = []  # Store pending parser handlers
 
     def __new__(cls, *args, **kwargs):
+        if kwargs.get('i_isolated', False):
+            # Isolated monitors are independent instances, next to the process wide singleton
+            instance = super(Monitor, cls).__new__(cls)
+            instance.__initialized = False
+            return instance
         if not cls.__instance:
             cls.__instance = super(Monitor, cls).__new__(cls)
             cls.__instance.__initialized = False
@@ -45,7 +61,17 @@ class Monitor:
             i_bits: int = 20,
             i_mode=None,
             i_statistics=False,
-            i_logging_level: int = logging.INFO):
+            i_logging_level: int = logging.INFO,
+            i_compact_results: bool = False,
+            i_cache: bool = False,
+            i_in_process_synthesis: bool = False,
+            i_in_process_compilation: bool = False,
+            i_workspace: Optional[str] = None,
+            i_result_file: str = "output/resultFile",
+            i_isolated: bool = False,
+            i_property_groups: int = 1,
+            i_pipelined: bool = False,
+            i_operational_spec: Optional[str] = None):
         """
         Initializes the Monitor instance with the given parameters.
 
@@ -55,25 +81,65 @@ class Monitor:
             i_mode (optional): The mode of operation. Defaults to None.
             i_statistics (bool, optional): Whether to collect statistics. Defaults to False.
             i_logging_level (int): The logging level. Defaults to INFO level.
+            i_compact_results (bool, optional): Whether verifying a list of events returns a `CompactVerdicts`
+                instance instead of a list of per-event result dictionaries. Defaults to False.
+            i_cache (bool, optional): Whether compiled monitors are looked up in (and stored into) the persistent
+                monitor cache, so an unchanged specification skips synthesis and compilation. Defaults to False.
+            i_in_process_synthesis (bool, optional): Whether the specification is synthesized inside the embedded
+                JVM instead of a separate `java` process. Defaults to False.
+            i_in_process_compilation (bool, optional): Whether the monitor is compiled by a warm Scala compiler
+                inside the embedded JVM instead of a separate `scalac` process. Defaults to False.
+            i_workspace (str, optional): The directory in which the private build directory of the monitor is
+                created (and kept after the build). Defaults to a temporary build directory, removed once the
+                monitor is published into the cache (or at exit if the cache is disabled).
+            i_result_file (str, optional): The file DejaVu writes the indices of violating events into.
+                Defaults to "output/resultFile".
+            i_isolated (bool, optional): Whether to create an independent monitor instance instead of the process
+                wide singleton. Its monitor is loaded into its own class loader, and it has its own event handlers
+                (registered with `register_event` / `register_parser`), shared variables and verdict state, so
+                several specifications can be verified side by side in one process and JVM. Defaults to False.
+            i_property_groups (int, optional): The number of groups the properties of the specification are split
+                into, each evaluated by its own monitor on a worker process. The event handlers still run once, in
+                this process. Defaults to 1 (a single monitor in this process).
+            i_pipelined (bool, optional): Whether verifying a list of events runs the parsing, the event handlers
+                and the monitor evaluation on separate threads, overlapping the JVM evaluation with the Python
+                work. Handlers then observe `last_eval` verdicts with a delay. Defaults to False.
+            i_operational_spec (str, optional): A declarative operational-phase specification (pqtl, with `initiate`,
+                `on event(...)` and `output` clauses), synthesized into the pre-monitor of the generated monitor, so
+                the operational phase runs inside the JVM. Python handlers remain available, and run before it.
+                Defaults to None.
         """
         if self.__initialized:
             return
         self.__m_logger = Logger(i_logging_level=i_logging_level)
+        self.__m_logging_level = i_logging_level
         self.__m_spec = i_spec
         self.__m_bits = i_bits
         self.__m_mode = i_mode
         self.__m_statistics = i_statistics
+        self.__m_compact_results = i_compact_results
+        self.__m_cache = i_cache
+        self.__m_in_process_synthesis = i_in_process_synthesis
+        self.__m_in_process_compilation = i_in_process_compilation
+        self.__m_workspace_root = i_workspace
+        self.__m_result_file = i_result_file
+        self.__m_isolated = i_isolated
+        self.__m_property_groups = i_property_groups
+        self.__m_pipelined = i_pipelined
+        self.__m_operational_spec = i_operational_spec
         self.__m_verify: Optional[Verify] = None
 
-        # Register all pending events after initialization
-        for event_name, func in self.__pending_event_handlers:
-            self.register_event(event_name, func)
-        self.__pending_event_handlers.clear()  # Clear pending events after registration
+        # The pending handlers (registered through the class decorators) belong to the singleton monitor
+        if not self.__m_isolated:
+            # Register all pending events after initialization
+            for event_name, func in self.__pending_event_handlers:
+                self.register_event(event_name, func)
+            self.__pending_event_handlers.clear()  # Clear pending events after registration
 
-        # Register all pending parser after initialization
-        for event_name, func in self.__pending_parser_handlers:
-            self.register_parser(event_name, func)
-        self.__pending_parser_handlers.clear()  # Clear pending processors after registration
+            # Register all pending parser after initialization
+            for event_name, func in self.__pending_parser_handlers:
+                self.register_parser(event_name, func)
+            self.__pending_parser_handlers.clear()  # Clear pending processors after registration
 
         if self.__m_spec is not None:
             self.__init_monitor()
@@ -136,19 +202,55 @@ class Monitor:
         Initializes the monitor by synthesizing, compiling, and linking the specification.
 
         This method logs the steps of monitor creation and connects the monitor to the runtime.
+        If the monitor cache is enabled and holds a monitor for the specification, synthesis and
+        compilation are skipped.
         """
         self.__m_logger.info("Initialize monitor creation process")
 
-        # Specification synthesizer process
-        self.synthesize_monitor(self.__m_spec)
+        if self.__m_property_groups > 1:
+            self.__link_property_groups()
+            return
 
-        # Synthesizer monitor compilation
-        compile_jar_path = self.compile_monitor()
+        # A warm start links the cached monitor of an unchanged specification directly
+        compiler_jars = JVMScalaCompiler.compiler_jars() if self.__m_in_process_compilation else None
+        cache = MonitorCache(i_compiler_jars=compiler_jars, i_logger=self.__m_logger) if self.__m_cache else None
+        cache_key = cache.key(self.__m_spec, self.__m_operational_spec) if cache is not None else None
+        compile_jar_path = cache.lookup(cache_key) if cache is not None else None
+
+        if compile_jar_path is None:
+            # The Scala compiler has to be on the classpath before the JVM starts (e.g., for in-process synthesis)
+            if self.__m_in_process_compilation and not JVMScalaCompiler.register_classpath():
+                self.__m_logger.warning("Scala compiler JARs not found, the monitor will be compiled by scalac")
+
+            # Every build gets a private workspace, so concurrent builds do not overwrite each other's artifacts
+            workspace = MonitorWorkspace(i_root=self.__m_workspace_root, i_logger=self.__m_logger)
+
+            try:
+                # Specification synthesizer process
+                self.synthesize_monitor(self.__m_spec, workspace.directory)
+
+                # Synthesizer monitor compilation
+                compile_jar_path = self.compile_monitor(workspace.source)
+
+                if cache is not None:
+                    compile_jar_path = cache.store(cache_key, compile_jar_path, self.__m_spec)
+            except BaseException:
+                # A failed build does not leave its temporary workspace behind
+                if self.__m_workspace_root is None:
+                    workspace.cleanup()
+                raise
+
+            # A temporary workspace is removed once the monitor no longer lives in it
+            if self.__m_workspace_root is None:
+                if cache is not None:
+                    workspace.cleanup()
+                else:
+                    atexit.register(workspace.cleanup)
 
         # Connect to the compile monitor
         self.linkage_monitor(compile_jar_path)
 
-    def synthesize_monitor(self, spec: str):
+    def synthesize_monitor(self, spec: str, workspace: Optional[str] = None):
         """
         Synthesizes the monitor based on the provided specification.
 
@@ -157,10 +259,12 @@ class Monitor:
 
         Args:
             spec (str): The specification string to be synthesized.
+            workspace (str, optional): The directory the monitor is synthesized into (under `output`).
+                Defaults to the current working directory.
         """
         start_time = time.time()
-        synthesizer = SpecParserSynthesizer(i_logger=self.__m_logger)
-        parse_result = synthesizer.parse_and_synthesize(spec)
+        synthesizer = SpecParserSynthesizer(i_logger=self.__m_logger, i_in_process=self.__m_in_process_synthesis)
+        parse_result = synthesizer.parse_and_synthesize(spec, workspace, self.__m_operational_spec)
         synth_time = time.time() - start_time
         self.__m_logger.info(f"Specification synthesizer process completed in {synth_time: .2f} seconds")
         self.__m_logger.info(f"DejaVu Output: \n{parse_result}")
@@ -173,13 +277,16 @@ class Monitor:
         the time taken for the compilation.
 
         Args:
-            source (str): Path to the scala source file that needs to be compiled
+            source (str): Path to the scala source file that needs to be compiled. The JAR file is generated
+                next to it (in the `output` directory by default).
 
         Returns:
             str: The path to the compiled JAR file.
         """
         start_time = time.time()
-        compiler = ScalaMonitorCompiler(i_source=source, i_logger=self.__m_logger)
+        dest = "output" if source is None else os.path.dirname(source) or "."
+        compiler = ScalaMonitorCompiler(i_source=source, i_dest=dest, i_logger=self.__m_logger,
+                                        i_in_process=self.__m_in_process_compilation)
         compile_jar_path = compiler.compile_monitor(generate_jar=True)
         compile_time = time.time() - start_time
         self.__m_logger.info(f"Synthesizer monitor compilation completed in {compile_time: .2f} seconds")
@@ -195,24 +302,68 @@ class Monitor:
         Args:
             compile_jar_monitor (str): The path to the compiled JAR file.
         """
-        dejavu_monitor = LinkageMonitor(compile_jar_monitor)
+        dejavu_monitor = LinkageMonitor(compile_jar_monitor, i_isolated=self.__m_isolated)
+        result_dir = os.path.dirname(self.__m_result_file)
+        if result_dir:
+            os.makedirs(result_dir, exist_ok=True)
         self.__m_verify = Verify(
             dejavu_monitor.monitor,
             i_bits=self.__m_bits,
             i_mode=self.__m_mode,
-            i_statistics=self.__m_statistics)
+            i_statistics=self.__m_statistics,
+            i_batch_eval=dejavu_monitor.supports_batch_eval,
+            i_compact_results=self.__m_compact_results,
+            i_pipelined=self.__m_pipelined,
+            i_structured_eval=dejavu_monitor.supports_structured_eval,
+            i_reset=dejavu_monitor.supports_reset,
+            i_file_eval=dejavu_monitor.supports_file_eval,
+            i_result_file=self.__m_result_file)
 
         # Initialize the shared variables for the specification verdicts.
         # This is done by execute an "init" event which then return False for all defined properties
         self.__m_verify.process_event({"name": "#init#", "args": []})
 
+    def __link_property_groups(self) -> None:
+        """
+        Splits the specification into property groups, each linked by a worker process, and sets up the
+        verification environment to evaluate every event on all groups.
+        """
+        groups = PropertyGroups(
+            self.__m_spec,
+            self.__m_property_groups,
+            i_logging_level=self.__m_logging_level,
+            i_bits=self.__m_bits,
+            i_mode=self.__m_mode,
+            i_statistics=self.__m_statistics,
+            i_cache=self.__m_cache,
+            i_in_process_synthesis=self.__m_in_process_synthesis,
+            i_in_process_compilation=self.__m_in_process_compilation,
+            i_workspace=self.__m_workspace_root,
+            i_result_file=self.__m_result_file,
+            i_operational_spec=self.__m_operational_spec)
+        atexit.register(groups.close)
+
+        # The groups take runs of unhandled events in a single round trip
+        self.__m_verify = Verify(
+            groups,
+            i_bits=self.__m_bits,
+            i_mode=self.__m_mode,
+            i_statistics=self.__m_statistics,
+            i_batch_eval=True,
+            i_compact_results=self.__m_compact_results,
+            i_pipelined=self.__m_pipelined,
+            i_reset=True,
+            i_result_file=self.__m_result_file)
+        self.__m_verify.process_event({"name": "#init#", "args": []})
+
     @staticmethod
     def read_bulk_events_as_dict(i_trace_file: str, chunk_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
         """
         Reads a large number of events from a trace file in chunks as dictionaries.
 
         This method uses the FileUtils to read events from the specified trace file. The events
-        are read in chunks of dictionaries to manage memory efficiently.
+        are read in chunks of dictionaries to manage memory efficiently. The trace file is either a CSV
+        file or a binary trace (see `BinaryTrace`), and may be compressed with gzip, bzip2 or xz.
 
         Args:
             i_trace_file (str): The path to the trace file.
@@ -231,7 +382,8 @@ class Monitor:
 
         This method uses the FileUtils to read events from the specified trace file. The events
         are read in chunks of strings to manage memory efficiently, with each chunk being a list
-        of strings, where each string represents a single row from the trace file.
+        of strings, where each string represents a single row from the trace file. The trace file is
+        either a CSV file or a binary trace (see `BinaryTrace`), and may be compressed with gzip, bzip2 or xz.
 
         Args:
             i_trace_file (str): The path to the trace file.
@@ -243,6 +395,70 @@ class Monitor:
         """
         return FileUtils.read_events_from_file_as_string(i_trace_file, chunk_size)
 
+    def iter_violations(
+            self,
+            source: Union[str, os.PathLike, Iterable[Union[Dict[str, Any], str]]],
+            chunk_size: int = 10000) -> Iterator[Violation]:
+        """
+        Streams events through the monitor and yields only the property violations.
+
+        Unlike `verify`, no per-event results are built, so memory stays flat regardless of the trace length.
+
+        Args:
+            source (Union[str, os.PathLike, Iterable[Union[Dict[str, Any], str]]]): Either the path to a trace
+                file, or any iterable of events (as dictionaries or strings).
+            chunk_size (int, optional): The number of events read from a trace file at a time. Defaults to 10000.
+
+        Yields:
+            Violation: A record holding the event index, the violated property name, and the original and
+            modified event.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = (event for chunk in FileUtils.read_events_from_file_as_string(os.fspath(source), chunk_size)
+                      for event in chunk)
+        return self.__m_verify.iter_violations(source)
+
+    def verify_file(self, i_trace_file: Union[str, os.PathLike], i_max_violating_events: int = 10000) -> TraceSummary:
+        """
+        Verifies a whole trace file and returns a compact summary of its violations.
+
+        The file is handed to the JVM, which reads and evaluates it, and calls back into Python only for the events
+        with a registered handler (the other events involve no Python work). Monitors without this entry point
+        stream the events through the handlers as usual.
+
+        Args:
+            i_trace_file (Union[str, os.PathLike]): The path to the trace file.
+            i_max_violating_events (int, optional): The maximal number of violating event indices in the summary.
+                Defaults to 10000.
+
+        Returns:
+            TraceSummary: The number of events, the number of violations per property and the indices of the
+            first violating events.
+        """
+        if self.__m_verify.supports_file_eval:
+            self.__m_logger.debug(f"Evaluating {i_trace_file} inside the JVM")
+        return self.__m_verify.verify_file(os.fspath(i_trace_file), i_max_violating_events)
+
+    def translate_handlers(self) -> HandlerTranslation:
+        """
+        Translates the registered operational handlers which stay within the supported subset (counters and flags,
+        dictionaries of counters, comparisons, `if` statements, returning a renamed event) into Scala, so
+        `verify_file` runs them inside the JVM, without calling back into Python. Each handler which could not
+        be translated stays in Python, and the reason is logged.
+
+        Call it once all the handlers are registered: the variables of the translated handlers are copied into
+        the JVM, and from then on their global and closure variables in Python keep their values at translation
+        time, as the events only update the copies inside the JVM.
+
+        Returns:
+            HandlerTranslation: The events whose handlers were translated, and the reason each other handler
+            stays in Python.
+
+        Raises:
+            RuntimeError: If the monitor does not evaluate trace files inside the JVM.
+        """
+        return self.__m_verify.translate_handlers(self.__m_in_process_compilation)
+
     def __is_initialized(self) -> bool:
         """
         Checks if the monitor is initialized.
@@ -353,6 +569,30 @@ class Monitor:
         self.__m_verify.end_eval()
         self.__m_verify.get_stat()
 
+    def reset(self, i_result_file: Optional[str] = None) -> None:
+        """
+        Resets the linked monitor, so another trace can be verified without restarting the JVM.
+
+        The property state (including the event counter and the error counters) and the shared variables
+        are reinitialized, while the compiled monitor and the registered handlers are kept. Call `end` before
+        to close the result file of the previous trace.
+
+        Args:
+            i_result_file (str, optional): A new file for the indices of violating events (ignored with property
+                groups, which keep their result files). Defaults to the current result file.
+
+        Raises:
+            RuntimeError: If the monitor does not support reset (e.g., it was compiled by an older PyDejaVu version).
+        """
+        if i_result_file is not None:
+            result_dir = os.path.dirname(i_result_file)
+            if result_dir:
+                os.makedirs(result_dir, exist_ok=True)
+            self.__m_result_file = i_result_file
+        self.__m_verify.reset(i_result_file)
+        self.__m_verify.process_event({"name": "#init#", "args": []})
+        self.__m_logger.debug("Monitor reset")
+
     def stat(self) -> None:
         """
         Get evaluation stat.
@@ -364,7 +604,7 @@ class Monitor:
         """
         Retrieves the verdict of the last evaluation for a given property.
 
-        This method fetches the verdict from the shared variables using the provided property name.
+        This method fetches the verdict kept by the Verify object for the provided property name.
         If the property name is not found, an error is logged, a `KeyError` is raised, and the program exits.
 
         Args:
@@ -374,10 +614,10 @@ class Monitor:
             Optional[bool]: The verdict of the last evaluation of the property, or None if the property is not found.
 
         Raises:
-            KeyError: If the property name is not defined in the shared variables.
+            KeyError: If the property name is not defined.
             SystemExit: If the property name is not found, the program will exit after logging the error.
         """
-        verdict = self.get_shared(f"#last_eval_{spec_name}#", None)
+        verdict = self.__m_verify.last_eval(spec_name)
 
         if verdict is None:
             self.__m_logger.error(
@@ -454,14 +694,119 @@ def execute_python_script(script_path):
         print(e.stderr)
 
 
+def cache_main(argv: List[str]) -> None:
+    """
+    Command line interface for inspecting and evicting the persistent monitor cache.
+
+    Args:
+        argv (List[str]): The command line arguments following the `cache` subcommand.
+    """
+    arg_parser = argparse.ArgumentParser(prog='pydejavu cache', description='Inspect and evict cached monitors')
+    arg_parser.add_argument('--dir', type=str, default=None, help='Cache directory (default: $PYDEJAVU_CACHE_DIR '
+                                                                   'or ~/.cache/pydejavu/monitors)')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='List the cached monitors')
+    evict_parser = commands.add_parser('evict', help='Evict cached monitors by key (or unique key prefix)')
+    evict_parser.add_argument('keys', nargs='+', help='Cache keys to evict')
+    prune_parser = commands.add_parser('prune', help='Evict old or least recently used monitors')
+    prune_parser.add_argument('--max-age', type=float, default=None, help='Maximal age in days since last use')
+    prune_parser.add_argument('--max-entries', type=int, default=None, help='Maximal number of entries to keep')
+    commands.add_parser('clear', help='Evict all cached monitors')
+
+    args = arg_parser.parse_args(argv)
+    cache = MonitorCache(i_cache_dir=args.dir, i_logger=Logger(i_logging_level=logging.WARNING))
+
+    if args.command == 'list':
+        entries = cache.entries()
+        print(f"{len(entries)} cached monitor(s) in {cache.directory}")
+        for entry in entries:
+            last_used = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['last_used']))
+            spec = ' '.join(entry['specification'].split())
+            print(f"{entry['key'][:12]}  {entry['size'] / 1024:8.1f} KB  last used {last_used}  {spec[:60]}")
+    elif args.command == 'evict':
+        for key in args.keys:
+            print(f"{key}: {'evicted' if cache.evict(key) else 'not found'}")
+    elif args.command == 'prune':
+        print(f"Evicted {cache.prune(i_max_age_days=args.max_age, i_max_entries=args.max_entries)} monitor(s)")
+    elif args.command == 'clear':
+        print(f"Evicted {cache.clear()} monitor(s)")
+
+
+def batch_main(argv: List[str]) -> None:
+    """
+    Command line interface for verifying many trace files on a pool of worker processes.
+
+    Args:
+        argv (List[str]): The command line arguments following the `batch` subcommand.
+    """
+    arg_parser = argparse.ArgumentParser(prog='pydejavu batch', description='Verify many trace files in parallel')
+    arg_parser.add_argument('--qtl', type=str, required=True, help='Path to the QTL file')
+    arg_parser.add_argument('--operational', type=str, required=False, help='Path to the operational event handler file')
+    arg_parser.add_argument('--traces', type=str, nargs='+', required=True,
+                            help='Trace files or glob patterns (quoted, e.g., "logs/**/*.csv")')
+    arg_parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPUs)')
+    arg_parser.add_argument('--bits', type=int, default=20, help='Number of bits for the monitor (default: 20)')
+    arg_parser.add_argument('--result-dir', type=str, default=None, help='Directory for the per-trace result files')
+    arg_parser.add_argument('--summary', type=str, default=None, help='Write the summary as JSON into this file')
+
+    args = arg_parser.parse_args(argv)
+    with open(args.qtl, 'r') as qtl_file:
+        specification = qtl_file.read()
+
+    verifier = BatchVerifier(
+        specification,
+        i_workers=args.workers,
+        i_setup=OperationalFile(args.operational) if args.operational is not None else None,
+        i_result_dir=args.result_dir,
+        i_bits=args.bits)
+    summary = verifier.verify(args.traces)
+
+    print(summary.format())
+    if args.summary is not None:
+        summary.write(args.summary)
+        print(f"Summary written to {args.summary}")
+
+
+def convert_main(argv: List[str]) -> None:
+    """
+    Command line interface for converting CSV trace files into binary traces.
+
+    Args:
+        argv (List[str]): The command line arguments following the `convert` subcommand.
+    """
+    arg_parser = argparse.ArgumentParser(prog='pydejavu convert', description='Convert a CSV trace into a binary trace')
+    arg_parser.add_argument('trace', type=str, help='Path to the CSV trace file')
+    arg_parser.add_argument('output', type=str, nargs='?', default=None,
+                            help=f'Path to the binary trace (default: the trace path with a {BinaryTrace.SUFFIX} suffix)')
+
+    args = arg_parser.parse_args(argv)
+    output = args.output or f"{os.path.splitext(args.trace)[0]}{BinaryTrace.SUFFIX}"
+    start_time = time.perf_counter()
+    events = BinaryTrace.convert(args.trace, output)
+    ratio = os.path.getsize(args.trace) / max(1, os.path.getsize(output))
+    print(f"Converted {events} events into {output} in {time.perf_counter() - start_time:.2f} seconds "
+          f"({ratio:.1f}x smaller)")
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        convert_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'cache':
+        cache_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+        return
+
     # Set up argument parsing
     arg_parser = argparse.ArgumentParser(description='Generate and execute a Python script for PyDejaVu')
     arg_parser.add_argument('--bits', type=int, default=20, help='Number of bits for the monitor (default: 16)')
     arg_parser.add_argument('--stats', type=bool, default=False, help='Enable or disable statistics (default: False)')
     arg_parser.add_argument('--qtl', type=str, required=True, help='Path to the QTL file')
     arg_parser.add_argument('--operational', type=str, required=False, help='Path to the operational event handler file')
-    arg_parser.add_argument('--trace', type=str, required=True, help='Path to the trace file')
+    arg_parser.add_argument('--trace', type=str, required=True,
+                            help='Path to the trace file (CSV or binary, optionally .gz, .bz2 or .xz compressed)')
 
     args = arg_parser.parse_args()
 
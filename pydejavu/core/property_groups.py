@@ -0,0 +1,246 @@
+import logging
+import multiprocessing
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydejavu.compilation.spec_parser_synthesizer import SpecParserSynthesizer
+from pydejavu.core.verify import Verify
+from pydejavu.utils.logger import Logger
+
+
+def _group_worker(i_spec: str, i_options: Dict[str, Any], i_connection) -> None:
+    """
+    The main loop of a property group worker process.
+
+    The worker links the monitor of its group of properties and evaluates the (already preprocessed)
+    events it receives, until it receives None. It registers no handlers, since the operational phase
+    runs once in the parent process.
+
+    Args:
+        i_spec (str): The specification of the group.
+        i_options (Dict[str, Any]): Additional `Monitor` options.
+        i_connection: The worker end of the pipe to the parent process.
+    """
+    try:
+        from pydejavu.core.monitor import Monitor
+        monitor = Monitor(i_spec=i_spec, **i_options)
+        i_connection.send(None)
+    except Exception as e:
+        i_connection.send(e)
+        return
+
+    while True:
+        request = i_connection.recv()
+        if request is None:
+            break
+        command, payload = request
+        try:
+            if command == 'eval':
+                i_connection.send(monitor.verify.process_event(payload)["Eval result"])
+            elif command == 'eval_batch':
+                i_connection.send([result["Eval result"] for result in monitor.verify.process_events(payload)])
+            elif command == 'end_eval':
+                monitor.verify.end_eval()
+                i_connection.send(None)
+            elif command == 'get_stat':
+                monitor.stat()
+                i_connection.send(None)
+            elif command == 'reset':
+                monitor.reset()
+                i_connection.send(None)
+        except Exception as e:
+            i_connection.send(e)
+
+
+class PropertyGroups:
+    """Evaluates the properties of a specification in groups, each on its own worker process.
+
+    The synthesized monitor evaluates every property for every event. This class splits a multi-property
+    specification into groups of properties, and links one monitor per group in a worker process (each with
+    its own JVM). Every event is sent to all groups, which evaluate it in parallel, and the per-property
+    verdicts are merged back into a single result, in the order of the properties in the specification.
+
+    This class exposes the entry points of a linked `TraceMonitor` (`config`, `eval`, `eval_batch`,
+    `end_eval`, `get_stat`), so it is used in place of one by the `Verify` of the parent process. The
+    operational-phase handlers and parsers therefore run once, in the parent, and their output is fanned
+    out to all groups.
+    """
+
+    def __init__(
+            self,
+            i_spec: str,
+            i_groups: int,
+            i_logging_level: int = logging.INFO,
+            **i_monitor_options: Any):
+        """
+        Splits the specification and starts one worker process per group.
+
+        Args:
+            i_spec (str): The specification.
+            i_groups (int): The number of groups (at most the number of properties).
+            i_logging_level (int): The logging level. Defaults to INFO level.
+            **i_monitor_options (Any): Additional `Monitor` options (e.g., `i_bits`) for the workers.
+
+        Raises:
+            RuntimeError: If a worker fails to link its monitor.
+        """
+        self.__m_logger = Logger(i_logging_level=i_logging_level)
+        self.__m_specs = self.split(i_spec, i_groups)
+        spec_parser = SpecParserSynthesizer(i_logger=self.__m_logger)
+        spec_parser.extract_spec_names(re.sub(r'//[^\n]*', '', i_spec))
+        self.__m_properties: List[str] = spec_parser.names
+
+        context = multiprocessing.get_context('spawn')
+        self.__m_workers: List[Tuple[Any, Any]] = []
+        for group, spec in enumerate(self.__m_specs):
+            options = dict(i_monitor_options, i_logging_level=i_logging_level, i_compact_results=False)
+            if 'i_result_file' in options:
+                options['i_result_file'] = f"{options['i_result_file']}.group{group}"
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_group_worker, args=(spec, options, child_connection), daemon=True)
+            process.start()
+            self.__m_workers.append((process, parent_connection))
+
+        for _, connection in self.__m_workers:
+            error = connection.recv()
+            if error is not None:
+                self.close()
+                raise RuntimeError(f"Property group worker failed to start: {error}") from error
+        self.__m_logger.info(f"Specification split into {len(self.__m_specs)} property groups")
+
+    @property
+    def specifications(self) -> List[str]:
+        return self.__m_specs
+
+    @staticmethod
+    def split(i_specification: str, i_groups: int) -> List[str]:
+        """
+        Splits a specification into groups of properties.
+
+        Predicate definitions (`pred`) are copied into every group, and the properties are distributed so
+        that the groups are balanced by the size of their formulas.
+
+        Args:
+            i_specification (str): The specification.
+            i_groups (int): The number of groups.
+
+        Returns:
+            List[str]: The specification of each group (fewer than `i_groups` if there are fewer properties).
+        """
+        specification = re.sub(r'//[^\n]*', '', i_specification)
+        blocks = [block.strip() for block in re.split(r'(?=\b(?:prop|pred)\s+\w+)', specification) if block.strip()]
+        definitions = [block for block in blocks if not block.startswith('prop')]
+        properties = [block for block in blocks if block.startswith('prop')]
+
+        groups: List[List[str]] = [[] for _ in range(max(1, min(i_groups, len(properties))))]
+        sizes = [0] * len(groups)
+        for block in sorted(properties, key=len, reverse=True):
+            smallest = sizes.index(min(sizes))
+            groups[smallest].append(block)
+            sizes[smallest] += len(block)
+
+        # Keep the original property order within each group
+        order = {block: index for index, block in enumerate(properties)}
+        return ["\n".join(definitions + sorted(group, key=order.get)) + "\n" for group in groups]
+
+    def config(self, i_bits: str, i_mode: str, i_statistics: str, i_result_file: str) -> None:
+        # The workers are configured by the monitor options they were started with
+        pass
+
+    def eval(self, i_event: str) -> str:
+        """
+        Evaluates an event on all groups.
+
+        Args:
+            i_event (str): The event.
+
+        Returns:
+            str: The merged evaluation result.
+
+        Raises:
+            RuntimeError: If a group failed to evaluate the event.
+        """
+        results = self.__broadcast('eval', i_event)
+        merged = self.__merge(i_event, results)
+        if merged is None:
+            raise RuntimeError(f"A property group failed to evaluate '{i_event}'")
+        return merged
+
+    def eval_batch(self, i_events: List[str]) -> List[Optional[str]]:
+        """
+        Evaluates a batch of events on all groups.
+
+        Args:
+            i_events (List[str]): The events.
+
+        Returns:
+            List[Optional[str]]: The merged evaluation results (None where a group failed).
+        """
+        return [self.__merge(event, results)
+                for event, results in zip(i_events, zip(*self.__broadcast('eval_batch', i_events)))]
+
+    def end_eval(self) -> None:
+        self.__broadcast('end_eval', None)
+
+    def get_stat(self) -> None:
+        self.__broadcast('get_stat', None)
+
+    def reset(self) -> None:
+        # Each group keeps the result file it was started with
+        self.__broadcast('reset', None)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        for _, connection in self.__m_workers:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, connection in self.__m_workers:
+            process.join()
+            connection.close()
+        self.__m_workers = []
+
+    def __broadcast(self, i_command: str, i_payload: Any) -> List[Any]:
+        """
+        Sends a request to all groups, which process it in parallel, and collects their responses.
+
+        Args:
+            i_command (str): The command.
+            i_payload (Any): The command payload.
+
+        Returns:
+            List[Any]: The responses, in the order of the groups.
+
+        Raises:
+            RuntimeError: If a group failed to process the request.
+        """
+        for _, connection in self.__m_workers:
+            connection.send((i_command, i_payload))
+        responses = [connection.recv() for _, connection in self.__m_workers]
+        for response in responses:
+            if isinstance(response, Exception):
+                raise RuntimeError(f"Property group worker failed: {response}") from response
+        return responses
+
+    def __merge(self, i_event: str, i_results: Tuple[Optional[str], ...]) -> Optional[str]:
+        """
+        Merges the evaluation results of the groups for one event.
+
+        Args:
+            i_event (str): The event.
+            i_results (Tuple[Optional[str], ...]): The evaluation result of each group.
+
+        Returns:
+            Optional[str]: The verdicts of all the properties, in the order of the specification (or the result
+            of the first group for a control event whose result holds no property verdicts, e.g. '#end#=true'),
+            or None if any group failed to evaluate the event.
+        """
+        if any(result is None or result == "Error in eval" for result in i_results):
+            return None
+        verdicts = dict(verdict.split('=', 1) for result in i_results for verdict in result.split(','))
+        if i_event.split(',', 1)[0] in Verify.CONTROL_EVENTS and not verdicts.keys() >= set(self.__m_properties):
+            return i_results[0]
+        return ",".join(f"{name}={verdicts[name]}" for name in self.__m_properties)
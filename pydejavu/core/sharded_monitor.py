@@ -0,0 +1,418 @@
+import logging
+import multiprocessing
+import os
+import re
+import zlib
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydejavu.core.compact_verdicts import CompactVerdicts
+from pydejavu.core.violation import Violation
+from pydejavu.utils.file_utils import FileUtils
+from pydejavu.utils.logger import Logger
+
+Event = Union[Dict[str, Any], str]
+Partition = Union[Dict[str, int], Callable[[Event], Optional[Any]]]
+
+
+def _shard_worker(i_spec: str, i_options: Dict[str, Any], i_setup: Optional[Callable], i_connection) -> None:
+    """
+    The main loop of a shard worker process.
+
+    The worker links its own monitor, lets the setup callable register the event handlers and parsers,
+    and then evaluates the chunks of events it receives, until it receives None. The verdicts of a chunk are
+    sent back as a single `CompactVerdicts` instance, rather than a result dictionary per event.
+
+    Args:
+        i_spec (str): The specification.
+        i_options (Dict[str, Any]): Additional `Monitor` options.
+        i_setup (Callable, optional): Called with the worker's monitor, e.g., to register handlers.
+        i_connection: The worker end of the pipe to the parent process.
+    """
+    try:
+        from pydejavu.core.monitor import Monitor
+        monitor = Monitor(i_spec=i_spec, **i_options)
+        if i_setup is not None:
+            i_setup(monitor)
+        i_connection.send(None)
+    except Exception as e:
+        i_connection.send(e)
+        return
+
+    while True:
+        events = i_connection.recv()
+        if events is None:
+            break
+        try:
+            i_connection.send(monitor.verify.process_events(events))
+        except Exception as e:
+            i_connection.send(e)
+    monitor.end()
+
+
+class ShardedMonitor:
+    """Verifies a trace on several worker processes, partitioned by a key argument of the events.
+
+    Sharding is sound only for properties local to one key: the verdict of a property for a key may depend
+    only on the events of that key and on the broadcast events, because a shard never sees the events of the
+    keys of the other shards. Specifications with the `@` (previous) operator are rejected, since the previous
+    event of a shard is not the previous event of the trace. Other operators which relate consecutive events,
+    such as an `S` whose left operand has to hold on the events of all keys, are not detected, so keeping the
+    properties local to their key is up to the caller.
+
+    Specifications of the form `forall ip . forall user . ...` never relate events of different keys
+    (here, different `ip` values). Each event carrying the key is therefore routed, by a hash of its key,
+    to a single shard, while events without the key are broadcast to all shards. Each shard is a worker
+    process with its own JVM and linked monitor, so the throughput scales with the number of cores.
+
+    The partition argument is given per event name (`{"login": 0}` routes `login` events by their first
+    argument), as a callable returning the key of an event (or None to broadcast it), or is inferred from the
+    outermost universally quantified variable of the properties (see `infer_partition`).
+
+    The verdicts are merged back into the original event order. The verdict of a routed event is the verdict
+    of its shard, and the verdict of a broadcast event is the conjunction of the shards' verdicts. The shards
+    reply with a `CompactVerdicts` instance per chunk, so only the verdict cells and the text of the violating
+    events cross the process boundary. Operational-phase handlers run in the shards, so their state has to be
+    kept per key as well.
+    """
+
+    def __init__(
+            self,
+            i_spec: str,
+            i_shards: Optional[int] = None,
+            i_partition: Optional[Partition] = None,
+            i_setup: Optional[Callable] = None,
+            i_logging_level: int = logging.INFO,
+            **i_monitor_options: Any):
+        """
+        Starts the shard worker processes.
+
+        Args:
+            i_spec (str): The specification.
+            i_shards (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            i_partition (Partition, optional): The event name to key argument index mapping, or a callable
+                returning the key of an event. Defaults to the partition inferred from the specification.
+            i_setup (Callable, optional): A picklable (module level) callable, called in every worker with its
+                `Monitor` instance, e.g., to register the event handlers and parsers.
+            i_logging_level (int): The logging level. Defaults to INFO level.
+            **i_monitor_options (Any): Additional `Monitor` options (e.g., `i_bits`) for the workers.
+
+        Raises:
+            ValueError: If the specification relates the events of different keys (see `check_locality`), or
+                no partition is given and none can be inferred from the specification.
+            RuntimeError: If a worker fails to link its monitor.
+        """
+        self.check_locality(i_spec)
+        self.__m_logger = Logger(i_logging_level=i_logging_level)
+        self.__m_shards = (os.cpu_count() or 1) if i_shards is None else i_shards
+        self.__m_partition = self.infer_partition(i_spec) if i_partition is None else i_partition
+
+        context = multiprocessing.get_context('spawn')
+        self.__m_workers: List[Tuple[Any, Any]] = []
+        for shard in range(self.__m_shards):
+            options = dict(i_monitor_options, i_logging_level=i_logging_level, i_compact_results=True)
+            options.setdefault('i_result_file', os.path.join("output", f"resultFile.shard{shard}"))
+            options.setdefault('i_cache', True)
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(i_spec, options, i_setup, child_connection),
+                                      daemon=True)
+            process.start()
+            self.__m_workers.append((process, parent_connection))
+
+            # The first shard builds the monitor, the others then find it in the monitor cache (unless disabled)
+            if shard == 0:
+                self.__wait_ready(parent_connection)
+
+        for _, connection in self.__m_workers[1:]:
+            self.__wait_ready(connection)
+        self.__m_logger.info(f"Sharded monitor started with {self.__m_shards} shards")
+
+    @property
+    def shards(self) -> int:
+        return self.__m_shards
+
+    @property
+    def partition(self) -> Partition:
+        return self.__m_partition
+
+    @staticmethod
+    def check_locality(i_specification: str) -> None:
+        """
+        Rejects specifications whose properties are known to relate the events of different keys.
+
+        Args:
+            i_specification (str): The specification.
+
+        Raises:
+            ValueError: If a property uses the `@` (previous) operator.
+        """
+        specification = re.sub(r'//[^\n]*', '', i_specification)
+        for name, body in re.findall(r'prop\s+(\w+)\s*:(.*?)(?=\bprop\s+\w+\s*:|\Z)', specification, re.DOTALL):
+            if '@' in body:
+                raise ValueError(f"Property '{name}' uses the '@' operator, whose previous event depends on the "
+                                 f"events of all keys, so it cannot be verified by shards")
+
+    @staticmethod
+    def infer_partition(i_specification: str) -> Dict[str, int]:
+        """
+        Infers the partition argument of each event from the specification.
+
+        The key of a property is its outermost universally quantified variable, and the partition argument of
+        an event is the position of that variable among the arguments of the event's predicate. Events whose
+        predicate occurs without the key somewhere are left out of the mapping, i.e., they are broadcast.
+
+        Args:
+            i_specification (str): The specification.
+
+        Returns:
+            Dict[str, int]: The event name to key argument index mapping.
+
+        Raises:
+            ValueError: If a property does not start with a universal quantifier, or the properties
+                disagree on the partition argument of an event.
+        """
+        specification = re.sub(r'//[^\n]*', '', i_specification)
+        partition: Dict[str, int] = {}
+        unkeyed = set()
+        for name, body in re.findall(r'prop\s+(\w+)\s*:(.*?)(?=\bprop\s+\w+\s*:|\Z)', specification, re.DOTALL):
+            quantifier = re.match(r'[\s(]*forall\s+(\w+)\s*\.', body)
+            if quantifier is None:
+                raise ValueError(f"Property '{name}' is not universally quantified, the partition cannot be inferred")
+            key = quantifier.group(1)
+
+            for predicate, args in re.findall(r'(\w+)\s*\(([^()]*)\)', body):
+                args = [arg.strip() for arg in args.split(',')]
+                if key not in args:
+                    # Some occurrence relates the event to all keys, so it has to be broadcast
+                    unkeyed.add(predicate)
+                elif partition.setdefault(predicate, args.index(key)) != args.index(key):
+                    raise ValueError(f"The properties disagree on the partition argument of '{predicate}'")
+
+        partition = {predicate: index for predicate, index in partition.items() if predicate not in unkeyed}
+        if not partition:
+            raise ValueError("No event carries the quantified variable, the partition cannot be inferred")
+        return partition
+
+    @staticmethod
+    def merge_verdicts(i_eval_results: Iterable[Optional[str]]) -> Optional[str]:
+        """
+        Merges the verdicts of several shards for the same (broadcast) event.
+
+        Args:
+            i_eval_results (Iterable[Optional[str]]): The evaluation results, in the format
+                'property1=verdict1,...', or None for shards which did not evaluate the event.
+
+        Returns:
+            Optional[str]: The conjunction of the verdicts per property, or None if no shard evaluated the event.
+        """
+        verdicts: Dict[str, bool] = {}
+        for eval_result in i_eval_results:
+            if eval_result is None or eval_result == "Error in eval":
+                continue
+            for spec in eval_result.split(','):
+                name, verdict = spec.split('=')
+                verdicts[name] = verdicts.get(name, True) and verdict == "true"
+        if not verdicts:
+            return None
+        return ",".join(f"{name}={str(verdict).lower()}" for name, verdict in verdicts.items())
+
+    def shard_of(self, i_event: Event) -> Optional[int]:
+        """
+        Returns the shard an event is routed to.
+
+        Args:
+            i_event (Event): The event, as a dictionary or as a string.
+
+        Returns:
+            Optional[int]: The shard index, or None if the event is broadcast to all shards.
+        """
+        if callable(self.__m_partition):
+            key = self.__m_partition(i_event)
+        else:
+            if isinstance(i_event, dict):
+                name, args = i_event.get('name'), i_event.get('args', [])
+            else:
+                name, *args = i_event.split(',')
+            index = self.__m_partition.get(name)
+            key = args[index] if index is not None and index < len(args) else None
+
+        if key is None:
+            return None
+        return zlib.crc32(str(key).strip().encode()) % self.__m_shards
+
+    def verify(self, i_events: List[Event]) -> CompactVerdicts:
+        """
+        Verifies a chunk of events on the shards.
+
+        Args:
+            i_events (List[Event]): The events, as dictionaries or as strings.
+
+        Returns:
+            CompactVerdicts: The verdicts in the event order, as returned by `Monitor.verify` with compact results.
+
+        Raises:
+            RuntimeError: If a worker failed to process its events.
+        """
+        shard_indices: List[List[int]] = [[] for _ in range(self.__m_shards)]
+        routes: List[Optional[int]] = []
+        for index, event in enumerate(i_events):
+            shard = self.shard_of(event)
+            routes.append(shard)
+            for target in range(self.__m_shards) if shard is None else (shard,):
+                shard_indices[target].append(index)
+
+        # All shards work in parallel, results are collected once everything was sent
+        for (_, connection), indices in zip(self.__m_workers, shard_indices):
+            connection.send([i_events[index] for index in indices])
+        shard_results = self.__receive_all()
+
+        # A shard which evaluated none of its events does not know the properties yet
+        properties = next((results.properties for results in shard_results if results.properties), ())
+        verdicts = CompactVerdicts(properties)
+
+        # Index of the result of every event within the results of each shard
+        positions: List[Dict[int, int]] = [{index: position for position, index in enumerate(indices)}
+                                           for indices in shard_indices]
+        for index, shard in enumerate(routes):
+            targets = range(self.__m_shards) if shard is None else (shard,)
+            rows = [self.__row(shard_results[target], positions[target][index], properties) for target in targets]
+            # The conjunction of the evaluated cells of each property (FALSE < TRUE), as in `merge_verdicts`
+            cells = rows[0] if len(rows) == 1 else array('b', [
+                min((cell for cell in column if cell != CompactVerdicts.NOT_EVALUATED),
+                    default=CompactVerdicts.NOT_EVALUATED)
+                for column in zip(*rows)])
+            event = None
+            if CompactVerdicts.FALSE in cells:
+                event = next(shard_results[target].event(positions[target][index]) for target, row in
+                             zip(targets, rows) if CompactVerdicts.FALSE in row)
+            verdicts.append_row(cells, event)
+        return verdicts
+
+    def iter_violations(
+            self,
+            i_source: Union[str, os.PathLike, Iterable[Event]],
+            i_chunk_size: int = 10000) -> Iterator[Violation]:
+        """
+        Streams events through the shards and yields only the property violations, in the event order.
+
+        Args:
+            i_source (Union[str, os.PathLike, Iterable[Event]]): Either the path to a trace file, or any
+                iterable of events (as dictionaries or strings).
+            i_chunk_size (int, optional): The number of events sent to the shards at a time. Defaults to 10000.
+
+        Yields:
+            Violation: A record holding the event index, the violated property name, and the original and
+            modified event.
+        """
+        if isinstance(i_source, (str, os.PathLike)):
+            chunks = FileUtils.read_events_from_file_as_string(os.fspath(i_source), i_chunk_size)
+        else:
+            chunks = self.__chunks(i_source, i_chunk_size)
+
+        offset = 0
+        for chunk in chunks:
+            verdicts = self.verify(chunk)
+            for index in verdicts.violations():
+                original_event, modified_event = verdicts.event(index)
+                for name, cell in zip(verdicts.properties, verdicts.row(index)):
+                    if cell == CompactVerdicts.FALSE:
+                        yield Violation(offset + index, name, original_event, modified_event)
+            offset += len(chunk)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        for process, connection in self.__m_workers:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process, connection in self.__m_workers:
+            process.join()
+            connection.close()
+        self.__m_workers = []
+
+    def __enter__(self) -> 'ShardedMonitor':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def __chunks(i_events: Iterable[Event], i_chunk_size: int) -> Iterator[List[Event]]:
+        """
+        Splits an iterable of events into chunks.
+
+        Args:
+            i_events (Iterable[Event]): The events.
+            i_chunk_size (int): The chunk size.
+
+        Yields:
+            List[Event]: The chunks.
+        """
+        chunk = []
+        for event in i_events:
+            chunk.append(event)
+            if len(chunk) >= i_chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def __wait_ready(self, i_connection) -> None:
+        """
+        Waits for a worker to link its monitor.
+
+        Args:
+            i_connection: The parent end of the pipe to the worker.
+
+        Raises:
+            RuntimeError: If the worker failed to link its monitor.
+        """
+        error = i_connection.recv()
+        if error is not None:
+            self.close()
+            raise RuntimeError(f"Shard worker failed to start: {error}") from error
+
+    @staticmethod
+    def __row(i_results: CompactVerdicts, i_position: int, i_properties: Tuple[str, ...]) -> array:
+        """
+        Returns the verdict cells of an event of a shard, in the column order of the merged verdicts.
+
+        Args:
+            i_results (CompactVerdicts): The verdicts of the shard.
+            i_position (int): The position of the event within the events of the shard.
+            i_properties (Tuple[str, ...]): The property names of the merged verdicts.
+
+        Returns:
+            array: The `array('b')` verdict cells.
+        """
+        if i_results.properties == i_properties:
+            return i_results.row(i_position)
+        if not i_results.properties:
+            return array('b', [CompactVerdicts.NOT_EVALUATED] * len(i_properties))
+        row = i_results.row(i_position)
+        return array('b', [row[i_results.properties.index(name)] for name in i_properties])
+
+    def __receive_all(self) -> List[CompactVerdicts]:
+        """
+        Receives the results of every worker. The replies of all the workers are received before an error is
+        raised, so none is left in a pipe, where it would be taken for the reply to the next chunk.
+
+        Returns:
+            List[CompactVerdicts]: The verdicts of each worker.
+
+        Raises:
+            RuntimeError: If a worker failed to process its events.
+        """
+        replies = []
+        for _, connection in self.__m_workers:
+            try:
+                replies.append(connection.recv())
+            except EOFError as e:
+                replies.append(e)
+        for shard, results in enumerate(replies):
+            if isinstance(results, Exception):
+                raise RuntimeError(f"Shard worker {shard} failed: {results}") from results
+        return replies
@@ -53,3 +53,9 @@ class SharedState:
             key (str): The key to delete from the shared state.
         """
         self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Deletes all the keys and their associated values from the shared state.
+        """
+        self._data.clear()
@@ -0,0 +1,15 @@
+from typing import Dict, List, NamedTuple
+
+
+class TraceSummary(NamedTuple):
+    """A compact summary of the verification of a whole trace.
+
+    Attributes:
+        events (int): The number of events in the trace.
+        violations (Dict[str, int]): The number of violating events per property (0 for satisfied properties).
+        violating_events (List[int]): The zero based indices of the first violating events (of any property).
+    """
+
+    events: int
+    violations: Dict[str, int]
+    violating_events: List[int]
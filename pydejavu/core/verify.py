@@ -1,9 +1,20 @@
-import inspect
-
-from typing import Any, Dict, List, Optional, Callable, get_type_hints, Union, Tuple
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Callable, Union, Tuple, Iterable, Iterator
 from functools import lru_cache
 
+from pydejavu.compilation.handler_translator import HandlerTranslation, HandlerTranslator
+from pydejavu.core.compact_verdicts import CompactVerdicts
+from pydejavu.core.dispatch_plan import DispatchPlan, TranslatedPlan
+from pydejavu.core.event_pipeline import EventPipeline
 from pydejavu.core.event_operational_mapper import EventOperationalMapper
+from pydejavu.core.trace_summary import TraceSummary
+from pydejavu.core.violation import Violation
+from pydejavu.jni.handler_callback import HandlerCallback
+from pydejavu.jni.translated_handlers import TranslatedHandlers
+from pydejavu.utils.binary_trace import BinaryTrace
+from pydejavu.utils.compressed_trace import CompressedTrace
+from pydejavu.utils.file_utils import FileUtils
 from pydejavu.utils.logger import Logger
 
 
@@ -14,13 +25,29 @@ class Verify:
     and interact with an underlying monitor to evaluate events.
     """
 
+    # Maximal number of events handed to the monitor in a single batch evaluation call
+    BATCH_SIZE = 10000
+
+    # The control events of the monitor template, the verdict mask of a control event whose result holds no
+    # property verdicts (see `MonitorExtensions`), and the results of such events, as `eval` reports them
+    CONTROL_EVENTS = frozenset(("#init#", "#end#", "#skip#"))
+    CONTROL_MASK = -2
+    CONTROL_RESULTS = {"#end#": "#end#=true", "#skip#": "#skip#=false"}
+
     def __init__(
             self,
             i_dejavu_monitor: Any,
             i_bits: int = 20,
             i_mode: Optional[str] = None,
             i_statistics: bool = True,
-            i_logger: Logger = None
+            i_logger: Logger = None,
+            i_batch_eval: bool = False,
+            i_compact_results: bool = False,
+            i_structured_eval: bool = False,
+            i_result_file: str = "output/resultFile",
+            i_pipelined: bool = False,
+            i_reset: bool = False,
+            i_file_eval: bool = False
     ):
         """
         Initializes the Verify instance with the provided monitor and configuration.
@@ -31,19 +58,50 @@ class Verify:
             i_mode (Optional[str], optional): The mode of operation. Defaults to None.
             i_statistics (bool, optional): Flag to enable or disable statistics. Defaults to True.
             i_logger (Logger, optional): A custom logger instance. Defaults to None.
+            i_batch_eval (bool, optional): Whether the monitor supports `eval_batch`, which lets
+                `process_events` evaluate runs of unhandled events in a single JNI call. Defaults to False.
+            i_compact_results (bool, optional): Whether `process_events` returns a `CompactVerdicts` instance
+                instead of a list of per-event result dictionaries. Defaults to False.
+            i_structured_eval (bool, optional): Whether the monitor supports `properties`, `eval_mask` and
+                `eval_batch_mask`, which return verdicts as bitmasks in a fixed property order instead of
+                'name=verdict' strings. Defaults to False.
+            i_result_file (str, optional): The file DejaVu writes the indices of violating events into.
+                Defaults to "output/resultFile".
+            i_pipelined (bool, optional): Whether `process_events` and `iter_events` run the parsing, the
+                operational handlers and the monitor evaluation on separate threads (see
+                `iter_events_pipelined`). Defaults to False.
+            i_reset (bool, optional): Whether the monitor supports `reset`, which lets `reset` start the verification
+                of a new trace. Defaults to False.
+            i_file_eval (bool, optional): Whether the monitor supports `eval_file`, which lets `verify_file` evaluate
+                a whole trace file inside the JVM when no handlers or parsers are registered. Defaults to False.
         """
 
         self.__m_logger = Logger(i_name=__name__) if i_logger is None else i_logger
         self.__m_dejavu_monitor = i_dejavu_monitor
-        self.__monitor_setup(i_bits, i_mode, i_statistics)
+        self.__m_batch_eval = i_batch_eval
+        self.__m_compact_results = i_compact_results
+        self.__m_pipelined = i_pipelined
+        self.__m_reset = i_reset
+        self.__m_file_eval = i_file_eval
+        self.__m_config = (i_bits, i_mode, i_statistics, i_result_file)
+        self.__monitor_setup(i_bits, i_mode, i_statistics, i_result_file)
         self.event_mapper = EventOperationalMapper()
-        self.__m_handler_info_cache: Dict[Callable, Dict[str, Any]] = {}
+
+        # Verdicts as bitmasks, with the property order fetched once from the monitor
+        self.__m_properties: Tuple[str, ...] = ()
+        self.__m_property_bits: Dict[str, int] = {}
+        self.__m_verdict_strings: Dict[int, str] = {}
+        self.__m_last_mask = 0
+        self.__m_structured_eval = i_structured_eval and self.__fetch_properties()
+
+        # The handlers translated into Scala, run by the JVM-driven trace loop
+        self.__m_translated: Optional[TranslatedHandlers] = None
 
         # Mapping for custom event processor handlers
         self.__m_custom_event_processor_handlers: Dict[str, Callable[[Any], Tuple[str, List[Any], str]]] = {}
 
     def __call__(self, input_data: Union[Dict[str, Any], str, List[Dict[str, Any]], List[str]]) -> \
-            Union[Dict[str, Any], List[Dict[str, Any]]]:
+            Union[Dict[str, Any], List[Dict[str, Any]], CompactVerdicts]:
         """
         Process either a single event or multiple events based on the input type.
 
@@ -52,7 +110,7 @@ class Verify:
                 Either a single event (as a dict or string) or a list of events.
 
         Returns:
-            Union[Dict[str, Any], List[Dict[str, Any]]]: The result(s) of processing the event(s).
+            Union[Dict[str, Any], List[Dict[str, Any]], CompactVerdicts]: The result(s) of processing the event(s).
 
         Raises:
             ValueError: If the input_data is not in the expected format.
@@ -110,62 +168,161 @@ class Verify:
         Returns:
             Dict[str, Any]: The result of processing and evaluating the event.
         """
+        origin_eval_input, modified_eval_input, eval_result = self.__evaluate(event)
+        return {
+            "Original Event": origin_eval_input,
+            "Modified Event": modified_eval_input,
+            "Eval result": eval_result
+        }
+
+    def __evaluate(self, event: Union[Dict[str, Any], str]) -> Tuple[str, str, Optional[str]]:
+        """
+        Runs the operational phase on a single event and evaluates the outcome using the monitor.
+
+        Args:
+            event (Union[Dict[str, Any], str]): The event data.
+
+        Returns:
+            Tuple[str, str, Optional[str]]: The original event, the modified event ("skip" if the handler
+            skipped the event) and the evaluation result (None for skipped events).
+        """
+        event_name, event_args, origin_eval_input, plan = self.__resolve(event)
+        modified_eval_input = self.__dispatch(event_name, event_args, origin_eval_input, plan)
+        if modified_eval_input is None:
+            return origin_eval_input, "skip", None
+        return origin_eval_input, modified_eval_input, self.__eval(event_name, modified_eval_input)
+
+    def __dispatch(
+            self,
+            event_name: str,
+            event_args: Any,
+            origin_eval_input: str,
+            plan: Optional[DispatchPlan]) -> Optional[str]:
+        """
+        Runs the operational handler of an event.
+
+        Args:
+            event_name (str): The event name.
+            event_args (Any): The event arguments.
+            origin_eval_input (str): The original event.
+            plan (Optional[DispatchPlan]): The dispatch plan of the handler, None if the event has no handler.
+
+        Returns:
+            Optional[str]: The modified event (the original event if it has no handler or the handler failed),
+            or None if the handler skipped the event.
+
+        Raises:
+            TypeError: If the arguments cannot be cast or the handler returns an invalid value.
+        """
+        if plan is None:
+            return origin_eval_input
+        try:
+            return plan.dispatch(event_args)
+        except TypeError as e:
+            raise TypeError(f"Error processing event {event_name}: {str(e)}")
+        except Exception as e:
+            self.__m_logger.error(f"Error processing event {event_name}: {str(e)}")
+            return origin_eval_input
+
+    async def process_event_async(
+            self,
+            event: Union[Dict[str, Any], str],
+            executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Processes a single event like `process_event`, awaiting its handler if it is a coroutine function.
+
+        Args:
+            event (Union[Dict[str, Any], str]): The event data, which can be either a dictionary
+            containing 'name' and 'args', or a string formatted as 'event_name,arg1,arg2,...'.
+            executor (Executor, optional): The executor the monitor evaluation runs on, so it does not block the
+                event loop. Defaults to None, for an evaluation on the event loop.
+
+        Returns:
+            Dict[str, Any]: The result of processing and evaluating the event.
+        """
+        event_name, event_args, origin_eval_input, plan = self.__resolve(event)
 
-        # Determine event name
-        event_name = None
-        if isinstance(event, dict):
-            event_name = event.get('name')
+        modified_eval_input = origin_eval_input
+        eval_result = None
+        try:
+            if plan is not None:
+                modified_eval_input = await plan.dispatch_async(event_args)
+        except TypeError as e:
+            raise TypeError(f"Error processing event {event_name}: {str(e)}")
+        except Exception as e:
+            self.__m_logger.error(f"Error processing event {event_name}: {str(e)}")
+            modified_eval_input = origin_eval_input
+
+        if modified_eval_input is None:
+            modified_eval_input = "skip"
+        elif executor is None:
+            eval_result = self.__eval(event_name, modified_eval_input)
+        else:
+            eval_result = await asyncio.get_running_loop().run_in_executor(
+                executor, self.__eval, event_name, modified_eval_input)
+        return {
+            "Original Event": origin_eval_input,
+            "Modified Event": modified_eval_input,
+            "Eval result": eval_result
+        }
+
+    def __resolve(self, event: Union[Dict[str, Any], str]) -> Tuple[str, Any, str, Optional[DispatchPlan]]:
+        """
+        Parses an event and looks up the dispatch plan of its operational handler.
+
+        Args:
+            event (Union[Dict[str, Any], str]): The event data.
+
+        Returns:
+            Tuple[str, Any, str, Optional[DispatchPlan]]: The event name, the event arguments, the original
+            event and the dispatch plan (None if no handler is registered for the event).
+
+        Raises:
+            ValueError: If the number of arguments does not match the handler.
+        """
 
         # Check if a custom parser is registered for this event name
-        if event_name in self.event_mapper.parser_map:
-            self.__m_logger.debug(f"Using custom parser for event '{event_name}'")
-            parser = self.__get_parser(event_name)
+        parser = self.event_mapper.parser_map.get(event.get('name')) if isinstance(event, dict) else None
+        if parser is not None:
             event_data = parser(event)
         else:
             # Default parsing logic
             event_data = self._parse_event(event)
 
         event_name, event_args, origin_eval_input = event_data
-        handler = self.__get_handler(event_name)
+        plan = self.event_mapper.dispatch_map.get(event_name)
 
-        if handler is None:
-            modified_eval_input = origin_eval_input
-        else:
-            handler_info = self.__get_handler_info(handler)
-            required_params = self.__m_handler_info_cache[handler]["num_of_params"]
-
-            if len(event_args) != required_params:
-                raise ValueError(
-                    f"Event '{event_name}' expects {required_params} argument(s), "
-                    f"but {len(event_args)} were given."
-                )
-            try:
-                modified_eval_input = self.__process_mapped_event(handler, handler_info, event_args)
-                if modified_eval_input is None:
-                    return {
-                        "Original Event": origin_eval_input,
-                        "Modified Event": "skip",
-                        "Eval result": None
-                    }
-
-            except TypeError as e:
-                raise TypeError(f"Error processing event {event_name}: {str(e)}")
-            except Exception as e:
-                self.__m_logger.error(f"Error processing event {event_name}: {str(e)}")
-                modified_eval_input = origin_eval_input
+        if plan is not None and len(event_args) != plan.arity:
+            raise ValueError(
+                f"Event '{event_name}' expects {plan.arity} argument(s), "
+                f"but {len(event_args)} were given."
+            )
+        return event_name, event_args, origin_eval_input, plan
+
+    def __eval(self, event_name: str, modified_eval_input: str) -> str:
+        """
+        Evaluates a (modified) event using the monitor.
 
+        Args:
+            event_name (str): The name of the original event, for error reporting.
+            modified_eval_input (str): The event to evaluate.
+
+        Returns:
+            str: The evaluation result, or "Error in eval" if the evaluation failed.
+        """
         try:
+            if self.__m_structured_eval:
+                mask = self.__m_dejavu_monitor.eval_mask(modified_eval_input)
+                if mask == self.CONTROL_MASK:
+                    return self.__control_result(modified_eval_input)
+                self.__m_last_mask = mask
+                return self.__m_verdict_strings.get(mask) or self.__verdict_string(mask)
             eval_result = self.__m_dejavu_monitor.eval(modified_eval_input)
             self.__update_last_eval(eval_result)
+            return eval_result
         except Exception as e:
             self.__m_logger.error(f"Error in eval for event {event_name}: {str(e)}")
-            eval_result = "Error in eval"
-
-        return {
-            "Original Event": origin_eval_input,
-            "Modified Event": modified_eval_input,
-            "Eval result": eval_result
-        }
+            return "Error in eval"
 
     def _parse_event(self, event: Union[Dict[str, Any], str]) -> Tuple[str, List[Any], str]:
         """
@@ -190,7 +347,8 @@ class Verify:
 
         return event_name, event_args, origin_eval_input
 
-    def process_events(self, events: Union[List[Dict[str, Any]], List[str]]) -> List[Dict[str, Any]]:
+    def process_events(self, events: Union[List[Dict[str, Any]], List[str]]) -> \
+            Union[List[Dict[str, Any]], CompactVerdicts]:
         """
         Processes a list of events and evaluates each one.
 
@@ -198,9 +356,392 @@ class Verify:
             events (Union[List[Dict[str, Any]], List[str]]): A list of event data.
 
         Returns:
-            List[Dict[str, Any]]: A list of results from processing and evaluating each event.
+            Union[List[Dict[str, Any]], CompactVerdicts]: A list of results from processing and evaluating
+            each event, or a `CompactVerdicts` instance if compact results are enabled.
+        """
+        if self.__m_compact_results:
+            verdicts = CompactVerdicts(self.__m_properties or None)
+            append = verdicts.append
+            for origin_eval_input, modified_eval_input, eval_result in self.iter_events(events):
+                append(origin_eval_input, modified_eval_input, eval_result)
+            return verdicts
+
+        return [
+            {
+                "Original Event": origin_eval_input,
+                "Modified Event": modified_eval_input,
+                "Eval result": eval_result
+            }
+            for origin_eval_input, modified_eval_input, eval_result in self.iter_events(events)
+        ]
+
+    def iter_events(self, events: Iterable[Union[Dict[str, Any], str]], pipelined: Optional[bool] = None) -> \
+            Iterator[Tuple[str, str, Optional[str]]]:
         """
-        return [self.process_event(event) for event in events]
+        Lazily processes and evaluates events, one result tuple per input event.
+
+        When the monitor supports batch evaluation, consecutive events that have neither a custom
+        parser nor an operational handler are evaluated together in a single call to the monitor
+        (at most `BATCH_SIZE` events per call). Events that do need Python processing flush the pending
+        batch first, so handlers always observe the verdicts of all preceding events.
+
+        Args:
+            events (Iterable[Union[Dict[str, Any], str]]): The events to process.
+            pipelined (bool, optional): Whether the events are evaluated by `iter_events_pipelined`. Unlike the
+                pipeline, the sequential evaluation stops exactly at a failing event, after yielding the results
+                of all preceding events. Defaults to the `i_pipelined` setting.
+
+        Yields:
+            Tuple[str, str, Optional[str]]: The original event, the modified event and the evaluation result.
+        """
+        if self.__m_pipelined if pipelined is None else pipelined:
+            yield from self.iter_events_pipelined(events)
+            return
+
+        if not self.__m_batch_eval:
+            for event in events:
+                yield self.__evaluate(event)
+            return
+
+        event_map = self.event_mapper.event_map
+        parser_map = self.event_mapper.parser_map
+        pending: List[Union[Dict[str, Any], str]] = []
+        for event in events:
+            if isinstance(event, str):
+                interleave = event.split(',', 1)[0] in event_map if event_map else False
+            else:
+                event_name = event.get('name')
+                interleave = event_name in parser_map or event_name in event_map
+
+            if interleave:
+                if pending:
+                    yield from self.__evaluate_batch(pending)
+                    pending = []
+                yield self.__evaluate(event)
+            else:
+                pending.append(event)
+                if len(pending) >= self.BATCH_SIZE:
+                    yield from self.__evaluate_batch(pending)
+                    pending = []
+
+        if pending:
+            yield from self.__evaluate_batch(pending)
+
+    def iter_events_pipelined(
+            self,
+            events: Iterable[Union[Dict[str, Any], str]],
+            i_chunk_size: int = 1000,
+            i_queue_size: int = 4) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """
+        Lazily processes and evaluates events like `iter_events`, with the parsing (and the iteration of the
+        events, e.g., reading a trace file), the operational handlers and the monitor evaluation each running
+        on its own thread, connected by bounded queues. The JVM evaluation of a chunk of events then overlaps
+        the parsing and the handlers of the following chunks.
+
+        The handlers run ahead of the evaluation, so the verdicts they observe through `last_eval` may not
+        include the latest events. Use the sequential `iter_events` when handlers depend on verdicts.
+
+        Args:
+            events (Iterable[Union[Dict[str, Any], str]]): The events to process.
+            i_chunk_size (int, optional): The number of events passed between the stages at once. Defaults to 1000.
+            i_queue_size (int, optional): The number of chunks queued between two stages. Defaults to 4.
+
+        Yields:
+            Tuple[str, str, Optional[str]]: The original event, the modified event and the evaluation result.
+        """
+        pipeline = EventPipeline(
+            [self.__parse_chunk, self.__dispatch_chunk, self.__eval_chunk],
+            i_chunk_size=i_chunk_size,
+            i_queue_size=i_queue_size,
+            i_logger=self.__m_logger)
+        yield from pipeline.run(events)
+
+    def __parse_chunk(self, events: List[Union[Dict[str, Any], str]]) -> List[Tuple[str, Any, str, Any]]:
+        """
+        The parsing stage of the pipeline.
+
+        Args:
+            events (List[Union[Dict[str, Any], str]]): The events.
+
+        Returns:
+            List[Tuple[str, Any, str, Any]]: The event name, arguments, original event and dispatch plan of
+            each event.
+        """
+        return [self.__resolve(event) for event in events]
+
+    def __dispatch_chunk(self, resolved: List[Tuple[str, Any, str, Any]]) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        The operational-phase stage of the pipeline.
+
+        Args:
+            resolved (List[Tuple[str, Any, str, Any]]): The output of the parsing stage.
+
+        Returns:
+            List[Tuple[str, str, Optional[str]]]: The event name, original event and modified event (None if
+            skipped) of each event.
+        """
+        return [
+            (event_name, origin_eval_input, self.__dispatch(event_name, event_args, origin_eval_input, plan))
+            for event_name, event_args, origin_eval_input, plan in resolved
+        ]
+
+    def __eval_chunk(self, dispatched: List[Tuple[str, str, Optional[str]]]) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        The evaluation stage of the pipeline. When the monitor supports batch evaluation, all the events of the
+        chunk which were not skipped are evaluated in a single monitor call.
+
+        Args:
+            dispatched (List[Tuple[str, str, Optional[str]]]): The output of the operational-phase stage.
+
+        Returns:
+            List[Tuple[str, str, Optional[str]]]: The result tuples in the format of `iter_events`.
+        """
+        if not self.__m_batch_eval:
+            return [
+                (origin_eval_input, "skip", None) if modified_eval_input is None
+                else (origin_eval_input, modified_eval_input, self.__eval(event_name, modified_eval_input))
+                for event_name, origin_eval_input, modified_eval_input in dispatched
+            ]
+
+        eval_inputs = [modified_eval_input for _, _, modified_eval_input in dispatched
+                       if modified_eval_input is not None]
+        eval_results = iter(self.__evaluate_batch(eval_inputs) if eval_inputs else [])
+        return [
+            (origin_eval_input, "skip", None) if modified_eval_input is None
+            else (origin_eval_input, modified_eval_input, next(eval_results)[2])
+            for _, origin_eval_input, modified_eval_input in dispatched
+        ]
+
+    def iter_violations(self, events: Iterable[Union[Dict[str, Any], str]]) -> Iterator[Violation]:
+        """
+        Lazily processes and evaluates events, yielding only property violations.
+
+        No per-event results are kept, so memory stays flat regardless of the stream length.
+
+        Args:
+            events (Iterable[Union[Dict[str, Any], str]]): The events to process.
+
+        Yields:
+            Violation: One record per violated property of each violating event.
+        """
+        violated_cache: Dict[Optional[str], Tuple[str, ...]] = {}
+        for index, (origin_eval_input, modified_eval_input, eval_result) in enumerate(self.iter_events(events)):
+            violated = violated_cache.get(eval_result)
+            if violated is None:
+                violated = violated_cache[eval_result] = self.__violated_properties(eval_result)
+            # Control events are not part of the trace verdicts (as in the JVM evaluation of trace files)
+            if violated and modified_eval_input.split(',', 1)[0] in self.CONTROL_EVENTS:
+                continue
+            for property_name in violated:
+                yield Violation(index, property_name, origin_eval_input, modified_eval_input)
+
+    @property
+    def supports_file_eval(self) -> bool:
+        """
+        Whether `verify_file` evaluates trace files inside the JVM, calling back into Python only for the events
+        with a registered handler.
+
+        Returns:
+            bool: True if trace files are evaluated inside the JVM.
+        """
+        return self.__m_file_eval and self.__m_structured_eval
+
+    def verify_file(self, trace_file: str, max_violating_events: int = 10000) -> TraceSummary:
+        """
+        Verifies a whole CSV trace file and summarizes its violations.
+
+        When the monitor supports it, the file is read and evaluated inside the JVM, which calls back into Python
+        only for the events with a registered handler, so the other events never reach Python. Otherwise (and
+        for binary or compressed traces, see `BinaryTrace` and `CompressedTrace`) the events are streamed through
+        `iter_violations`. Parsers only apply to dictionary events, so they are not
+        used for trace files.
+
+        Args:
+            trace_file (str): The path to the trace file.
+            max_violating_events (int, optional): The maximal number of violating event indices in the summary.
+                Defaults to 10000.
+
+        Returns:
+            TraceSummary: The number of events, the violations per property and the first violating events.
+
+        Raises:
+            TypeError: If a handler received arguments it cannot cast, or returned an invalid value.
+            ValueError: If the number of arguments of an event does not match its handler.
+        """
+        if self.supports_file_eval and CompressedTrace.compression(trace_file) is None \
+                and not BinaryTrace.is_binary(trace_file):
+            event_map = self.event_mapper.event_map
+            if event_map:
+                if self.__m_translated is not None:
+                    callback, java_callback = self.__m_translated.fallback, self.__m_translated.java()
+                else:
+                    callback = HandlerCallback(self.__handle_callback, i_logger=self.__m_logger)
+                    java_callback = callback.java()
+                summary = list(self.__m_dejavu_monitor.eval_file_with(
+                    trace_file, max_violating_events, "\n".join(event_map), java_callback))
+                callback.raise_error()
+            else:
+                summary = list(self.__m_dejavu_monitor.eval_file(trace_file, max_violating_events))
+            properties = len(self.__m_properties)
+            return TraceSummary(
+                summary[0],
+                dict(zip(self.__m_properties, summary[1:1 + properties])),
+                summary[1 + properties:])
+
+        events = 0
+        violations = dict.fromkeys(self.__m_properties, 0)
+        violating_events: List[int] = []
+
+        def counted(i_events: Iterable[str]) -> Iterator[str]:
+            nonlocal events
+            for event in i_events:
+                events += 1
+                yield event
+
+        source = counted(event for chunk in FileUtils.read_events_from_file_as_string(trace_file) for event in chunk)
+        last_index = -1
+        for violation in self.iter_violations(source):
+            violations[violation.property_name] = violations.get(violation.property_name, 0) + 1
+            if violation.index != last_index and len(violating_events) < max_violating_events:
+                violating_events.append(violation.index)
+            last_index = violation.index
+        return TraceSummary(events, violations, violating_events)
+
+    def translate_handlers(self, i_in_process_compilation: bool = False) -> HandlerTranslation:
+        """
+        Translates the operational handlers which stay within the supported subset into Scala (see
+        `HandlerTranslator`), and runs them inside the JVM from then on. `verify_file` then only calls back
+        into Python for the events of the handlers which could not be translated.
+
+        The state of a translated handler (its global and closure variables) is copied into the JVM, and is no
+        longer updated in Python, so call this once all the handlers are registered and before verifying events.
+
+        Args:
+            i_in_process_compilation (bool, optional): Whether to compile the translated handlers with the warm
+                Scala compiler inside the embedded JVM. Defaults to False.
+
+        Returns:
+            HandlerTranslation: The events whose handlers were translated, and the reason each other handler
+            stays in Python.
+
+        Raises:
+            RuntimeError: If the monitor does not evaluate trace files inside the JVM, or the handlers were
+                already translated.
+        """
+        if not self.supports_file_eval:
+            raise RuntimeError("The linked monitor does not evaluate trace files inside the JVM, so its handlers "
+                               "cannot be translated (recompile it with this PyDejaVu version)")
+        if self.__m_translated is not None:
+            raise RuntimeError("The handlers were already translated")
+
+        dispatch_map = self.event_mapper.dispatch_map
+        translation = HandlerTranslator(i_logger=self.__m_logger).translate(
+            {event_name: plan.handler for event_name, plan in dispatch_map.items()})
+        if translation.translated:
+            fallback = HandlerCallback(self.__handle_callback, i_logger=self.__m_logger)
+            self.__m_translated = TranslatedHandlers(
+                translation, fallback, i_in_process=i_in_process_compilation, i_logger=self.__m_logger)
+            for event_name in translation.translated:
+                dispatch_map[event_name] = TranslatedPlan(dispatch_map[event_name], self.__m_translated.apply)
+        return translation
+
+    def __handle_callback(self, last_mask: int, event: str) -> Optional[str]:
+        """
+        Runs the operational handler of an event on behalf of the JVM-driven trace loop.
+
+        Args:
+            last_mask (int): The verdict mask of the previous event, observable through `last_eval`.
+            event (str): The event.
+
+        Returns:
+            Optional[str]: The modified event, or None if the handler skipped the event.
+        """
+        self.__m_last_mask = last_mask
+        event_name, event_args, origin_eval_input, plan = self.__resolve(event)
+        return self.__dispatch(event_name, event_args, origin_eval_input, plan)
+
+    @staticmethod
+    def __violated_properties(eval_result: Optional[str]) -> Tuple[str, ...]:
+        """
+        Extracts the names of the violated properties from an evaluation result.
+
+        Args:
+            eval_result (Optional[str]): The evaluation result in the format 'property1=verdict1,...'.
+
+        Returns:
+            Tuple[str, ...]: The violated property names (empty for skipped or failed evaluations).
+        """
+        if eval_result is None or eval_result == "Error in eval":
+            return ()
+        # The results of control events (e.g. '#skip#=false') are not property verdicts
+        return tuple(name for name, _, verdict in (spec.partition('=') for spec in eval_result.split(','))
+                     if verdict == "false" and not name.startswith('#'))
+
+    def __evaluate_batch(self, events: Union[List[Dict[str, Any]], List[str]]) -> \
+            List[Tuple[str, str, Optional[str]]]:
+        """
+        Evaluates a run of events, which require no Python processing, in a single monitor call.
+
+        Args:
+            events (Union[List[Dict[str, Any]], List[str]]): The events to evaluate.
+
+        Returns:
+            List[Tuple[str, str, Optional[str]]]: The result tuples in the format of `iter_events`.
+        """
+        eval_inputs = [event if isinstance(event, str) else self._parse_event(event)[2] for event in events]
+
+        if self.__m_structured_eval:
+            return self.__evaluate_batch_mask(eval_inputs)
+
+        try:
+            eval_results = self.__m_dejavu_monitor.eval_batch(eval_inputs)
+        except Exception as e:
+            self.__m_logger.error(f"Error in batch eval of {len(eval_inputs)} events: {str(e)}")
+            eval_results = [None] * len(eval_inputs)
+
+        results = []
+        last_eval_result = None
+        for eval_input, eval_result in zip(eval_inputs, eval_results):
+            if eval_result is None:
+                self.__m_logger.error(f"Error in eval for event {eval_input.split(',', 1)[0]}")
+                eval_result = "Error in eval"
+            else:
+                last_eval_result = eval_result
+            results.append((eval_input, eval_input, eval_result))
+
+        # Only the verdict of the last evaluated event is observable by later handlers
+        if last_eval_result is not None:
+            self.__update_last_eval(last_eval_result)
+        return results
+
+    def __evaluate_batch_mask(self, eval_inputs: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Evaluates a batch of events through the bitmask entry point of the monitor.
+
+        Args:
+            eval_inputs (List[str]): The events to evaluate, formatted as monitor input strings.
+
+        Returns:
+            List[Tuple[str, str, Optional[str]]]: The result tuples in the format of `iter_events`.
+        """
+        try:
+            masks = self.__m_dejavu_monitor.eval_batch_mask(eval_inputs)
+        except Exception as e:
+            self.__m_logger.error(f"Error in batch eval of {len(eval_inputs)} events: {str(e)}")
+            masks = [-1] * len(eval_inputs)
+
+        verdict_strings = self.__m_verdict_strings
+        results = []
+        for eval_input, mask in zip(eval_inputs, masks):
+            if mask == self.CONTROL_MASK:
+                results.append((eval_input, eval_input, self.__control_result(eval_input)))
+            elif mask < 0:
+                self.__m_logger.error(f"Error in eval for event {eval_input.split(',', 1)[0]}")
+                results.append((eval_input, eval_input, "Error in eval"))
+            else:
+                self.__m_last_mask = mask
+                results.append((eval_input, eval_input, verdict_strings.get(mask) or self.__verdict_string(mask)))
+        return results
 
     def end_eval(self):
         """
@@ -210,6 +751,32 @@ class Verify:
         """
         self.__m_dejavu_monitor.end_eval()
 
+    def reset(self, i_result_file: Optional[str] = None) -> None:
+        """
+        Resets the monitor and the shared variables, so a new trace can be verified from its first event.
+
+        The property state of the monitor (including its event counter and error counters) is recreated, and the
+        monitor is configured again, with the same settings. The registered handlers and parsers are kept.
+
+        Args:
+            i_result_file (str, optional): A new file for the indices of violating events. Defaults to the current one.
+
+        Raises:
+            RuntimeError: If the monitor does not support reset (e.g., it was compiled by an older PyDejaVu version,
+                or with an operational specification, whose pre-monitor state cannot be recreated).
+        """
+        if not self.__m_reset:
+            raise RuntimeError("The monitor does not support reset, recompile it with the current PyDejaVu version "
+                               "and without an operational specification")
+
+        if i_result_file is not None:
+            self.__m_config = self.__m_config[:3] + (i_result_file,)
+        self.__m_dejavu_monitor.reset()
+        self.__monitor_setup(*self.__m_config)
+
+        self.event_mapper.shared_state.clear()
+        self.__m_last_mask = 0
+
     def get_stat(self):
         """
         Get evaluation stat.
@@ -222,6 +789,7 @@ class Verify:
             i_bits: int = 20,
             i_mode: Optional[str] = "debug",
             i_statistics: bool = True,
+            i_result_file: str = "output/resultFile"
     ) -> None:
         """
         Sets up the monitor with the given configuration.
@@ -230,8 +798,9 @@ class Verify:
             i_bits (int, optional): The number of bits for configuration. Defaults to 20.
             i_mode (Optional[str], optional): The mode of operation. Defaults to "debug".
             i_statistics (bool, optional): Flag to enable or disable statistics. Defaults to True.
+            i_result_file (str, optional): The result file path. Defaults to "output/resultFile".
         """
-        self.__m_dejavu_monitor.config(str(i_bits), str(i_mode), str(i_statistics), "output/resultFile")
+        self.__m_dejavu_monitor.config(str(i_bits), str(i_mode), str(i_statistics), i_result_file)
 
     def format_args(self, args: Union[Dict, List, Any]) -> str:
         """
@@ -275,28 +844,6 @@ class Verify:
             return str(arg).lower()
         return str(arg)
 
-    def __cast_args(
-            self,
-            args: Union[Dict, List, Any],
-            type_hints: Dict[str, type],
-            param_names: List[str]) -> Union[Dict, List, Any]:
-        """
-        Casts arguments to their respective types based on provided type hints and parameter names.
-        Args:
-            args (Union[Dict, List, Any]): The arguments to cast.
-            type_hints (Dict[str, type]): A dictionary of type hints.
-            param_names (List[str]): List of parameter names from the handler function.
-        Returns:
-            Union[Dict, List, Any]: The casted arguments.
-        """
-        if isinstance(args, list):
-            return [self.cast_value(arg, type_hints.get(param_names[i], Any)) if i < len(param_names) else arg
-                    for i, arg in enumerate(args)]
-        elif isinstance(args, dict):
-            return {k: self.cast_value(v, type_hints.get(k, Any)) for k, v in args.items()}
-        else:
-            return self.cast_value(args, next(iter(type_hints.values()), Any))
-
     def cast_value(self, value: Any, target_type: type) -> Any:
         """
         Casts a value to a target type.
@@ -308,122 +855,84 @@ class Verify:
         Returns:
             Any: The casted value.
         """
-        if target_type == Any:
+        converter = DispatchPlan.converter_for(target_type)
+        if converter is None:
             return value
         try:
-            if target_type == bool:
-                return str(value).lower() in ('true', 't', 'yes', 'y', '1')
-            return target_type(value)
+            return converter(value)
         except (ValueError, TypeError) as e:
             raise TypeError(f"Failed to cast the string '{value}' into {target_type} ({str(e)})")
 
-    def __process_mapped_event(
-            self, handler: Callable, handler_info: Dict[str, Any], event_args: List[Any]) -> Optional[str]:
-        """
-        Processes an event using its mapped handler.
-        Args:
-            handler (Callable): The handler function for the event.
-            handler_info (Dict[str, Any]): Handler info details.
-            event_args (List[Any]): The arguments for the event.
-        Returns:
-            str: The formatted result from processing the event.
-        """
-        type_hints = handler_info['type_hints']
-        param_names = handler_info['param_names']
-        casted_args = self.__cast_args(event_args, type_hints, param_names)
-
-        if isinstance(casted_args, list):
-            result = handler(*casted_args)
-        elif isinstance(casted_args, dict):
-            result = handler(**casted_args)
-        else:
-            result = handler(casted_args)
-
-        # Check if the result is None or an empty tuple
-        if result is None or not result:
-            return None
-        return self.__format_result(result)
-
-    def __format_result(self, result: List[Any]) -> str:
+    @property
+    def properties(self) -> Tuple[str, ...]:
         """
-        Formats the result of an event core.
-
-        Args:
-            result (List[Any]): The result to format.
+        Returns the property names in the order used by the monitor verdicts.
 
         Returns:
-            str: The formatted result as a string.
-        """
-        formatted_result = []
-        for item in result:
-            if isinstance(item, bool):
-                formatted_result.append(str(item).lower())
-            elif isinstance(item, float):
-                formatted_result.append(str(int(item)))
-            else:
-                formatted_result.append(str(item))
-        return ','.join(formatted_result)
+            Tuple[str, ...]: The property names, or an empty tuple if the monitor does not expose them.
+        """
+        return self.__m_properties
 
-    @lru_cache(maxsize=128)
-    def __get_handler(self, event_name: str) -> Callable:
+    def last_eval(self, spec_name: str) -> Optional[bool]:
         """
-        Retrieves or caches handler callable.
+        Retrieves the verdict of the last evaluation for a given property.
 
         Args:
-            event_name (str): The event name which correspond to a callable.
+            spec_name (str): The name of the property.
 
         Returns:
-            Callable: The handler function.
+            Optional[bool]: The verdict of the last evaluation, or None if the property is not defined.
         """
-        return self.event_mapper.event_map.get(event_name)
+        if self.__m_structured_eval:
+            bit = self.__m_property_bits.get(spec_name)
+            return None if bit is None else self.__m_last_mask & bit != 0
+        return self.get_shared(f"#last_eval_{spec_name}#", None)
 
-    @lru_cache(maxsize=128)
-    def __get_parser(self, event_name: str) -> Callable:
+    def __fetch_properties(self) -> bool:
         """
-        Retrieves or caches parser callable.
-
-        Args:
-            event_name (str): The event name which correspond to a callable.
+        Fetches the property order from the monitor, which defines the bits of the verdict masks.
 
         Returns:
-            Callable: The parser function.
+            bool: True if the verdicts can be represented as bitmasks, False otherwise.
         """
-        return self.event_mapper.parser_map.get(event_name)
+        properties = tuple(self.__m_dejavu_monitor.properties())
+        if len(properties) > 63:
+            self.__m_logger.warning(f"{len(properties)} properties do not fit into a verdict bitmask, "
+                                    "falling back to string verdicts")
+            return False
 
-    @lru_cache(maxsize=128)
-    def __get_handler_info(self, handler: Callable) -> Dict[str, Any]:
+        self.__m_properties = properties
+        self.__m_property_bits = {name: 1 << index for index, name in enumerate(properties)}
+        return True
+
+    def __control_result(self, eval_input: str) -> str:
         """
-        Retrieves or caches handler information (type hints and parameter names).
+        Returns the result of a control event which holds no property verdicts. The verdicts of the properties,
+        observable through `last_eval`, are left as they are.
 
         Args:
-            handler (Callable): The handler function.
+            eval_input (str): The control event.
 
         Returns:
-            Dict[str, Any]: A dictionary containing 'type_hints' and 'param_names'.
-        """
-        if handler not in self.__m_handler_info_cache:
-            sig = inspect.signature(handler)
-            required_params = sum(1 for param in sig.parameters.values()
-                                  if param.default == param.empty and param.kind != param.VAR_POSITIONAL)
-            self.__m_handler_info_cache[handler] = {
-                'type_hints': self._get_type_hints(handler),
-                'param_names': list(sig.parameters.keys()),
-                'num_of_params': required_params
-            }
-        return self.__m_handler_info_cache[handler]
+            str: The result of the control event (e.g. '#end#=true').
+        """
+        event_name = eval_input.split(',', 1)[0]
+        return self.CONTROL_RESULTS.get(event_name, f"{event_name}=true")
 
-    @lru_cache(maxsize=128)
-    def _get_type_hints(self, func: Callable) -> Dict[str, type]:
+    def __verdict_string(self, mask: int) -> str:
         """
-        Retrieves type hints for a given function, using caching for efficiency.
+        Formats a verdict bitmask as a 'property1=verdict1,property2=verdict2,...' string and caches it.
 
         Args:
-            func (Callable): The function to retrieve type hints for.
+            mask (int): The verdict bitmask.
 
         Returns:
-            Dict[str, type]: A dictionary of type hints.
+            str: The formatted verdicts.
         """
-        return get_type_hints(func)
+        verdict_string = ",".join(f"{name}={'true' if mask & bit else 'false'}"
+                                  for name, bit in self.__m_property_bits.items())
+        self.__m_verdict_strings[mask] = verdict_string
+        return verdict_string
 
     def __update_last_eval(self, last_eval_result: str) -> None:
         """
@@ -0,0 +1,17 @@
+from typing import NamedTuple
+
+
+class Violation(NamedTuple):
+    """A lightweight record of a single property violation.
+
+    Attributes:
+        index (int): The zero based position of the violating event in the verified stream.
+        property_name (str): The name of the violated property.
+        original_event (str): The event as it was read from the source.
+        modified_event (str): The event as it was evaluated, after the operational phase.
+    """
+
+    index: int
+    property_name: str
+    original_event: str
+    modified_event: str
@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from pydejavu.utils.logger import Logger
+
+
+@lru_cache(maxsize=None)
+def _java_function_class() -> type:
+    """
+    Defines (once) the jnius proxy class implementing `java.util.function.Function`, which requires a running JVM.
+
+    Returns:
+        type: The proxy class, constructed with the `HandlerCallback` it forwards to.
+    """
+    from jnius import PythonJavaClass, java_method
+
+    class JavaFunction(PythonJavaClass):
+        __javainterfaces__ = ['java/util/function/Function']
+
+        def __init__(self, i_callback: 'HandlerCallback'):
+            super().__init__()
+            self.callback = i_callback
+
+        @java_method('(Ljava/lang/Object;)Ljava/lang/Object;')
+        def apply(self, i_request: Any) -> Optional[str]:
+            return self.callback.apply(i_request)
+
+    return JavaFunction
+
+
+class HandlerCallback:
+    """The Python side of the JVM-driven trace loop (the `eval_file_with` monitor extension).
+
+    The JVM reads and evaluates the trace itself, and calls back into Python only for the events which have a
+    registered handler. Each request holds the verdict mask of the previous event and the event, separated by a
+    newline. The handler function receives both, and returns the event to evaluate, or None to skip it.
+
+    An exception cannot cross back into the JVM, so the first error raised by the handler function is recorded,
+    the event is skipped, and the error is re-raised by `raise_error` once the JVM returns.
+    """
+
+    def __init__(self, i_handle: Callable[[int, str], Optional[str]], i_logger: Optional[Logger] = None):
+        """
+        Args:
+            i_handle (Callable[[int, str], Optional[str]]): Called with the verdict mask of the previous event and
+                the event, returns the event to evaluate or None to skip it.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_handle = i_handle
+        self.__m_error: Optional[Exception] = None
+        self.__m_java = None
+
+    def java(self) -> Any:
+        """
+        Returns the Java object to pass to the monitor (kept alive as long as this callback).
+
+        Returns:
+            Any: A `java.util.function.Function` forwarding to `apply`.
+        """
+        if self.__m_java is None:
+            self.__m_java = _java_function_class()(self)
+        return self.__m_java
+
+    def apply(self, i_request: str) -> Optional[str]:
+        """
+        Handles a callback request of the JVM.
+
+        Args:
+            i_request (str): The verdict mask of the previous event and the event, separated by a newline.
+
+        Returns:
+            Optional[str]: The event to evaluate, or None to skip it.
+        """
+        mask, _, event = i_request.partition('\n')
+        try:
+            return self.__m_handle(int(mask), event)
+        except Exception as e:
+            if self.__m_error is None:
+                self.__m_error = e
+            self.__m_logger.error(f"Error in the handler callback for '{event}': {str(e)}")
+            return None
+
+    def raise_error(self) -> None:
+        """
+        Raises the first error of the handler function, if any.
+        """
+        if self.__m_error is not None:
+            error, self.__m_error = self.__m_error, None
+            raise error
@@ -0,0 +1,109 @@
+import os
+from typing import Any, Dict, List
+
+from pydejavu.utils.logger import Logger
+
+
+class IsolatedMonitor:
+    """A `TraceMonitor` loaded through its own class loader.
+
+    The synthesized monitor is a Scala `object`, i.e., a single static instance per loaded class, so all
+    monitors linked through `autoclass('TraceMonitor')` share one class and one state. This class loads
+    the monitor JAR, together with the DejaVu and Scala runtime JARs, into a private `URLClassLoader`
+    (whose parent is the platform class loader), so each instance has its own `TraceMonitor` class and
+    its own DejaVu runtime state. Several specifications can then be monitored side by side in one JVM.
+
+    The class loader is invisible to jnius (which resolves classes by name), so the monitor entry points
+    are called through Java reflection. This class exposes the same methods as the linked `TraceMonitor`
+    class, and can be used in its place by `Verify`.
+    """
+
+    def __init__(self, i_monitor_jar: str, i_runtime_jars: List[str], i_logger: Logger = None):
+        """
+        Loads the monitor into a new class loader.
+
+        Args:
+            i_monitor_jar (str): The path to the monitor JAR file.
+            i_runtime_jars (List[str]): The paths to the DejaVu and Scala runtime JAR files.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+
+        from jnius import autoclass
+        file_class = autoclass('java.io.File')
+        urls = [file_class(os.path.abspath(path)).toURI().toURL() for path in [i_monitor_jar] + i_runtime_jars]
+        parent = autoclass('java.lang.ClassLoader').getSystemClassLoader().getParent()
+        self.__m_class_loader = autoclass('java.net.URLClassLoader')(urls, parent)
+        self.__m_class = self.__m_class_loader.loadClass('TraceMonitor')
+
+        # The public static methods (the Scala object forwarders), by name
+        self.__m_methods: Dict[str, Any] = {}
+        for method in self.__m_class.getMethods():
+            self.__m_methods.setdefault(method.getName(), method)
+
+        self.__m_logger.info(f"Monitor {i_monitor_jar} loaded into an isolated class loader")
+
+    def has_method(self, i_name: str) -> bool:
+        """
+        Checks whether the monitor exposes an entry point.
+
+        Args:
+            i_name (str): The method name.
+
+        Returns:
+            bool: True if the monitor has a public method with that name.
+        """
+        return i_name in self.__m_methods
+
+    def config(self, i_bits: str, i_mode: str, i_statistics: str, i_result_file: str) -> None:
+        self.__invoke('config', i_bits, i_mode, i_statistics, i_result_file)
+
+    def eval(self, i_event: str) -> str:
+        return self.__invoke('eval', i_event)
+
+    def eval_batch(self, i_events: List[str]) -> List[str]:
+        # Arrays cannot be passed through reflection from jnius, hence the newline separated variant
+        return self.__invoke('eval_batch_lines', "\n".join(i_events))
+
+    def properties(self) -> List[str]:
+        return self.__invoke('properties')
+
+    def eval_mask(self, i_event: str) -> int:
+        return self.__invoke('eval_mask', i_event)
+
+    def eval_batch_mask(self, i_events: List[str]) -> List[int]:
+        return self.__invoke('eval_batch_mask_lines', "\n".join(i_events))
+
+    def eval_file(self, i_path: str, i_max_indices: int) -> List[int]:
+        return self.__invoke('eval_file', i_path, i_max_indices)
+
+    def eval_file_with(self, i_path: str, i_max_indices: int, i_handled: str, i_callback: Any) -> List[int]:
+        return self.__invoke('eval_file_with', i_path, i_max_indices, i_handled, i_callback)
+
+    def end_eval(self) -> None:
+        self.__invoke('end_eval')
+
+    def get_stat(self) -> None:
+        self.__invoke('get_stat')
+
+    def reset(self) -> None:
+        self.__invoke('reset')
+
+    def __invoke(self, i_name: str, *args: Any) -> Any:
+        """
+        Invokes a static entry point of the monitor.
+
+        Args:
+            i_name (str): The method name.
+            *args (Any): The method arguments.
+
+        Returns:
+            Any: The result, converted to Python by jnius.
+
+        Raises:
+            AttributeError: If the monitor has no such method.
+        """
+        method = self.__m_methods.get(i_name)
+        if method is None:
+            raise AttributeError(f"The isolated monitor has no '{i_name}' method")
+        return method.invoke(None, list(args))
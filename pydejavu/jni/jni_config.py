@@ -1,6 +1,10 @@
+import atexit
 import os
+import shutil
+import tempfile
 from enum import Enum
 from pathlib import Path
+from typing import List, Optional
 
 import jnius_config
 
@@ -17,6 +21,16 @@ class JarPaths(Enum):
 class JNIConfig:
     """Configuration class for setting up Java Native Interface (JNI) with custom options and classpath."""
 
+    # Directory on the JVM classpath for classes which become available only after the JVM started
+    # (e.g., a monitor compiled after an in-process synthesis). It is shared by the whole process.
+    __runtime_classes_dir: Optional[str] = None
+
+    # The classpath the JVM was (or will be) started with
+    __jvm_classpath: List[str] = []
+
+    # Paths requested by PyDejaVu components (e.g., the in-JVM Scala compiler) for the JVM classpath
+    __registered_paths: List[str] = []
+
     def __init__(self, i_logger: Logger = None):
         """
         Initializes the JNIConfig instance with default classpath and JVM options.
@@ -34,7 +48,8 @@ class JNIConfig:
             JarPaths.SCALA.value,
             JarPaths.DEJAVU.value
         ]
-        jnius_config.add_options('-Xms4g', '-Xmx16g')
+        if not jnius_config.vm_running:
+            jnius_config.add_options('-Xms4g', '-Xmx16g')
         self.additional_paths = []
         self.java_opts = []
 
@@ -82,12 +97,64 @@ class JNIConfig:
         This method combines the default classpath, any additional paths, and any custom JVM options,
         and then applies them to the jnius configuration.
         """
-        full_classpath = self.classpath + self.additional_paths
+        if jnius_config.vm_running:
+            self.__m_logger.debug("JVM is already running, the classpath and JVM options are left unchanged")
+            return
+
+        full_classpath = self.classpath + self.additional_paths + JNIConfig.__registered_paths + \
+            [self.runtime_classes_dir()]
         jnius_config.set_classpath(*full_classpath)
+        JNIConfig.__jvm_classpath = full_classpath
 
         if self.java_opts:
             os.environ['JAVA_OPTS'] = ' '.join(self.java_opts)
 
+    @staticmethod
+    def runtime_classes_dir() -> str:
+        """
+        Returns the process wide runtime classes directory, creating it on first use.
+
+        The directory is added to the classpath when the JVM starts and is removed when the process exits.
+
+        Returns:
+            str: The path to the runtime classes directory.
+        """
+        if JNIConfig.__runtime_classes_dir is None:
+            JNIConfig.__runtime_classes_dir = tempfile.mkdtemp(prefix='pydejavu-classes-')
+            atexit.register(shutil.rmtree, JNIConfig.__runtime_classes_dir, True)
+        return JNIConfig.__runtime_classes_dir
+
+    @staticmethod
+    def register_path(path: str) -> bool:
+        """
+        Registers a path to be part of the classpath of the JVM, whichever component starts it.
+
+        Args:
+            path (str): The path to a directory or JAR file.
+
+        Returns:
+            bool: True if the path is (or will be) on the classpath, False if the JVM is already running without it.
+        """
+        if jnius_config.vm_running:
+            return JNIConfig.on_classpath(path)
+        if path not in JNIConfig.__registered_paths:
+            JNIConfig.__registered_paths.append(path)
+        return True
+
+    @staticmethod
+    def on_classpath(path: str) -> bool:
+        """
+        Checks whether a path is part of the classpath configured by PyDejaVu for the JVM.
+
+        Args:
+            path (str): The path to a directory or JAR file.
+
+        Returns:
+            bool: True if the path is on the classpath, False otherwise.
+        """
+        real_path = os.path.realpath(path)
+        return any(os.path.realpath(entry) == real_path for entry in JNIConfig.__jvm_classpath)
+
     def check_heap_size(self) -> None:
         """
         Checks the maximum heap size allocated to the JVM and logs the information.
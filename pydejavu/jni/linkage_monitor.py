@@ -1,4 +1,11 @@
 
+import os
+import shutil
+import zipfile
+
+import jnius_config
+
+from pydejavu.jni.isolated_monitor import IsolatedMonitor
 from pydejavu.jni.jni_config import JNIConfig
 from pydejavu.utils.logger import Logger
 
@@ -6,7 +13,7 @@ from pydejavu.utils.logger import Logger
 class LinkageMonitor:
     """Class for monitoring linkage using JNI configuration and custom logging."""
 
-    def __init__(self, i_monitor_jar: str, i_logger: Logger = None):
+    def __init__(self, i_monitor_jar: str, i_logger: Logger = None, i_isolated: bool = False):
         """
         Initializes the LinkageMonitor instance.
 
@@ -15,10 +22,13 @@ class LinkageMonitor:
         Args:
             i_monitor_jar (str): The path to the monitor JAR file.
             i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+            i_isolated (bool, optional): Whether the monitor is loaded into its own class loader (see
+                `IsolatedMonitor`), instead of the JVM classpath shared by the whole process. Defaults to False.
         """
         self.__m_logger = Logger() if i_logger is None else i_logger
         self.__m_jni_config = JNIConfig()
-        self.__m_monitor = self.__initialize_monitor(i_monitor_jar)
+        self.__m_monitor = self.__initialize_isolated_monitor(i_monitor_jar) if i_isolated \
+            else self.__initialize_monitor(i_monitor_jar)
 
     @property
     def monitor(self):
@@ -30,12 +40,72 @@ class LinkageMonitor:
         """
         return self.__m_monitor
 
+    @property
+    def supports_batch_eval(self) -> bool:
+        """
+        Checks whether the linked monitor exposes the PyDejaVu batch evaluation entry point.
+
+        Monitors compiled by older PyDejaVu versions (or outside of PyDejaVu) only expose `eval`.
+
+        Returns:
+            bool: True if the monitor has an `eval_batch` method, False otherwise.
+        """
+        return self.__has_method('eval_batch')
+
+    @property
+    def supports_structured_eval(self) -> bool:
+        """
+        Checks whether the linked monitor exposes the PyDejaVu structured (bitmask) verdict entry points.
+
+        Returns:
+            bool: True if the monitor has the `properties`, `eval_mask` and `eval_batch_mask` methods.
+        """
+        return all(self.__has_method(name) for name in ('properties', 'eval_mask', 'eval_batch_mask'))
+
+    @property
+    def supports_reset(self) -> bool:
+        """
+        Checks whether the linked monitor exposes the PyDejaVu reset entry point.
+
+        Returns:
+            bool: True if the monitor has a `reset` method, False otherwise.
+        """
+        return self.__has_method('reset')
+
+    @property
+    def supports_file_eval(self) -> bool:
+        """
+        Checks whether the linked monitor exposes the PyDejaVu trace file evaluation entry point.
+
+        Returns:
+            bool: True if the monitor has an `eval_file` method, False otherwise.
+        """
+        return self.__has_method('eval_file')
+
+    def __has_method(self, name: str) -> bool:
+        """
+        Checks whether the linked monitor exposes a method.
+
+        Args:
+            name (str): The method name.
+
+        Returns:
+            bool: True if the monitor has the method, False otherwise.
+        """
+        if isinstance(self.__m_monitor, IsolatedMonitor):
+            # The batch entry points of an isolated monitor are reached through their newline separated variants
+            names = [name, f"{name}_lines"] if name in ('eval_batch', 'eval_batch_mask') else [name]
+            return all(self.__m_monitor.has_method(method) for method in names)
+        return hasattr(self.__m_monitor, name)
+
     def __initialize_monitor(self, *paths: str):
         """
         Initializes the JNI configuration and sets up the monitor class.
 
         This private method adds the provided paths to the JNI classpath, initializes the JNI configuration,
-        and loads the `TraceMonitor` class.
+        and loads the `TraceMonitor` class. If the JVM is already running (e.g., it was started for an
+        in-process synthesis), the classes of the provided JAR files are published into the runtime
+        classes directory instead.
 
         Args:
             *paths (str): Paths to JAR files or directories to add to the classpath.
@@ -43,9 +113,16 @@ class LinkageMonitor:
         Returns:
             monitor: The initialized monitor class from the JNI environment.
         """
-        for path in paths:
-            self.__m_jni_config.add_path(path)
-        self.__m_jni_config.init_jnius_config()
+        if jnius_config.vm_running:
+            # The classpath of a running JVM is fixed, so monitors which are not on it are
+            # made visible through the runtime classes directory
+            for path in paths:
+                if not JNIConfig.on_classpath(path):
+                    self.__publish_classes(path)
+        else:
+            for path in paths:
+                self.__m_jni_config.add_path(path)
+            self.__m_jni_config.init_jnius_config()
 
         from jnius import autoclass
         monitor = autoclass('TraceMonitor')
@@ -57,3 +134,34 @@ class LinkageMonitor:
 
         return monitor
 
+    def __initialize_isolated_monitor(self, path: str) -> IsolatedMonitor:
+        """
+        Starts the JVM (if needed) with the shared runtime classpath only, and loads the monitor into its own
+        class loader.
+
+        Args:
+            path (str): The path to the monitor JAR file.
+
+        Returns:
+            IsolatedMonitor: The isolated monitor.
+        """
+        self.__m_jni_config.init_jnius_config()
+        monitor = IsolatedMonitor(path, self.__m_jni_config.classpath, i_logger=self.__m_logger)
+        self.__m_jni_config.check_heap_size()
+        return monitor
+
+    def __publish_classes(self, path: str) -> None:
+        """
+        Makes the classes of a JAR file (or directory) loadable by the running JVM.
+
+        Args:
+            path (str): The path to a JAR file or a directory of class files.
+        """
+        classes_dir = JNIConfig.runtime_classes_dir()
+        if os.path.isdir(path):
+            shutil.copytree(path, classes_dir, dirs_exist_ok=True)
+        else:
+            with zipfile.ZipFile(path) as jar:
+                jar.extractall(classes_dir, [name for name in jar.namelist() if not name.startswith('META-INF/')])
+        self.__m_logger.info(f"Published the classes of {path} into the runtime classes directory")
+
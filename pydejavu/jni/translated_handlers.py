@@ -0,0 +1,126 @@
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Optional
+
+from pydejavu.compilation.handler_translator import HandlerTranslation
+from pydejavu.compilation.jvm_scala_compiler import JVMScalaCompiler
+from pydejavu.jni.handler_callback import HandlerCallback
+from pydejavu.jni.jni_config import JarPaths
+from pydejavu.utils.logger import Logger
+
+
+class TranslatedHandlers:
+    """The operational handlers translated into Scala (see `HandlerTranslator`), compiled and loaded into the JVM.
+
+    The generated class is compiled into its own JAR and loaded through a private `URLClassLoader`, so it can be
+    loaded after the JVM started and next to any monitor, shared or isolated. Its instance is the callback of the
+    JVM-driven trace loop (`eval_file_with`): it runs the translated handlers inside the JVM, and passes the
+    events of the other handlers on to the Python fallback callback.
+    """
+
+    # The exceptions of a translated handler which correspond to a failed argument cast in Python
+    CAST_ERRORS = ('java.lang.IllegalArgumentException', 'java.lang.NumberFormatException')
+
+    def __init__(
+            self,
+            i_translation: HandlerTranslation,
+            i_fallback: HandlerCallback,
+            i_in_process: bool = False,
+            i_logger: Optional[Logger] = None):
+        """
+        Compiles the translated handlers and instantiates them.
+
+        Args:
+            i_translation (HandlerTranslation): The translation, with at least one translated handler.
+            i_fallback (HandlerCallback): The callback running the handlers which stay in Python.
+            i_in_process (bool, optional): Whether to compile with the warm Scala compiler inside the embedded JVM
+                instead of a `scalac` subprocess, which is used as a fallback. Defaults to False.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+
+        Raises:
+            subprocess.CalledProcessError: If the compilation fails.
+        """
+        self.__m_logger = Logger() if i_logger is None else i_logger
+        self.__m_translation = i_translation
+        self.__m_fallback = i_fallback
+
+        build_dir = tempfile.mkdtemp(prefix='pydejavu-handlers-')
+        atexit.register(shutil.rmtree, build_dir, True)
+        source = os.path.join(build_dir, f"{i_translation.class_name}.scala")
+        with open(source, 'w') as source_file:
+            source_file.write(i_translation.source)
+        jar = self.__compile(source, os.path.join(build_dir, f"{i_translation.class_name}.jar"), i_in_process)
+
+        from jnius import autoclass, cast
+        url = autoclass('java.io.File')(os.path.abspath(jar)).toURI().toURL()
+        self.__m_class_loader = autoclass('java.net.URLClassLoader')(
+            [url], autoclass('java.lang.ClassLoader').getSystemClassLoader())
+        handlers_class = self.__m_class_loader.loadClass(i_translation.class_name)
+        self.__m_instance = handlers_class.getConstructors()[0].newInstance([i_fallback.java()])
+        self.__m_function = cast('java.util.function.Function', self.__m_instance)
+        self.__m_logger.info(f"Translated handlers of events {', '.join(i_translation.translated)} loaded")
+
+    @property
+    def translation(self) -> HandlerTranslation:
+        return self.__m_translation
+
+    @property
+    def fallback(self) -> HandlerCallback:
+        return self.__m_fallback
+
+    def java(self) -> Any:
+        """
+        Returns the Java object to pass to the monitor as the callback of the JVM-driven trace loop.
+
+        Returns:
+            Any: A `java.util.function.Function` running the translated handlers.
+        """
+        return self.__m_instance
+
+    def apply(self, i_request: str) -> Optional[str]:
+        """
+        Runs a translated handler from Python (e.g., for the events of `Verify.process_event`).
+
+        Args:
+            i_request (str): The verdict mask of the previous event and the event, separated by a newline.
+
+        Returns:
+            Optional[str]: The event to evaluate, or None to skip it.
+
+        Raises:
+            TypeError: If an argument cannot be cast.
+        """
+        try:
+            return self.__m_function.apply(i_request)
+        except Exception as e:
+            if getattr(e, 'classname', None) in self.CAST_ERRORS:
+                raise TypeError(str(e)) from e
+            raise
+
+    def __compile(self, i_source: str, i_jar: str, i_in_process: bool) -> str:
+        """
+        Compiles the generated source into a JAR file.
+
+        Args:
+            i_source (str): The path to the Scala source.
+            i_jar (str): The path to the JAR file to generate.
+            i_in_process (bool): Whether to try the warm Scala compiler inside the embedded JVM first.
+
+        Returns:
+            str: The path to the JAR file.
+        """
+        if i_in_process:
+            try:
+                return JVMScalaCompiler(JarPaths.DEJAVU.value, i_logger=self.__m_logger).compile_to_jar(i_source, i_jar)
+            except Exception as e:
+                self.__m_logger.warning(f"In-JVM compilation failed ({e}), falling back to scalac")
+
+        try:
+            subprocess.run(["scalac", i_source, "-d", i_jar], check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            self.__m_logger.error(f"Compilation of the translated handlers failed. Error: {e.stderr}")
+            raise
+        return i_jar
@@ -0,0 +1,314 @@
+import csv
+import itertools
+import json
+import re
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from pydejavu.utils.compressed_trace import CompressedTrace
+
+# The integer arguments which are stored as integers: their decimal form is the canonical one, so it is restored
+_INTEGER = re.compile(r'0|-?[1-9][0-9]{0,18}')
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+
+# The argument kinds of a shape
+_STRING, _INT = 's', 'i'
+
+
+def _typecode(i_min: int, i_max: int, i_signed: bool) -> str:
+    """
+    Returns the smallest array typecode holding a range of integers.
+
+    Args:
+        i_min (int): The smallest integer.
+        i_max (int): The largest integer.
+        i_signed (bool): Whether the typecode is signed.
+
+    Returns:
+        str: The typecode.
+    """
+    for typecode in ('bhiq' if i_signed else 'BHIQ'):
+        bits = array(typecode).itemsize * 8
+        low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if i_signed else (0, (1 << bits) - 1)
+        if low <= i_min and i_max <= high:
+            return typecode
+    raise OverflowError(f"Integers out of the 64 bit range: {i_min}..{i_max}")
+
+
+def _column(i_values: List[int], i_signed: bool) -> Tuple[str, bytes]:
+    """
+    Packs a column of integers into the smallest typed array, little-endian.
+
+    Args:
+        i_values (List[int]): The integers.
+        i_signed (bool): Whether the integers may be negative.
+
+    Returns:
+        Tuple[str, bytes]: The typecode and the packed column.
+    """
+    column = array(_typecode(min(i_values, default=0), max(i_values, default=0), i_signed), i_values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.typecode, column.tobytes()
+
+
+class _Block:
+    """The events of a binary trace block, as columns (see `BinaryTrace`)."""
+
+    __slots__ = ['shapes', 'groups', 'new_shapes', 'new_strings']
+
+    def __init__(self):
+        self.shapes: List[int] = []
+        # The argument columns of each shape, in the order of its first event in the block
+        self.groups: Dict[int, List[List[int]]] = {}
+        self.new_shapes: List[Tuple[str, str]] = []
+        self.new_strings: List[str] = []
+
+    def to_bytes(self, i_kinds: List[str]) -> bytes:
+        """
+        Packs the block.
+
+        Args:
+            i_kinds (List[str]): The argument kinds of every shape.
+
+        Returns:
+            bytes: The packed block.
+        """
+        columns = [_column(self.shapes, False)]
+        groups = []
+        for shape_id, values in self.groups.items():
+            group_columns = [_column(column, kind == _INT) for kind, column in zip(i_kinds[shape_id], values)]
+            groups.append([shape_id, self.shapes.count(shape_id) if not values else len(values[0]),
+                           [[typecode, len(data)] for typecode, data in group_columns]])
+            columns.extend(group_columns)
+        meta = json.dumps({
+            "events": len(self.shapes),
+            "strings": self.new_strings,
+            "shapes": self.new_shapes,
+            "sequence": [columns[0][0], len(columns[0][1])],
+            "groups": groups
+        }).encode('utf-8')
+        data = b''.join(data for _, data in columns)
+        return struct.pack('<II', len(meta), len(data)) + meta + data
+
+
+class BinaryTrace:
+    """A compact binary columnar trace format, holding the same events as a CSV trace file.
+
+    The events are stored in blocks of columns. The name of an event and the kind of each of its arguments
+    (string or integer) form its shape. A block holds the sequence of the shape ids of its events and, for every
+    shape, a column per argument: integers (arguments in canonical decimal form) are stored as they are, and
+    strings as ids in a dictionary of the string arguments. The dictionary and the shapes grow as blocks introduce
+    new values, and each column is a typed array of the smallest integer type holding its values.
+
+    A block is decoded shape after shape with `map` and `zip` over its columns, and the ids are mapped to the
+    dictionary strings, so a repeated name or string argument is a single string object instead of a string per
+    field. The readers of `FileUtils` (and `Monitor.read_bulk_events_*`) detect binary traces by their magic bytes.
+
+    Example:
+        BinaryTrace.convert("trace.csv", "trace.pdjt")
+        for chunk in monitor.read_bulk_events_as_string("trace.pdjt"):
+            ...
+    """
+
+    MAGIC = b'PYDJVBIN'
+    VERSION = 1
+    SUFFIX = '.pdjt'
+
+    # The number of events per block written by the converter
+    BLOCK_EVENTS = 1 << 16
+
+    @staticmethod
+    def is_binary(i_trace_file: str) -> bool:
+        """
+        Checks whether a trace file is a binary trace (possibly compressed, see `CompressedTrace`).
+
+        Args:
+            i_trace_file (str): The trace file.
+
+        Returns:
+            bool: True if the file starts with the magic bytes of a binary trace.
+        """
+        try:
+            with CompressedTrace.open(i_trace_file, i_background=False) as trace_file:
+                return trace_file.read(len(BinaryTrace.MAGIC)) == BinaryTrace.MAGIC
+        except (OSError, EOFError):
+            return False
+
+    @staticmethod
+    def convert(i_csv_file: str, i_binary_file: str) -> int:
+        """
+        Converts a CSV trace file into a binary trace, with the events the CSV readers of `FileUtils` return.
+
+        Args:
+            i_csv_file (str): The CSV trace file, possibly compressed (see `CompressedTrace`).
+            i_binary_file (str): The binary trace file to write.
+
+        Returns:
+            int: The number of events.
+        """
+        with CompressedTrace.open(i_csv_file, i_text=True) as csv_file:
+            return BinaryTrace.write(i_binary_file, (row for row in csv.reader(csv_file) if row))
+
+    @staticmethod
+    def write(i_binary_file: str, i_events: Iterable[Union[List[str], Dict[str, Any]]]) -> int:
+        """
+        Writes events into a binary trace.
+
+        Args:
+            i_binary_file (str): The binary trace file to write.
+            i_events (Iterable[Union[List[str], Dict[str, Any]]]): The events, as CSV rows (the name and the
+                arguments) or as dictionaries with a name and arguments.
+
+        Returns:
+            int: The number of events.
+        """
+        strings: Dict[str, int] = {}
+        shapes: Dict[Tuple[str, str], int] = {}
+        kinds_of: List[str] = []
+        events = 0
+        with open(i_binary_file, 'wb') as binary_file:
+            binary_file.write(BinaryTrace.MAGIC + struct.pack('<H', BinaryTrace.VERSION))
+            block = _Block()
+            for event in i_events:
+                name, args = (event["name"], event["args"]) if isinstance(event, dict) else (event[0], event[1:])
+                kinds, values = [], []
+                for arg in map(str, args):
+                    if _INTEGER.fullmatch(arg) and _INT64[0] <= int(arg) <= _INT64[1]:
+                        values.append(int(arg))
+                        kinds.append(_INT)
+                        continue
+                    string_id = strings.get(arg)
+                    if string_id is None:
+                        string_id = strings[arg] = len(strings)
+                        block.new_strings.append(arg)
+                    values.append(string_id)
+                    kinds.append(_STRING)
+
+                shape = (name, ''.join(kinds))
+                shape_id = shapes.get(shape)
+                if shape_id is None:
+                    shape_id = shapes[shape] = len(shapes)
+                    kinds_of.append(shape[1])
+                    block.new_shapes.append(shape)
+                block.shapes.append(shape_id)
+                columns = block.groups.get(shape_id)
+                if columns is None:
+                    columns = block.groups[shape_id] = [[] for _ in values]
+                for column, value in zip(columns, values):
+                    column.append(value)
+
+                events += 1
+                if len(block.shapes) >= BinaryTrace.BLOCK_EVENTS:
+                    binary_file.write(block.to_bytes(kinds_of))
+                    block = _Block()
+            if block.shapes:
+                binary_file.write(block.to_bytes(kinds_of))
+        return events
+
+    @staticmethod
+    def read_events(
+            i_binary_file: str,
+            chunk_size: int = 10000,
+            as_dict: bool = False) -> Iterator[List[Union[str, Dict[str, Any]]]]:
+        """
+        Reads the events of a binary trace in chunks.
+
+        Args:
+            i_binary_file (str): The binary trace file.
+            chunk_size (int, optional): The number of events to include in each chunk. Defaults to 10,000.
+            as_dict (bool, optional): Whether to yield the events as dictionaries of their name and arguments,
+                instead of strings. Defaults to False.
+
+        Yields:
+            Iterator[List[Union[str, Dict[str, Any]]]]: An iterator yielding the chunks of events, as the CSV
+            readers of `FileUtils` yield them.
+
+        Raises:
+            ValueError: If the file is not a binary trace, or of an unsupported version.
+        """
+        chunk: List[Union[str, Dict[str, Any]]] = []
+        for events in _BlockReader(i_binary_file).read(as_dict):
+            chunk.extend(events)
+            while len(chunk) >= chunk_size:
+                yield chunk[:chunk_size]
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield chunk
+
+
+class _BlockReader:
+    """Decodes the blocks of a binary trace, keeping the dictionary and the shapes the blocks introduce."""
+
+    def __init__(self, i_binary_file: str):
+        self.__m_binary_file = i_binary_file
+        self.__m_strings: List[str] = []
+        self.__m_shapes: List[Tuple[str, str]] = []
+
+    def read(self, i_as_dict: bool) -> Iterator[List[Union[str, Dict[str, Any]]]]:
+        """
+        Reads the blocks of the trace.
+
+        Args:
+            i_as_dict (bool): Whether to return the events as dictionaries instead of strings.
+
+        Yields:
+            Iterator[List[Union[str, Dict[str, Any]]]]: The events of each block.
+        """
+        with CompressedTrace.open(self.__m_binary_file) as binary_file:
+            header = binary_file.read(len(BinaryTrace.MAGIC) + 2)
+            if header[:len(BinaryTrace.MAGIC)] != BinaryTrace.MAGIC:
+                raise ValueError(f"{self.__m_binary_file} is not a binary trace")
+            version, = struct.unpack('<H', header[len(BinaryTrace.MAGIC):])
+            if version != BinaryTrace.VERSION:
+                raise ValueError(f"Unsupported binary trace version {version} in {self.__m_binary_file}")
+
+            while True:
+                sizes = binary_file.read(8)
+                if not sizes:
+                    return
+                meta_size, data_size = struct.unpack('<II', sizes)
+                meta = json.loads(binary_file.read(meta_size).decode('utf-8'))
+                yield self.__decode(meta, memoryview(binary_file.read(data_size)), i_as_dict)
+
+    def __decode(self, i_meta: Dict[str, Any], i_data: memoryview, i_as_dict: bool) -> List[Union[str, Dict[str, Any]]]:
+        """
+        Decodes the events of a block, shape after shape, and merges them back into the trace order.
+
+        Args:
+            i_meta (Dict[str, Any]): The metadata of the block.
+            i_data (memoryview): The columns of the block.
+            i_as_dict (bool): Whether to return the events as dictionaries instead of strings.
+
+        Returns:
+            List[Union[str, Dict[str, Any]]]: The events.
+        """
+        self.__m_strings.extend(i_meta["strings"])
+        self.__m_shapes.extend((name, kinds) for name, kinds in i_meta["shapes"])
+
+        position = 0
+
+        def column(i_typecode: str, i_size: int) -> array:
+            nonlocal position
+            values = array(i_typecode)
+            values.frombytes(i_data[position:position + i_size])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            position += i_size
+            return values
+
+        sequence = column(*i_meta["sequence"])
+        shape_events: Dict[int, Iterator[Union[str, Dict[str, Any]]]] = {}
+        for shape_id, count, columns in i_meta["groups"]:
+            name, kinds = self.__m_shapes[shape_id]
+            args = [map(str, column(*spec)) if kind == _INT else map(self.__m_strings.__getitem__, column(*spec))
+                    for kind, spec in zip(kinds, columns)]
+            if i_as_dict:
+                events = [{"name": name, "args": list(event_args)} for event_args in zip(*args)] if args \
+                    else [{"name": name, "args": []} for _ in range(count)]
+            else:
+                events = map(','.join, zip(itertools.repeat(name), *args)) if args else itertools.repeat(name, count)
+            shape_events[shape_id] = iter(events)
+        return list(map(next, map(shape_events.__getitem__, sequence)))
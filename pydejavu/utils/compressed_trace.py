@@ -0,0 +1,157 @@
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from typing import IO, Any, Callable, Dict, Optional, Union
+
+
+class DecompressingReader(io.RawIOBase):
+    """A binary stream of a compressed file, decompressed ahead of its reader on a background thread.
+
+    The thread reads large blocks of the decompressed data into a bounded queue, and the codecs of the standard
+    library release the GIL while decompressing, so the decompression of the next blocks overlaps with the
+    processing of the current one. An error of the decompression is raised by the read it stopped.
+    """
+
+    # The size of the decompressed blocks, and the number of blocks decompressed ahead of the reader
+    BLOCK_SIZE = 1 << 22
+    QUEUE_BLOCKS = 4
+
+    def __init__(self, i_source: IO[bytes]):
+        """
+        Initializes the DecompressingReader and starts its thread.
+
+        Args:
+            i_source (IO[bytes]): The decompressing file object (e.g., a `gzip.GzipFile`), closed with the reader.
+        """
+        super().__init__()
+        self.__m_source = i_source
+        self.__m_blocks: queue.Queue = queue.Queue(maxsize=self.QUEUE_BLOCKS)
+        self.__m_block = memoryview(b'')
+        self.__m_end = False
+        self.__m_stopped = threading.Event()
+        self.__m_thread = threading.Thread(target=self.__decompress, name='pydejavu-decompress', daemon=True)
+        self.__m_thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Reads decompressed data, waiting for the thread if it did not decompress it yet.
+
+        Args:
+            buffer (Any): A writable buffer.
+
+        Returns:
+            int: The number of bytes read, 0 at the end of the file.
+        """
+        while not self.__m_block:
+            if self.__m_end:
+                return 0
+            block = self.__m_blocks.get()
+            if isinstance(block, Exception):
+                self.__m_end = True
+                raise block
+            if not block:
+                self.__m_end = True
+                return 0
+            self.__m_block = memoryview(block)
+
+        size = min(len(buffer), len(self.__m_block))
+        buffer[:size] = self.__m_block[:size]
+        self.__m_block = self.__m_block[size:]
+        return size
+
+    def close(self) -> None:
+        """
+        Stops the thread and closes the compressed file.
+        """
+        if not self.closed:
+            self.__m_stopped.set()
+            self.__m_thread.join()
+            self.__m_source.close()
+        super().close()
+
+    def __decompress(self) -> None:
+        """
+        The decompression thread: reads the decompressed blocks until the end of the file, or until the reader
+        is closed. An empty block marks the end of the file.
+        """
+        try:
+            while not self.__m_stopped.is_set():
+                block = self.__m_source.read(self.BLOCK_SIZE)
+                self.__put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self.__put(e)
+
+    def __put(self, i_item: Union[bytes, Exception]) -> None:
+        """
+        Queues a block, unless the reader is closed while the queue is full.
+
+        Args:
+            i_item (Union[bytes, Exception]): The block, or the error of the decompression.
+        """
+        while not self.__m_stopped.is_set():
+            try:
+                self.__m_blocks.put(i_item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class CompressedTrace:
+    """Opens trace files which may be compressed with gzip, bzip2 or xz, detected by their magic bytes."""
+
+    # The magic bytes of each supported compression format, and the codec opening its files
+    FORMATS: Dict[str, bytes] = {'gzip': b'\x1f\x8b', 'bz2': b'BZh', 'xz': b'\xfd7zXZ\x00'}
+    OPENERS: Dict[str, Callable[..., IO[bytes]]] = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+    @staticmethod
+    def compression(i_trace_file: str) -> Optional[str]:
+        """
+        Detects the compression of a trace file.
+
+        Args:
+            i_trace_file (str): The trace file.
+
+        Returns:
+            Optional[str]: 'gzip', 'bz2' or 'xz', or None for an uncompressed (or unreadable) file.
+        """
+        try:
+            with open(i_trace_file, 'rb') as trace_file:
+                magic = trace_file.read(max(map(len, CompressedTrace.FORMATS.values())))
+        except OSError:
+            return None
+        for compression, format_magic in CompressedTrace.FORMATS.items():
+            if magic.startswith(format_magic):
+                return compression
+        return None
+
+    @staticmethod
+    def open(i_trace_file: str, i_text: bool = False, i_background: bool = True) -> IO:
+        """
+        Opens a trace file for reading, decompressing it if it is compressed.
+
+        Args:
+            i_trace_file (str): The trace file.
+            i_text (bool, optional): Whether to open it in text mode (as `open` does with mode 'r') instead of
+                binary mode. Defaults to False.
+            i_background (bool, optional): Whether to decompress on a background thread (see
+                `DecompressingReader`), instead of while reading. Defaults to True.
+
+        Returns:
+            IO: The file object.
+        """
+        compression = CompressedTrace.compression(i_trace_file)
+        if compression is None:
+            return open(i_trace_file, 'r' if i_text else 'rb')
+
+        stream = CompressedTrace.OPENERS[compression](i_trace_file, 'rb')
+        if i_background:
+            stream = io.BufferedReader(DecompressingReader(stream), DecompressingReader.BLOCK_SIZE)
+        return io.TextIOWrapper(stream) if i_text else stream
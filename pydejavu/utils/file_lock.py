@@ -0,0 +1,73 @@
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """An exclusive, inter-process lock held on a lock file.
+
+    The lock is blocking and is released when the context exits (or when the holding process dies),
+    so it can guard shared resources, such as the monitor cache, between concurrent processes.
+
+    Example:
+        with FileLock("/path/to/resource.lock"):
+            ...
+    """
+
+    def __init__(self, i_path: str):
+        """
+        Initializes the FileLock.
+
+        Args:
+            i_path (str): The path to the lock file. It is created if it does not exist.
+        """
+        self.__m_path = i_path
+        self.__m_fd: Optional[int] = None
+
+    @property
+    def path(self) -> str:
+        return self.__m_path
+
+    def acquire(self) -> None:
+        """
+        Blocks until the lock is acquired.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.__m_path)), exist_ok=True)
+        fd = os.open(self.__m_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self.__m_fd = fd
+
+    def release(self) -> None:
+        """
+        Releases the lock if it is held.
+        """
+        if self.__m_fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.__m_fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.__m_fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.__m_fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self.__m_fd)
+            self.__m_fd = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
@@ -1,17 +1,72 @@
-from typing import Dict, Any, Iterator, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 import csv
+import locale
+import multiprocessing
+import os
+
+from pydejavu.utils.binary_trace import BinaryTrace
+from pydejavu.utils.compressed_trace import CompressedTrace
+from pydejavu.utils.trace_index import TraceIndex, _parse_range
+
+
+class _LineSource:
+    """The lines of a trace file, block after block, with the position of the next line.
+
+    Iterating it yields the following lines with their newline (except for the last line of a file which does
+    not end with one), so a `csv.reader` can take as many lines as a quoted field spans, after which the caller
+    continues from the new position.
+    """
+
+    __slots__ = ['blocks', 'block', 'quoted', 'terminated', 'position']
+
+    def __init__(self, i_blocks: Iterator[Tuple[List[str], bool, bool]]):
+        self.blocks = i_blocks
+        self.block: List[str] = []
+        self.quoted = False
+        self.terminated = True
+        self.position = 0
+
+    def __iter__(self) -> '_LineSource':
+        return self
+
+    def next_block(self) -> bool:
+        """
+        Moves to the next block.
+
+        Returns:
+            bool: False at the end of the file.
+        """
+        try:
+            (self.block, self.quoted, self.terminated), self.position = next(self.blocks), 0
+        except StopIteration:
+            return False
+        return True
+
+    def __next__(self) -> str:
+        while self.position >= len(self.block):
+            if not self.next_block():
+                raise StopIteration
+        self.position += 1
+        if self.position == len(self.block) and not self.terminated:
+            return self.block[-1]
+        return self.block[self.position - 1] + '\n'
 
 
 class FileUtils:
     """Utility class for handling files operations."""
 
+    # The size of the binary blocks read by the raw line reader
+    RAW_BLOCK_SIZE = 1 << 20
+
     @staticmethod
     def read_events_from_file(filename: str, chunk_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
         """
         Reads events from a CSV file in chunks.
 
         This method reads events from a specified CSV file and returns them in chunks of dictionaries,
-        each containing the event's name and associated arguments.
+        each containing the event's name and associated arguments. Binary traces (see `BinaryTrace`)
+        are detected and read by their own reader, and compressed files (see `CompressedTrace`) are
+        decompressed while they are read.
 
         Args:
             filename (str): The path to the CSV file containing event data.
@@ -32,7 +87,11 @@ class FileUtils:
                 {"name": "event2", "args": ["arg1", "arg2", "arg3"]}
             ]
         """
-        with open(filename, 'r') as file:
+        if BinaryTrace.is_binary(filename):
+            yield from BinaryTrace.read_events(filename, chunk_size, as_dict=True)
+            return
+
+        with CompressedTrace.open(filename, i_text=True) as file:
             reader = csv.reader(file)
             chunk = []
             for row in reader:
@@ -51,7 +110,9 @@ class FileUtils:
         Reads events from a CSV file in chunks.
 
         This method reads events from a specified CSV file and returns them in chunks of dictionaries,
-        each containing the event's name and associated arguments.
+        each containing the event's name and associated arguments. Binary traces (see `BinaryTrace`)
+        are detected and read by their own reader, and compressed files (see `CompressedTrace`) are
+        decompressed while they are read.
 
         Args:
             filename (str): The path to the CSV file containing event data.
@@ -72,7 +133,11 @@ class FileUtils:
                 {"name": "event2", "args": ["arg1", "arg2", "arg3"]}
             ]
         """
-        with open(filename, 'r') as file:
+        if BinaryTrace.is_binary(filename):
+            yield from BinaryTrace.read_events(filename, chunk_size, as_dict=True)
+            return
+
+        with CompressedTrace.open(filename, i_text=True) as file:
             reader = csv.reader(file)
             chunk = []
             for row in reader:
@@ -86,16 +151,26 @@ class FileUtils:
                 yield chunk
 
     @staticmethod
-    def read_events_from_file_as_string(filename: str, chunk_size: int = 10000) -> Iterator[List[str]]:
+    def read_events_from_file_as_string(
+            filename: str,
+            chunk_size: int = 10000,
+            raw: bool = True) -> Iterator[List[str]]:
         """
         Reads events from a CSV file in chunks as strings.
 
         This method reads events from a specified CSV file and returns them in chunks of strings,
         where each string represents a row in the CSV file.
 
+        By default the file is read by the raw line reader (see `read_raw_events`), which yields the same
+        strings as the csv module without tokenizing every line and joining the fields back together.
+        Binary traces (see `BinaryTrace`) are detected and read by their own reader, and compressed files
+        (see `CompressedTrace`) are decompressed while they are read.
+
         Args:
             filename (str): The path to the CSV file containing event data.
             chunk_size (int, optional): The number of rows to include in each chunk. Defaults to 10,000.
+            raw (bool, optional): Whether to use the raw line reader instead of parsing every line with the
+                csv module. Defaults to True.
 
         Yields:
             Iterator[List[str]]: An iterator yielding lists of strings, where each string is a row from the CSV file.
@@ -111,7 +186,14 @@ class FileUtils:
                 "event2,arg1,arg2,arg3"
             ]
         """
-        with open(filename, 'r') as file:
+        if BinaryTrace.is_binary(filename):
+            yield from BinaryTrace.read_events(filename, chunk_size)
+            return
+        if raw:
+            yield from FileUtils.read_raw_events(filename, chunk_size)
+            return
+
+        with CompressedTrace.open(filename, i_text=True) as file:
             reader = csv.reader(file)
             chunk = []
             for row in reader:
@@ -124,3 +206,178 @@ class FileUtils:
                         chunk = []
             if chunk:
                 yield chunk
+
+    @staticmethod
+    def read_raw_events(
+            filename: str,
+            chunk_size: int = 10000,
+            encoding: Optional[str] = None) -> Iterator[List[str]]:
+        """
+        Reads events from a CSV file in chunks as strings, without tokenizing unquoted lines.
+
+        The file is read in large binary blocks, which are decoded and split on newlines as a whole. Each
+        non-empty line, without its line ending ('\\n' or '\\r\\n'), is an event. Only the lines holding a quote
+        go through the csv module (which also joins quoted fields spanning several lines), so the events are
+        the same as the ones of the csv based reader.
+
+        Args:
+            filename (str): The path to the CSV file containing event data.
+            chunk_size (int, optional): The number of rows to include in each chunk. Defaults to 10,000.
+            encoding (str, optional): The encoding of the file, which has to be ASCII compatible (e.g., UTF-8).
+                Defaults to the encoding `open` uses.
+
+        Yields:
+            Iterator[List[str]]: An iterator yielding lists of strings, where each string is a row from the CSV file.
+        """
+        chunk: List[str] = []
+        for events in FileUtils.__raw_events(filename, encoding or locale.getpreferredencoding(False)):
+            chunk.extend(events)
+            while len(chunk) >= chunk_size:
+                yield chunk[:chunk_size]
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def index_trace(filename: str, persist: bool = True, encoding: Optional[str] = None) -> TraceIndex:
+        """
+        Returns the line-offset index of a trace file, loading it from beside the trace or building it.
+
+        Args:
+            filename (str): The path to the CSV file containing event data.
+            persist (bool, optional): Whether to save a newly built index beside the trace. Defaults to True.
+            encoding (str, optional): The encoding of the file. Defaults to the encoding `open` uses.
+
+        Returns:
+            TraceIndex: The index, with the offset of every event and the number of events per event name.
+
+        Raises:
+            ValueError: If the file is a binary trace, which is not line based, or a compressed trace.
+        """
+        if BinaryTrace.is_binary(filename):
+            raise ValueError(f"{filename} is a binary trace, only CSV traces can be indexed")
+        if CompressedTrace.compression(filename) is not None:
+            raise ValueError(f"{filename} is compressed, only uncompressed traces can be indexed")
+        return TraceIndex.open(filename, persist, encoding)
+
+    @staticmethod
+    def read_events_parallel(
+            filename: str,
+            chunk_size: int = 10000,
+            workers: Optional[int] = None,
+            as_dict: bool = False,
+            encoding: Optional[str] = None) -> Iterator[List[Union[str, Dict[str, Any]]]]:
+        """
+        Reads events from a CSV file in chunks, parsing the chunks on a pool of worker processes.
+
+        The chunks are cut at exact event boundaries with the index of the trace (see `index_trace`), and
+        each worker reads its byte ranges of the file by itself. The chunks are yielded in the trace order,
+        with the same events as `read_events_from_file_as_string` (or `read_events_from_file_as_dict`).
+
+        Args:
+            filename (str): The path to the CSV file containing event data.
+            chunk_size (int, optional): The number of events to include in each chunk. Defaults to 10,000.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            as_dict (bool, optional): Whether to yield the events as dictionaries of their name and arguments,
+                instead of strings. Defaults to False.
+            encoding (str, optional): The encoding of the file. Defaults to the encoding `open` uses.
+
+        Yields:
+            Iterator[List[Union[str, Dict[str, Any]]]]: An iterator yielding the chunks of events.
+
+        Raises:
+            ValueError: If the file is a binary or compressed trace.
+        """
+        index = FileUtils.index_trace(filename, encoding=encoding)
+        ranges = [(filename, start, end, index.encoding, as_dict) for start, end in index.chunks(chunk_size)]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(ranges)))
+        if workers == 1:
+            yield from map(_parse_range, ranges)
+            return
+
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            yield from pool.imap(_parse_range, ranges)
+
+    @staticmethod
+    def __raw_events(filename: str, encoding: str) -> Iterator[List[str]]:
+        """
+        Yields the events of a CSV file, a block at a time.
+
+        Args:
+            filename (str): The path to the CSV file.
+            encoding (str): The encoding of the file.
+
+        Yields:
+            Iterator[List[str]]: The events of each block.
+        """
+        with CompressedTrace.open(filename) as file:
+            source = _LineSource(FileUtils.__raw_blocks(file, encoding))
+            while True:
+                if source.position >= len(source.block) and not source.next_block():
+                    return
+                if not source.quoted:
+                    lines = source.block[source.position:] if source.position else source.block
+                    source.position = len(source.block)
+                    yield list(filter(None, lines))
+                    continue
+
+                # A quoted field may hold a comma, or span several lines, so these lines are parsed as CSV
+                events = []
+                while source.position < len(source.block):
+                    line = source.block[source.position]
+                    if '"' not in line:
+                        source.position += 1
+                        if line:
+                            events.append(line)
+                        continue
+                    row = next(csv.reader(source), None)
+                    if row:
+                        events.append(','.join(row))
+                yield events
+
+    @staticmethod
+    def __raw_blocks(file: Any, encoding: str) -> Iterator[Tuple[List[str], bool, bool]]:
+        """
+        Reads a binary file in large blocks, and splits each block into complete lines. Like the universal newlines
+        mode of text files, '\\n', '\\r\\n' and a bare '\\r' all end a line.
+
+        Args:
+            file (Any): The file, opened in binary mode.
+            encoding (str): The encoding of the file.
+
+        Yields:
+            Iterator[Tuple[List[str], bool, bool]]: The lines of each block, without their line endings, whether
+            the block holds a quote, and whether its last line ended with a newline (False only for the last block
+            of a file which does not end with one).
+        """
+        remainder = b''
+        while True:
+            block = file.read(FileUtils.RAW_BLOCK_SIZE)
+            if not block:
+                break
+            end = block.rfind(b'\n')
+            if end < 0:
+                remainder += block
+                continue
+            data, remainder = remainder + block[:end], block[end + 1:]
+            # The block is cut after a '\n', whose '\r' ends the same line
+            if data.endswith(b'\r'):
+                data = data[:-1]
+            yield FileUtils.__split_lines(data.decode(encoding)), b'"' in data, True
+        if remainder:
+            yield FileUtils.__split_lines(remainder.decode(encoding)), b'"' in remainder, False
+
+    @staticmethod
+    def __split_lines(text: str) -> List[str]:
+        """
+        Splits text into lines, at '\\n', '\\r\\n' and bare '\\r' line endings.
+
+        Args:
+            text (str): The text, without a trailing newline.
+
+        Returns:
+            List[str]: The lines.
+        """
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text.split('\n')
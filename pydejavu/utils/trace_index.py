@@ -0,0 +1,414 @@
+import csv
+import io
+import itertools
+import json
+import locale
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from pydejavu.utils.logger import Logger
+
+_QUOTE = ord('"')
+_COMMA = ord(',')
+
+
+def _ends_in_quoted_field(i_line: bytes, i_quoted: bool) -> bool:
+    """
+    Follows the quoting rules of the csv module over a line.
+
+    Args:
+        i_line (bytes): The line, without its newline.
+        i_quoted (bool): Whether the line starts inside a quoted field (continued from the previous line).
+
+    Returns:
+        bool: Whether the line ends inside a quoted field, i.e., the event continues on the next line.
+    """
+    # s: start of a field, f: unquoted field, q: quoted field, e: quote inside a quoted field
+    state = 'q' if i_quoted else 's'
+    for char in i_line:
+        if state == 'q':
+            if char == _QUOTE:
+                state = 'e'
+        elif state == 'f':
+            if char == _COMMA:
+                state = 's'
+        else:
+            state = 'q' if char == _QUOTE else 's' if char == _COMMA else 'f'
+    return state == 'q'
+
+
+def _parse_events(i_data: bytes, i_encoding: str, i_as_dict: bool = False) -> List[Union[str, Dict[str, Any]]]:
+    """
+    Parses the complete lines of a trace file into events, as the readers of `FileUtils` do.
+
+    Args:
+        i_data (bytes): The lines, starting at the start of an event.
+        i_encoding (str): The encoding of the trace file.
+        i_as_dict (bool, optional): Whether to return the events as dictionaries of their name and arguments,
+            instead of strings. Defaults to False.
+
+    Returns:
+        List[Union[str, Dict[str, Any]]]: The events.
+    """
+    text = i_data.decode(i_encoding)
+    if '"' in text:
+        # A quoted field may hold a comma, or span several lines, so these lines are parsed as CSV
+        rows = [row for row in csv.reader(io.StringIO(text, newline=None)) if row]
+        if i_as_dict:
+            return [{"name": row[0], "args": row[1:]} for row in rows]
+        return [','.join(row) for row in rows]
+
+    lines = text.split('\n')
+    if '\r' in text:
+        lines = [line[:-1] if line.endswith('\r') else line for line in lines]
+    events = list(filter(None, lines))
+    if i_as_dict:
+        return [{"name": fields[0], "args": fields[1:]} for fields in map(str.split, events, itertools.repeat(','))]
+    return events
+
+
+def _parse_range(i_range: Tuple[str, int, int, str, bool]) -> List[Union[str, Dict[str, Any]]]:
+    """
+    Reads and parses a byte range of a trace file (the work of a parallel reader process).
+
+    Args:
+        i_range (Tuple[str, int, int, str, bool]): The trace file, the start and end offsets, the encoding,
+            and whether to return the events as dictionaries.
+
+    Returns:
+        List[Union[str, Dict[str, Any]]]: The events of the range.
+    """
+    trace_file, start, end, encoding, as_dict = i_range
+    with open(trace_file, 'rb') as file:
+        file.seek(start)
+        return _parse_events(file.read(end - start), encoding, as_dict)
+
+
+class TraceIndex:
+    """A line-offset index of a trace file, built over a memory-mapped file and persisted beside the trace.
+
+    The index holds the file offset of every event (i.e., every non-empty line, or the first line of an event
+    with a quoted field spanning several lines) and the number of events per event name. It gives random access
+    to the events (e.g., re-reading the event a violation was reported at, see `TraceSummary.violating_events`),
+    splits the trace into chunks at exact event boundaries (which separate processes can parse in parallel, see
+    `FileUtils.read_events_parallel`), and profiles the trace without reading it.
+
+    The index file (the trace path with an '.idx' suffix) records the size and modification time of the trace,
+    and is rebuilt by `open` once the trace changed.
+
+    Example:
+        index = TraceIndex.open("trace.csv")
+        print(index.counts)                                 # {'login': 1000, 'logout': 990, ...}
+        print(index.event(summary.violating_events[0]))    # The first violating event
+    """
+
+    SUFFIX = '.idx'
+    MAGIC = b'PYDJVIDX'
+    VERSION = 1
+
+    # The size of the blocks of the memory-mapped trace scanned at once
+    BLOCK_SIZE = 1 << 22
+
+    def __init__(
+            self,
+            i_trace_file: str,
+            i_offsets: array,
+            i_counts: Dict[str, int],
+            i_size: int,
+            i_mtime_ns: int,
+            i_encoding: str):
+        """
+        Initializes the TraceIndex. Use `open` or `build` to index a trace file.
+
+        Args:
+            i_trace_file (str): The trace file.
+            i_offsets (array): The file offset of every event (an array of unsigned 64 bit integers).
+            i_counts (Dict[str, int]): The number of events per event name.
+            i_size (int): The size of the indexed trace file.
+            i_mtime_ns (int): The modification time of the indexed trace file, in nanoseconds.
+            i_encoding (str): The encoding of the trace file.
+        """
+        self.__m_trace_file = i_trace_file
+        self.__m_offsets = i_offsets
+        self.__m_counts = i_counts
+        self.__m_size = i_size
+        self.__m_mtime_ns = i_mtime_ns
+        self.__m_encoding = i_encoding
+
+    @property
+    def trace_file(self) -> str:
+        return self.__m_trace_file
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """The number of events per event name."""
+        return dict(self.__m_counts)
+
+    @property
+    def size(self) -> int:
+        return self.__m_size
+
+    @property
+    def encoding(self) -> str:
+        return self.__m_encoding
+
+    def __len__(self) -> int:
+        return len(self.__m_offsets)
+
+    @staticmethod
+    def index_path(i_trace_file: str) -> str:
+        return f"{i_trace_file}{TraceIndex.SUFFIX}"
+
+    @classmethod
+    def open(
+            cls,
+            i_trace_file: str,
+            i_persist: bool = True,
+            i_encoding: Optional[str] = None,
+            i_logger: Optional[Logger] = None) -> 'TraceIndex':
+        """
+        Loads the index of a trace file, or builds it if it is missing or stale.
+
+        Args:
+            i_trace_file (str): The trace file.
+            i_persist (bool, optional): Whether to save a newly built index beside the trace. Defaults to True.
+            i_encoding (str, optional): The encoding of the trace file, which has to be ASCII compatible.
+                Defaults to the encoding `open` uses.
+            i_logger (Logger, optional): A custom logger instance. If not provided, a new Logger is created.
+
+        Returns:
+            TraceIndex: The index.
+        """
+        logger = Logger() if i_logger is None else i_logger
+        encoding = i_encoding or locale.getpreferredencoding(False)
+        index = cls.load(i_trace_file)
+        if index is not None and index.encoding == encoding:
+            return index
+
+        index = cls.build(i_trace_file, encoding)
+        if i_persist:
+            try:
+                index.save()
+            except OSError as e:
+                logger.warning(f"Failed to save the index of {i_trace_file}: {e}")
+        return index
+
+    @classmethod
+    def build(cls, i_trace_file: str, i_encoding: Optional[str] = None) -> 'TraceIndex':
+        """
+        Indexes a trace file, scanning it once through a memory map.
+
+        Args:
+            i_trace_file (str): The trace file.
+            i_encoding (str, optional): The encoding of the trace file. Defaults to the encoding `open` uses.
+
+        Returns:
+            TraceIndex: The index (not saved).
+
+        Raises:
+            OSError: If the trace file cannot be read.
+        """
+        encoding = i_encoding or locale.getpreferredencoding(False)
+        offsets = array('Q')
+        names: Counter = Counter()
+        with open(i_trace_file, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            if stat.st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    cls.__scan(mapped, stat.st_size, offsets, names)
+        counts = {name.decode(encoding): count for name, count in names.items()}
+        return cls(i_trace_file, offsets, counts, stat.st_size, stat.st_mtime_ns, encoding)
+
+    @staticmethod
+    def __scan(i_mapped: mmap.mmap, i_size: int, o_offsets: array, o_names: Counter) -> None:
+        """
+        Scans the memory-mapped trace a block of complete lines at a time.
+
+        Args:
+            i_mapped (mmap.mmap): The trace file.
+            i_size (int): The size of the trace file.
+            o_offsets (array): Receives the file offset of every event.
+            o_names (Counter): Receives the number of events per (encoded) event name.
+        """
+        position = 0
+        quoted = False
+        while position < i_size:
+            end = i_mapped.rfind(b'\n', position, position + TraceIndex.BLOCK_SIZE)
+            if end < 0 or position + TraceIndex.BLOCK_SIZE >= i_size:
+                end = i_mapped.find(b'\n', position + TraceIndex.BLOCK_SIZE)
+                end = i_size if end < 0 else end
+            data = i_mapped[position:end]
+            lines = data.split(b'\n')
+            starts = itertools.accumulate(map((1).__add__, map(len, lines)), initial=position)
+
+            if not quoted and b'"' not in data:
+                if b'\r' in data:
+                    lines = [line[:-1] if line.endswith(b'\r') else line for line in lines]
+                o_offsets.extend(itertools.compress(starts, lines))
+                events = list(filter(None, lines))
+                o_names.update(map(itemgetter(0), map(bytes.partition, events, itertools.repeat(b','))))
+            else:
+                # A quoted field may span several lines, which continue the event of the line it starts on
+                for start, line in zip(starts, lines):
+                    if quoted:
+                        quoted = _ends_in_quoted_field(line, True)
+                        continue
+                    if line and line != b'\r':
+                        o_offsets.append(start)
+                        if line.startswith(b'"'):
+                            o_names[next(csv.reader([line.decode('latin-1')]))[0].encode('latin-1')] += 1
+                        else:
+                            o_names[line.split(b',', 1)[0].rstrip(b'\r')] += 1
+                    quoted = b'"' in line and _ends_in_quoted_field(line, False)
+            position = end + 1
+
+    @classmethod
+    def load(cls, i_trace_file: str) -> Optional['TraceIndex']:
+        """
+        Loads the saved index of a trace file.
+
+        Args:
+            i_trace_file (str): The trace file.
+
+        Returns:
+            Optional[TraceIndex]: The index, or None if it is missing, unreadable or stale (the trace changed).
+        """
+        try:
+            stat = os.stat(i_trace_file)
+            with open(cls.index_path(i_trace_file), 'rb') as index_file:
+                if index_file.read(len(cls.MAGIC)) != cls.MAGIC:
+                    return None
+                header_size, = struct.unpack('<I', index_file.read(4))
+                header = json.loads(index_file.read(header_size).decode('utf-8'))
+                if header['version'] != cls.VERSION or header['size'] != stat.st_size \
+                        or header['mtime_ns'] != stat.st_mtime_ns:
+                    return None
+                offsets = array('Q')
+                offsets.frombytes(index_file.read())
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+        if header['byteorder'] != sys.byteorder:
+            offsets.byteswap()
+        if len(offsets) != header['events']:
+            return None
+        return cls(i_trace_file, offsets, header['counts'], stat.st_size, stat.st_mtime_ns, header['encoding'])
+
+    def save(self, i_index_file: Optional[str] = None) -> str:
+        """
+        Saves the index (atomically, so concurrent readers never see a partial index).
+
+        Args:
+            i_index_file (str, optional): The index file. Defaults to the trace path with an '.idx' suffix.
+
+        Returns:
+            str: The index file.
+
+        Raises:
+            OSError: If the index file cannot be written.
+        """
+        index_file = i_index_file or self.index_path(self.__m_trace_file)
+        header = json.dumps({
+            "version": self.VERSION,
+            "size": self.__m_size,
+            "mtime_ns": self.__m_mtime_ns,
+            "events": len(self.__m_offsets),
+            "encoding": self.__m_encoding,
+            "byteorder": sys.byteorder,
+            "counts": self.__m_counts
+        }).encode('utf-8')
+
+        temp_file = f"{index_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, 'wb') as output:
+                output.write(self.MAGIC)
+                output.write(struct.pack('<I', len(header)))
+                output.write(header)
+                self.__m_offsets.tofile(output)
+            os.replace(temp_file, index_file)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+        return index_file
+
+    def offset(self, i_event: int) -> int:
+        """
+        Returns the file offset of an event.
+
+        Args:
+            i_event (int): The zero based index of the event.
+
+        Returns:
+            int: The offset of the event, or the size of the trace for the index past the last event.
+
+        Raises:
+            IndexError: If there is no such event.
+        """
+        if i_event == len(self.__m_offsets):
+            return self.__m_size
+        return self.__m_offsets[i_event]
+
+    def event(self, i_event: int) -> str:
+        """
+        Reads a single event, without reading the events before it.
+
+        Args:
+            i_event (int): The zero based index of the event (negative indices count from the end).
+
+        Returns:
+            str: The event, as the readers of `FileUtils` return it.
+
+        Raises:
+            IndexError: If there is no such event.
+        """
+        if i_event < 0:
+            i_event += len(self)
+        if not 0 <= i_event < len(self):
+            raise IndexError(f"Event {i_event} is out of range, the trace has {len(self)} events")
+        return self.events(i_event, i_event + 1)[0]
+
+    def events(self, i_start: int, i_stop: int) -> List[str]:
+        """
+        Reads a range of events.
+
+        Args:
+            i_start (int): The zero based index of the first event.
+            i_stop (int): The index past the last event.
+
+        Returns:
+            List[str]: The events.
+        """
+        start, end = self.byte_range(i_start, i_stop)
+        return _parse_range((self.__m_trace_file, start, end, self.__m_encoding, False))
+
+    def byte_range(self, i_start: int, i_stop: int) -> Tuple[int, int]:
+        """
+        Returns the file offsets bounding a range of events.
+
+        Args:
+            i_start (int): The zero based index of the first event.
+            i_stop (int): The index past the last event.
+
+        Returns:
+            Tuple[int, int]: The start and end offsets.
+        """
+        i_start, i_stop = max(0, min(i_start, len(self))), max(0, min(i_stop, len(self)))
+        return self.offset(i_start), self.offset(max(i_start, i_stop))
+
+    def chunks(self, i_chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Splits the trace into chunks of events at exact event boundaries.
+
+        Args:
+            i_chunk_size (int): The number of events per chunk.
+
+        Returns:
+            List[Tuple[int, int]]: The start and end offsets of each chunk.
+        """
+        return [self.byte_range(start, start + i_chunk_size) for start in range(0, len(self), i_chunk_size)]
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from pydejavu.core.async_monitor import AsyncMonitor
+from pydejavu.core.verify import Verify
+
+
+class TestAsyncMonitor:
+    @pytest.fixture
+    def mock_monitor(self):
+        monitor = Mock()
+        monitor.eval.return_value = "a=true"
+        monitor.eval_batch.side_effect = lambda events: ["a=false"] * len(events)
+        return monitor
+
+    @pytest.fixture
+    def verify(self, mock_monitor):
+        return Verify(mock_monitor, i_batch_eval=True)
+
+    @staticmethod
+    def run(i_verify, i_events, **i_options):
+        async def scenario():
+            async_monitor = AsyncMonitor(i_verify, **i_options)
+            async with async_monitor:
+                for e in i_events:
+                    await async_monitor.submit(e)
+            return [verdict async for verdict in async_monitor.verdicts()]
+
+        return asyncio.run(scenario())
+
+    def test_unhandled_events_are_micro_batched(self, verify, mock_monitor):
+        verdicts = self.run(verify, ["p,1", "q,2", "p,3"])
+
+        assert [v["Eval result"] for v in verdicts] == ["a=false", "a=false", "a=false"]
+        mock_monitor.eval_batch.assert_called_once_with(["p,1", "q,2", "p,3"])
+
+    def test_async_handlers_keep_the_event_order(self, verify, mock_monitor):
+        @verify.event("q")
+        async def handle_q(x: int):
+            await asyncio.sleep(0)
+            return "q", x * 10
+
+        verdicts = self.run(verify, ["p,1", "q,2", "p,3"])
+
+        assert [v["Modified Event"] for v in verdicts] == ["p,1", "q,20", "p,3"]
+        assert [v["Eval result"] for v in verdicts] == ["a=false", "a=true", "a=false"]
+        mock_monitor.eval.assert_called_once_with("q,20")
+        assert [c.args[0] for c in mock_monitor.eval_batch.call_args_list] == [["p,1"], ["p,3"]]
+
+    def test_events_with_async_handlers_are_evaluated_off_the_event_loop(self, verify, mock_monitor):
+        threads = []
+        mock_monitor.eval.side_effect = lambda event: threads.append(threading.current_thread().name) or "a=true"
+
+        @verify.event("q")
+        async def handle_q(x: int):
+            return "q", x
+
+        self.run(verify, ["q,1"])
+
+        assert len(threads) == 1 and threads[0].startswith("pydejavu-eval")
+
+    def test_parsers_run_once(self, verify, mock_monitor):
+        calls = []
+
+        @verify.event_mapper.parser("raw")
+        def parse_raw(event):
+            calls.append(event)
+            return "q", [event["args"][0]], f"q,{event['args'][0]}"
+
+        @verify.event("q")
+        async def handle_q(x: int):
+            return "q", x + 1
+
+        verdicts = self.run(verify, [{"name": "raw", "args": [1]}, {"name": "p", "args": [2]}])
+
+        assert len(calls) == 1
+        assert [v["Modified Event"] for v in verdicts] == ["q,2", "p,2"]
+
+    def test_async_handler_skip(self, verify, mock_monitor):
+        @verify.event("q")
+        async def handle_q(x: int):
+            return None
+
+        verdicts = self.run(verify, ["q,1"])
+
+        assert verdicts[0]["Modified Event"] == "skip"
+        assert verdicts[0]["Eval result"] is None
+        mock_monitor.eval.assert_not_called()
+
+    def test_full_queue_applies_backpressure(self, verify, mock_monitor):
+        async def scenario():
+            async_monitor = AsyncMonitor(verify, i_max_queue_size=1, i_collect_verdicts=False)
+            await async_monitor.submit("p,1")
+            await async_monitor.submit("p,2")
+            await async_monitor.submit("p,3")
+            await async_monitor.close()
+
+        asyncio.run(scenario())
+        assert mock_monitor.eval_batch.call_count >= 2
+
+    def test_submit_after_close_raises(self, verify):
+        async def scenario():
+            async_monitor = AsyncMonitor(verify)
+            await async_monitor.start()
+            await async_monitor.close()
+            await async_monitor.submit("p,1")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(scenario())
+
+    def test_sync_dispatch_rejects_async_handlers(self, verify, mock_monitor):
+        @verify.event("q")
+        async def handle_q(x: int):
+            return "q", x
+
+        with pytest.raises(TypeError, match="AsyncMonitor"):
+            verify.process_event("q,1")
+
+    def test_evaluation_errors_reach_the_verdicts_and_close(self, verify, mock_monitor):
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x
+
+        async def scenario():
+            async_monitor = AsyncMonitor(verify)
+            await async_monitor.start()
+            for e in ["p,1", "q,bad", "p,3"]:
+                await async_monitor.submit(e)
+            verdicts = []
+            with pytest.raises(Exception) as evaluation_error:
+                async for verdict in async_monitor.verdicts():
+                    verdicts.append(verdict)
+            with pytest.raises(RuntimeError) as submit_error:
+                await async_monitor.submit("p,4")
+            with pytest.raises(RuntimeError):
+                await async_monitor.close()
+            return verdicts, evaluation_error.value, submit_error.value
+
+        verdicts, evaluation_error, submit_error = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+        assert [v["Original Event"] for v in verdicts] == ["p,1"]
+        assert submit_error.__cause__ is evaluation_error
+        assert [c.args[0] for c in mock_monitor.eval_batch.call_args_list] == [["p,1"]]
+
+    def test_verdicts_without_collection_raise(self, verify):
+        async def scenario():
+            async with AsyncMonitor(verify, i_collect_verdicts=False) as async_monitor:
+                await async_monitor.submit("p,1")
+                with pytest.raises(RuntimeError):
+                    async for _ in async_monitor.verdicts():
+                        pass
+
+        asyncio.run(asyncio.wait_for(scenario(), 10))
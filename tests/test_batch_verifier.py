@@ -0,0 +1,148 @@
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.core import batch_verifier
+from pydejavu.core.batch_verifier import BatchSummary, BatchVerifier, OperationalFile, TraceReport
+from pydejavu.core.trace_summary import TraceSummary
+
+
+def failing_setup(i_monitor):
+    raise ValueError("bad handlers")
+
+
+class TestBatchVerifier:
+    @pytest.fixture
+    def traces(self, tmp_path):
+        for name, lines in (("host1.csv", ["p,1", "q,1"]), ("host2.csv", ["p,2"]), ("notes.txt", ["x"])):
+            (tmp_path / name).write_text("\n".join(lines) + "\n")
+        return tmp_path
+
+    @pytest.fixture
+    def worker_monitor(self):
+        monitor = Mock()
+        monitor.verify_file.return_value = TraceSummary(2, {"prop1": 1, "prop2": 0}, [])
+        with patch.object(batch_verifier, '_worker_monitor', monitor), \
+                patch.object(batch_verifier, '_worker_traces', 0), \
+                patch.object(batch_verifier, '_worker_result_dir', None), \
+                patch.object(batch_verifier, '_worker_trace_root', None), \
+                patch.object(batch_verifier, '_worker_error', None):
+            yield monitor
+
+    def test_expand_globs(self, traces):
+        paths = BatchVerifier.expand([str(traces / "*.csv"), str(traces / "host1.csv"), str(traces / "missing.csv")])
+
+        assert paths == [str(traces / "host1.csv"), str(traces / "host2.csv")]
+
+    def test_verify_trace_counts_events_and_violations(self, traces, worker_monitor):
+        report = batch_verifier._verify_trace(str(traces / "host1.csv"))
+
+        assert report.events == 2
+        assert report.violations == {"prop1": 1}
+        assert report.error is None
+        worker_monitor.verify_file.assert_called_once_with(str(traces / "host1.csv"), 0)
+        worker_monitor.reset.assert_not_called()
+        worker_monitor.verify.end_eval.assert_called_once()
+
+    def test_monitor_is_reset_between_traces(self, traces, worker_monitor):
+        batch_verifier._verify_trace(str(traces / "host1.csv"))
+        batch_verifier._verify_trace(str(traces / "host2.csv"))
+
+        worker_monitor.reset.assert_called_once_with(i_result_file=None)
+
+    def test_per_trace_result_files(self, traces, worker_monitor):
+        with patch.object(batch_verifier, '_worker_result_dir', str(traces / "results")):
+            batch_verifier._verify_trace(str(traces / "host1.csv"))
+
+        worker_monitor.reset.assert_called_once_with(i_result_file=str(traces / "results" / "host1.csv.result"))
+
+    def test_result_files_of_traces_with_the_same_name(self, traces, worker_monitor):
+        for directory in ("a", "b"):
+            (traces / directory).mkdir()
+            (traces / directory / "x.csv").write_text("p,1\n")
+
+        with patch.object(batch_verifier, '_worker_result_dir', str(traces / "results")), \
+                patch.object(batch_verifier, '_worker_trace_root', str(traces)):
+            batch_verifier._verify_trace(str(traces / "a" / "x.csv"))
+            batch_verifier._verify_trace(str(traces / "b" / "x.csv"))
+
+        assert [call.kwargs["i_result_file"] for call in worker_monitor.reset.call_args_list] == [
+            str(traces / "results" / "a" / "x.csv.result"), str(traces / "results" / "b" / "x.csv.result")]
+        assert (traces / "results" / "a").is_dir() and (traces / "results" / "b").is_dir()
+
+    def test_worker_setup_errors_are_reported_per_trace(self, traces):
+        setup = Mock(side_effect=ValueError("bad handlers"))
+        with patch('pydejavu.core.monitor.Monitor') as monitor, \
+                patch.object(batch_verifier, '_worker_monitor', None), \
+                patch.object(batch_verifier, '_worker_error', None):
+            batch_verifier._init_worker("prop p : true", {}, setup, None)
+            report = batch_verifier._verify_trace(str(traces / "host1.csv"))
+
+        setup.assert_called_once_with(monitor.return_value)
+        assert report.error == "ValueError: bad handlers"
+        assert report.events == 0
+
+    def test_failing_workers_do_not_stall_the_pool(self, traces):
+        summary = BatchVerifier("prop p : true", i_workers=2, i_setup=failing_setup).verify(str(traces / "*.csv"))
+
+        assert len(summary.reports) == 2
+        assert len(summary.failed) == 2
+
+    def test_verify_trace_reports_errors(self, traces, worker_monitor):
+        worker_monitor.verify_file.side_effect = RuntimeError("broken")
+
+        report = batch_verifier._verify_trace(str(traces / "host1.csv"))
+
+        assert report.error == "RuntimeError: broken"
+
+    def test_operational_spec_is_rejected(self):
+        with pytest.raises(ValueError, match="i_operational_spec"):
+            BatchVerifier("prop p : true", i_operational_spec="on event p(x: int)\noutput q(x)")
+
+    def test_no_traces(self, tmp_path):
+        summary = BatchVerifier("prop p: true", i_workers=4).verify(str(tmp_path / "*.csv"))
+
+        assert summary.reports == []
+        assert summary.events == 0
+
+    def test_operational_file_registers_handlers(self, tmp_path):
+        handlers = tmp_path / "handlers.pqtl"
+        handlers.write_text("@event('q')\ndef handle_q(x: int):\n    return 'q', x\n")
+        decorator = Mock(side_effect=lambda name: lambda func: func)
+
+        with patch('pydejavu.core.monitor.event', decorator):
+            OperationalFile(str(handlers))(Mock())
+
+        decorator.assert_called_once_with('q')
+
+
+class TestBatchSummary:
+    @pytest.fixture
+    def summary(self):
+        return BatchSummary([
+            TraceReport("a.csv", 100, {"prop1": 2}, 0.5),
+            TraceReport("b.csv", 300, {"prop1": 1, "prop2": 4}, 1.0),
+            TraceReport("c.csv", 0, {}, 0.1, "OSError: unreadable"),
+        ], 2.0, 2)
+
+    def test_totals(self, summary):
+        assert summary.events == 400
+        assert summary.violations == {"prop1": 3, "prop2": 4}
+        assert summary.events_per_second == 200
+        assert [report.path for report in summary.failed] == ["c.csv"]
+
+    def test_format(self, summary):
+        report = summary.format()
+
+        assert "a.csv: prop1=2" in report
+        assert "c.csv: FAILED (OSError: unreadable)" in report
+        assert "3 trace(s), 1 failed, 400 events" in report
+        assert "Violations: prop1=3, prop2=4" in report
+
+    def test_write(self, summary, tmp_path):
+        summary.write(str(tmp_path / "summary.json"))
+
+        written = json.loads((tmp_path / "summary.json").read_text())
+        assert written["violations"] == {"prop1": 3, "prop2": 4}
+        assert written["per_trace"][1]["violations"] == {"prop1": 1, "prop2": 4}
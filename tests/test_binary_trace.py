@@ -0,0 +1,92 @@
+import itertools
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.core.verify import Verify
+from pydejavu.utils.binary_trace import BinaryTrace
+from pydejavu.utils.file_utils import FileUtils
+
+
+class TestBinaryTrace:
+    CONTENT = (
+        'login,10.0.0.1,alice,true\n'
+        'p,1\n'
+        '\n'
+        'p,-42,007,-0,+3,1.5,99999999999999999999\n'
+        'msg,"hello, world",2\n'
+        'note,"first line\nsecond line",3\n'
+        'reset\n'
+        'login,10.0.0.1,bob,false\n'
+        ',\n'
+        'q,9223372036854775807,-9223372036854775808\n'
+        'café,ünïcode\n'
+    )
+
+    @pytest.fixture
+    def traces(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_text(self.CONTENT, encoding='utf-8')
+        binary = str(tmp_path / "trace.pdjt")
+        return str(trace), binary
+
+    @staticmethod
+    def flatten(i_chunks):
+        return list(itertools.chain.from_iterable(i_chunks))
+
+    @pytest.mark.parametrize("block_events", [1, 3, 1 << 16])
+    def test_events_match_the_csv_readers(self, traces, block_events):
+        trace, binary = traces
+        with patch.object(BinaryTrace, 'BLOCK_EVENTS', block_events):
+            assert BinaryTrace.convert(trace, binary) == 10
+
+        assert BinaryTrace.is_binary(binary) and not BinaryTrace.is_binary(trace)
+        assert list(FileUtils.read_events_from_file_as_string(binary, 4)) == \
+            list(FileUtils.read_events_from_file_as_string(trace, 4))
+        assert list(FileUtils.read_events_from_file_as_dict(binary, 4)) == \
+            list(FileUtils.read_events_from_file_as_dict(trace, 4))
+
+    def test_repeated_values_share_their_strings(self, traces):
+        trace, binary = traces
+        BinaryTrace.convert(trace, binary)
+
+        events = self.flatten(BinaryTrace.read_events(binary, as_dict=True))
+        logins = [event for event in events if event["name"] == "login"]
+        assert logins[0]["args"][0] is logins[1]["args"][0]
+        assert logins[0]["name"] is logins[1]["name"]
+
+    def test_repetitive_traces_are_several_times_smaller(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        users = [f"user{i}" for i in range(20)]
+        trace.write_text("".join(f"open,{users[i % 20]},/var/data/file_{i % 50}.log,{i % 4096}\n"
+                                 for i in range(5000)))
+        binary = str(tmp_path / "trace.pdjt")
+
+        assert BinaryTrace.write(binary, self.flatten(FileUtils.read_events_from_file_as_dict(str(trace)))) == 5000
+        assert os.path.getsize(str(trace)) > 4 * os.path.getsize(binary)
+        assert self.flatten(FileUtils.read_events_from_file_as_string(binary)) == \
+            self.flatten(FileUtils.read_events_from_file_as_string(str(trace)))
+
+    def test_csv_only_operations_reject_binary_traces(self, traces):
+        trace, binary = traces
+        BinaryTrace.convert(trace, binary)
+
+        with pytest.raises(ValueError):
+            FileUtils.index_trace(binary)
+        with pytest.raises(ValueError):
+            list(BinaryTrace.read_events(trace))
+
+    def test_binary_traces_are_verified_in_python(self, traces):
+        trace, binary = traces
+        BinaryTrace.convert(trace, binary)
+        monitor = Mock()
+        monitor.properties.return_value = ["a"]
+        monitor.eval_mask.side_effect = lambda event: 0 if event.startswith("q,") else 1
+
+        summary = Verify(monitor, i_structured_eval=True, i_file_eval=True).verify_file(binary)
+
+        monitor.eval_file.assert_not_called()
+        assert summary.events == 10
+        assert summary.violations == {"a": 1}
+        assert summary.violating_events == [8]
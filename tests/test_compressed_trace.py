@@ -0,0 +1,104 @@
+import bz2
+import gzip
+import lzma
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.core.verify import Verify
+from pydejavu.utils.binary_trace import BinaryTrace
+from pydejavu.utils.compressed_trace import CompressedTrace, DecompressingReader
+from pydejavu.utils.file_utils import FileUtils
+
+CODECS = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+class TestCompressedTrace:
+    CONTENT = (
+        'login,10.0.0.1,alice,true\r\n'
+        '\n'
+        'p,1\n'
+        'msg,"hello, world",2\n'
+        'note,"first line\r\nsecond line",3\r\n'
+        + ''.join(f'q,{i},user{i % 7}\n' for i in range(200))
+        + 'r,last'
+    )
+
+    @pytest.fixture
+    def plain(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_bytes(self.CONTENT.encode())
+        return str(trace)
+
+    @staticmethod
+    def compress(i_plain, i_compression):
+        # The compression is detected by the content, so the extension does not matter
+        with open(i_plain, 'rb') as plain_file:
+            data = CODECS[i_compression](plain_file.read())
+        trace = f"{i_plain}.{i_compression}"
+        with open(trace, 'wb') as trace_file:
+            trace_file.write(data)
+        return trace
+
+    @staticmethod
+    def read_all(i_trace):
+        return [
+            list(FileUtils.read_events_from_file_as_string(i_trace, 50)),
+            list(FileUtils.read_events_from_file_as_string(i_trace, 50, raw=False)),
+            list(FileUtils.read_events_from_file_as_dict(i_trace, 50)),
+        ]
+
+    @pytest.mark.parametrize("compression", sorted(CODECS))
+    def test_readers_stream_compressed_traces(self, plain, compression):
+        trace = self.compress(plain, compression)
+
+        assert CompressedTrace.compression(trace) == compression
+        assert CompressedTrace.compression(plain) is None
+        assert self.read_all(trace) == self.read_all(plain)
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64])
+    def test_small_decompressed_blocks(self, plain, block_size):
+        trace = self.compress(plain, 'gzip')
+
+        with patch.object(DecompressingReader, 'BLOCK_SIZE', block_size), \
+                patch.object(DecompressingReader, 'QUEUE_BLOCKS', 1):
+            assert self.read_all(trace) == self.read_all(plain)
+
+    def test_compressed_binary_traces(self, plain, tmp_path):
+        binary = str(tmp_path / "trace.pdjt")
+        BinaryTrace.convert(self.compress(plain, 'xz'), binary)
+        trace = self.compress(binary, 'gzip')
+
+        assert BinaryTrace.is_binary(trace)
+        assert list(FileUtils.read_events_from_file_as_dict(trace)) == list(FileUtils.read_events_from_file_as_dict(plain))
+
+    def test_closing_early_stops_the_thread(self, plain):
+        trace = self.compress(plain, 'bz2')
+
+        with patch.object(DecompressingReader, 'BLOCK_SIZE', 16), \
+                patch.object(DecompressingReader, 'QUEUE_BLOCKS', 1):
+            with CompressedTrace.open(trace) as stream:
+                assert stream.read(5) == b'login'
+        assert not any(thread.name == 'pydejavu-decompress' for thread in threading.enumerate())
+
+    def test_decompression_errors_are_raised_by_the_reader(self, tmp_path):
+        trace = tmp_path / "trace.csv.gz"
+        trace.write_bytes(gzip.compress(b"p,1\n" * 100)[:-20])
+
+        with pytest.raises(EOFError):
+            list(FileUtils.read_events_from_file_as_string(str(trace)))
+
+    def test_compressed_traces_are_verified_in_python(self, plain):
+        trace = self.compress(plain, 'gzip')
+        monitor = Mock()
+        monitor.properties.return_value = ["a"]
+        monitor.eval_mask.side_effect = lambda event: 0 if event == "r,last" else 1
+
+        summary = Verify(monitor, i_structured_eval=True, i_file_eval=True).verify_file(trace)
+
+        monitor.eval_file.assert_not_called()
+        assert summary.events == 205
+        assert summary.violating_events == [204]
+        with pytest.raises(ValueError):
+            FileUtils.index_trace(trace)
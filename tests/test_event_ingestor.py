@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from pydejavu.core.event_ingestor import EventIngestor
+from pydejavu.core.verify import Verify
+
+
+class TestEventIngestor:
+    @pytest.fixture
+    def mock_monitor(self):
+        monitor = Mock()
+        monitor.eval.return_value = "a=true"
+        monitor.eval_batch.side_effect = lambda events: ["a=true"] * len(events)
+        return monitor
+
+    @pytest.fixture
+    def verify(self, mock_monitor):
+        return Verify(mock_monitor, i_batch_eval=True)
+
+    def test_results_follow_the_sequence_numbers(self, verify):
+        results = []
+        with EventIngestor(verify, i_on_result=lambda seq, result: results.append((seq, result))) as ingestor:
+            sequence_numbers = [ingestor.submit(f"p,{i}") for i in range(10)]
+
+        assert sequence_numbers == list(range(10))
+        assert [seq for seq, _ in results] == sequence_numbers
+        assert [result["Original Event"] for _, result in results] == [f"p,{i}" for i in range(10)]
+
+    def test_many_producers(self, verify):
+        results = []
+        submitted = {}
+        ingestor = EventIngestor(verify, i_max_batch_size=64,
+                                 i_on_result=lambda seq, result: results.append((seq, result["Original Event"])))
+
+        def produce(producer):
+            for i in range(500):
+                event = f"p,{producer},{i}"
+                submitted[ingestor.submit(event)] = event
+
+        producers = [threading.Thread(target=produce, args=(producer,)) for producer in range(8)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        ingestor.close()
+
+        assert [seq for seq, _ in results] == list(range(4000))
+        assert all(submitted[seq] == event for seq, event in results)
+
+    def test_handlers_run_on_the_consumer_thread(self, verify):
+        threads = set()
+
+        @verify.event("q")
+        def handle_q(x: int):
+            threads.add(threading.current_thread().name)
+            return "q", x
+
+        with EventIngestor(verify) as ingestor:
+            ingestor.submit("q,1")
+            assert ingestor.flush(i_timeout=5)
+            assert ingestor.processed == 1
+
+        assert threads == {"pydejavu-ingestor"}
+
+    def test_submit_after_close_raises(self, verify):
+        ingestor = EventIngestor(verify)
+        ingestor.close()
+
+        with pytest.raises(RuntimeError):
+            ingestor.submit("p,1")
+
+    def test_evaluation_error_does_not_stop_the_consumer(self, verify, mock_monitor):
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x
+
+        with EventIngestor(verify) as ingestor:
+            ingestor.submit("q,not_a_number")
+            ingestor.submit("p,1")
+            assert ingestor.flush(i_timeout=5)
+
+        assert ingestor.processed == 2
+
+    def test_evaluation_resumes_after_the_failing_event(self, verify, mock_monitor):
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x
+
+        results = {}
+        with EventIngestor(verify, i_on_result=lambda seq, result: results.update({seq: result})) as ingestor:
+            for event in ("p,0", "q,bad", "p,1", "p,2"):
+                ingestor.submit(event)
+
+        evaluated = [event for call in mock_monitor.eval_batch.call_args_list for event in call[0][0]]
+        assert evaluated == ["p,0", "p,1", "p,2"]
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[1]["Eval result"] is None and "Error" in results[1]
+        assert [results[seq]["Eval result"] for seq in (0, 2, 3)] == ["a=true"] * 3
+        assert ingestor.processed == 4
+
+    def test_pipelined_verify_reports_the_failing_event(self, mock_monitor):
+        verify = Verify(mock_monitor, i_batch_eval=True, i_pipelined=True)
+        calls = []
+
+        @verify.event("q")
+        def handle_q(x: int):
+            calls.append(x)
+            return "q", x
+
+        results = {}
+        with EventIngestor(verify, i_on_result=lambda seq, result: results.update({seq: result})) as ingestor:
+            for event in ("q,0", "p,1", "q,bad", "q,3"):
+                ingestor.submit(event)
+
+        assert calls == [0, 3]
+        assert "Error" in results[2] and results[2]["Original Event"] == "q,bad"
+        assert [results[seq]["Eval result"] for seq in (0, 1, 3)] == ["a=true"] * 3
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from pydejavu.core.event_pipeline import EventPipeline
+from pydejavu.core.verify import Verify
+
+
+class TestEventPipeline:
+    def test_stages_keep_the_order(self):
+        pipeline = EventPipeline([lambda chunk: [x + 1 for x in chunk], lambda chunk: [x * 2 for x in chunk]],
+                                 i_chunk_size=7, i_queue_size=1)
+
+        assert list(pipeline.run(range(100))) == [(x + 1) * 2 for x in range(100)]
+
+    def test_stages_run_on_separate_threads(self):
+        names = set()
+
+        def stage(chunk):
+            names.add(threading.current_thread().name)
+            return chunk
+
+        list(EventPipeline([stage, stage, stage]).run(range(10)))
+
+        assert len(names) == 3
+        assert threading.current_thread().name not in names
+
+    def test_stage_error_is_raised_by_the_consumer(self):
+        def failing(chunk):
+            raise ValueError("bad event")
+
+        with pytest.raises(ValueError, match="bad event"):
+            list(EventPipeline([lambda chunk: chunk, failing]).run(range(10)))
+
+    def test_closing_the_iterator_stops_the_threads(self):
+        before = threading.active_count()
+        results = EventPipeline([lambda chunk: chunk], i_chunk_size=1, i_queue_size=1).run(iter(range(10 ** 6)))
+
+        assert next(results) == 0
+        results.close()
+
+        assert threading.active_count() == before
+
+    def test_no_stages(self):
+        with pytest.raises(ValueError):
+            EventPipeline([])
+
+
+class TestPipelinedVerify:
+    EVENTS = ["p,1", "q,1,20", "q,2,5", "p,3", "r,4"]
+
+    @staticmethod
+    def verify(i_batch_eval, i_pipelined):
+        monitor = Mock()
+        monitor.eval.side_effect = lambda event: f"a={'true' if event.startswith('p') else 'false'}"
+        monitor.eval_batch.side_effect = lambda events: [monitor.eval(event) for event in events]
+        verify = Verify(monitor, i_batch_eval=i_batch_eval, i_pipelined=i_pipelined)
+
+        @verify.event("q")
+        def handle_q(x: int, y: int):
+            if y > 10:
+                return "q", x
+
+        return verify
+
+    @pytest.mark.parametrize("batch_eval", [False, True])
+    def test_same_results_as_the_sequential_loop(self, batch_eval):
+        expected = self.verify(batch_eval, False).process_events(self.EVENTS)
+        results = self.verify(batch_eval, True).process_events(self.EVENTS)
+
+        assert results == expected
+        assert [r["Modified Event"] for r in results] == ["p,1", "q,1", "skip", "p,3", "r,4"]
+
+    def test_batch_eval_is_called_once_per_chunk(self):
+        verify = self.verify(True, False)
+        results = list(verify.iter_events_pipelined(self.EVENTS * 3, i_chunk_size=5))
+
+        assert len(results) == 15
+        assert verify._Verify__m_dejavu_monitor.eval_batch.call_count == 3
+
+    def test_arity_error_is_raised(self):
+        with pytest.raises(ValueError):
+            self.verify(False, True).process_events(["q,1"])
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+
+from pydejavu.utils.file_utils import FileUtils
+
+
+class TestRawEventReader:
+    CONTENT = (
+        'login,10.0.0.1,alice,true\r\n'
+        '\n'
+        'p,1\n'
+        'msg,"hello, world",2\n'
+        'note,"first line\r\nsecond line",3\r\n'
+        '   \n'
+        'q,a"b\n'
+        ',\n'
+        'r,last'
+    )
+
+    @pytest.fixture
+    def trace(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_bytes(self.CONTENT.encode())
+        return str(trace)
+
+    @staticmethod
+    def read(i_trace, i_chunk_size=3, **kwargs):
+        return list(FileUtils.read_events_from_file_as_string(i_trace, i_chunk_size, **kwargs))
+
+    def test_raw_reader_matches_the_csv_reader(self, trace):
+        expected = self.read(trace, raw=False)
+
+        assert self.read(trace) == expected
+        assert [event for chunk in expected for event in chunk] == [
+            "login,10.0.0.1,alice,true", "p,1", "msg,hello, world,2", "note,first line\nsecond line,3",
+            "   ", 'q,a"b', ",", "r,last"]
+
+    @pytest.mark.parametrize("block_size", [1, 7, 16, 64])
+    def test_lines_and_quoted_fields_may_cross_blocks(self, trace, block_size):
+        expected = self.read(trace, raw=False)
+        with patch.object(FileUtils, 'RAW_BLOCK_SIZE', block_size):
+            assert self.read(trace) == expected
+
+    def test_unquoted_traces_are_not_tokenized(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_text("".join(f"p,{i}\n" for i in range(25)))
+
+        with patch('pydejavu.utils.file_utils.csv.reader') as reader:
+            chunks = self.read(str(trace), 10)
+
+        reader.assert_not_called()
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert chunks[2][-1] == "p,24"
+
+    @pytest.mark.parametrize("content", ['p,"a', 'p,"a\nb', 'p,1\nq,"a\r\nb', 'p,"a"', '"a\r\n"'])
+    @pytest.mark.parametrize("block_size", [1, 4, 1 << 20])
+    def test_quoted_field_at_the_end_of_the_file(self, tmp_path, content, block_size):
+        trace = tmp_path / "trace.csv"
+        trace.write_bytes(content.encode())
+
+        expected = self.read(str(trace), raw=False)
+        with patch.object(FileUtils, 'RAW_BLOCK_SIZE', block_size):
+            assert self.read(str(trace)) == expected
+
+    @pytest.mark.parametrize("content", ['a,1\rb,2\n', 'a,1\rb,2', 'p,"x\ry",1\rq,2\r\n', 'a,1\r\r\nb,2\r'])
+    @pytest.mark.parametrize("block_size", [1, 4, 1 << 20])
+    def test_bare_carriage_returns_end_lines(self, tmp_path, content, block_size):
+        trace = tmp_path / "trace.csv"
+        trace.write_bytes(content.encode())
+
+        expected = self.read(str(trace), raw=False)
+        with patch.object(FileUtils, 'RAW_BLOCK_SIZE', block_size):
+            assert self.read(str(trace)) == expected
+        if content.startswith('a,1\rb'):
+            assert expected == [['a,1', 'b,2']]
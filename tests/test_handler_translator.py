@@ -0,0 +1,141 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.compilation.handler_translator import HandlerTranslator
+from pydejavu.core.dispatch_plan import TranslatedPlan
+from pydejavu.core.verify import Verify
+
+failed_attempts = {}
+
+
+def handle_login(ip: str, user: str, success: bool):
+    global failed_attempts
+    if not success:
+        failed_attempts[(ip, user)] = failed_attempts.get(
+            (ip, user), 0) + 1
+        if failed_attempts[(ip, user)] >= 3:
+            return "failed_in_row", ip, user
+        else:
+            return None
+    else:
+        failed_attempts[(ip, user)] = 0
+        return "successful_login", ip, user
+
+
+def example_2_handlers():
+    last_seen_q = False
+    y = 0
+
+    def handle_p(arg_x: int):
+        nonlocal y, last_seen_q
+        x_lt_y = last_seen_q and arg_x < y
+        last_seen_q = False
+        return "p_q", arg_x, y, x_lt_y
+
+    def handle_q(arg_y: int) -> None:
+        nonlocal y, last_seen_q
+        y = arg_y
+        last_seen_q = True
+
+    def handle_r(arg_x: int, arg_y: int):
+        nonlocal last_seen_q
+        last_seen_q = False
+        print(arg_x)
+        return "r", arg_x, arg_y
+
+    return handle_p, handle_q, handle_r
+
+
+class TestHandlerTranslator:
+    def test_dictionary_counters_are_translated(self):
+        translation = HandlerTranslator(i_logger=Mock()).translate({"login": handle_login})
+
+        assert translation.translated == ("login",)
+        assert translation.untranslated == {}
+        source = translation.source
+        assert f"class {translation.class_name}(fallback: java.util.function.Function[String, String])" in source
+        assert 'case "login" => guarded(event, handle_0(fields))' in source
+        assert "var p_success: Boolean = to_bool(fields(3))" in source
+        assert "private val state_0 = scala.collection.mutable.HashMap[Any, Any]()" in source
+        assert "state_0((p_ip, p_user)) = (state_0.getOrElse((p_ip, p_user), 0L).asInstanceOf[Long] + 1L)" in source
+        assert 'return ("failed_in_row") + "," + (p_ip) + "," + (p_user)' in source
+
+    def test_closure_variables_are_shared_between_handlers(self):
+        handle_p, handle_q, _ = example_2_handlers()
+
+        translation = HandlerTranslator(i_logger=Mock()).translate({"p": handle_p, "q": handle_q})
+
+        assert translation.translated == ("p", "q")
+        source = translation.source
+        assert source.count("private var state_") == 2
+        assert "l_x_lt_y = (state_0) && ((p_arg_x < state_1))" in source
+        assert "state_1 = p_arg_y" in source
+
+    def test_untranslatable_handlers_stay_in_python_with_their_variables(self):
+        handle_p, handle_q, handle_r = example_2_handlers()
+        logger = Mock()
+
+        translation = HandlerTranslator(i_logger=logger).translate(
+            {"login": handle_login, "p": handle_p, "q": handle_q, "r": handle_r})
+
+        assert translation.translated == ("login",)
+        assert "expression statements" in translation.untranslated["r"]
+        assert translation.untranslated["p"] == "shares a variable with a handler which stays in Python"
+        assert translation.untranslated["q"] == "shares a variable with a handler which stays in Python"
+        assert logger.warning.call_count == 3
+
+    def test_unsupported_constructs_are_reported(self):
+        def loop(x: int):
+            for _ in range(x):
+                pass
+
+        def annotated(x: list):
+            return None
+
+        def untyped_condition(x: int):
+            if x:
+                return "p", x
+
+        translation = HandlerTranslator(i_logger=Mock()).translate(
+            {"a": loop, "b": annotated, "c": untyped_condition})
+
+        assert translation.source is None
+        assert "'For' statements are not supported" in translation.untranslated["a"]
+        assert "unsupported type annotation" in translation.untranslated["b"]
+        assert "conditions must be boolean expressions" in translation.untranslated["c"]
+
+
+class TestTranslatedHandlers:
+    @pytest.fixture
+    def mock_monitor(self):
+        monitor = Mock()
+        monitor.properties.return_value = ["a"]
+        monitor.eval_mask.return_value = 0b1
+        monitor.eval_file_with.return_value = [1, 0]
+        return monitor
+
+    def test_translated_handlers_replace_the_python_handlers(self, mock_monitor):
+        verify = Verify(mock_monitor, i_structured_eval=True, i_file_eval=True)
+        verify.event("login")(handle_login)
+        translated = Mock()
+        translated.apply.side_effect = lambda request: request.split("\n")[1].replace("login", "renamed")
+
+        with patch('pydejavu.core.verify.TranslatedHandlers', return_value=translated) as translated_class:
+            translation = verify.translate_handlers()
+
+        assert translation.translated == ("login",)
+        assert translated_class.call_args[0][0] is translation
+        assert isinstance(verify.event_mapper.dispatch_map["login"], TranslatedPlan)
+
+        result = verify.process_event("login,10.0.0.1,alice,false")
+        translated.apply.assert_called_once_with("0\nlogin,10.0.0.1,alice,false")
+        assert result["Modified Event"] == "renamed,10.0.0.1,alice,false"
+
+        verify.verify_file("trace.csv")
+        assert mock_monitor.eval_file_with.call_args[0][3] is translated.java.return_value
+        translated.fallback.raise_error.assert_called_once()
+
+    def test_translation_requires_file_evaluation(self, mock_monitor):
+        verify = Verify(mock_monitor, i_structured_eval=True)
+        with pytest.raises(RuntimeError):
+            verify.translate_handlers()
@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import pytest
+
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
+from pydejavu.core.monitor import Monitor
+from pydejavu.core.verify import Verify
+from pydejavu.jni.isolated_monitor import IsolatedMonitor
+
+
+class TestIsolatedMonitor:
+    @pytest.fixture
+    def methods(self):
+        names = ['config', 'eval', 'eval_batch', 'eval_batch_lines', 'properties', 'eval_mask', 'end_eval']
+        return {name: Mock() for name in names}
+
+    @pytest.fixture
+    def isolated(self, methods):
+        # Bypass the class loading, which requires a JVM
+        monitor = object.__new__(IsolatedMonitor)
+        monitor._IsolatedMonitor__m_methods = methods
+        return monitor
+
+    def test_entry_points_are_invoked_through_reflection(self, isolated, methods):
+        methods['eval'].invoke.return_value = "a=true"
+
+        assert isolated.eval("p,1") == "a=true"
+        methods['eval'].invoke.assert_called_once_with(None, ["p,1"])
+
+    def test_batch_events_are_passed_as_lines(self, isolated, methods):
+        methods['eval_batch_lines'].invoke.return_value = ["a=true", "a=false"]
+
+        assert isolated.eval_batch(["p,1", "q,2"]) == ["a=true", "a=false"]
+        methods['eval_batch_lines'].invoke.assert_called_once_with(None, ["p,1\nq,2"])
+
+    def test_missing_entry_point(self, isolated):
+        assert isolated.has_method('eval_batch')
+        assert not isolated.has_method('eval_batch_mask')
+        with pytest.raises(AttributeError):
+            isolated.eval_batch_mask(["p,1"])
+
+    def test_verify_drives_isolated_monitor(self, isolated, methods):
+        methods['eval_batch_lines'].invoke.return_value = ["a=true", "a=false"]
+        verify = Verify(isolated, i_batch_eval=True)
+
+        results = verify.process_events(["p,1", "q,2"])
+
+        assert [result["Eval result"] for result in results] == ["a=true", "a=false"]
+        methods['config'].invoke.assert_called_once()
+
+    def test_lines_extension_is_injected(self):
+        source = MonitorExtensions().extend_source("object TraceMonitor {\n}\n")
+        assert "def eval_batch_lines(events: String): Array[String]" in source
+        assert "def eval_batch_mask_lines(events: String): Array[Long]" in source
+        # The separator is a Scala escape sequence, a raw newline would end the string literal
+        assert 'split("\\n")' in source
+
+
+class TestIsolatedMonitorInstances:
+    def test_isolated_monitors_are_independent(self):
+        singleton = Monitor(i_spec=None)
+        first = Monitor(i_spec=None, i_isolated=True)
+        second = Monitor(i_spec=None, i_isolated=True)
+
+        assert first is not second
+        assert singleton is not first and singleton is not second
+        assert Monitor.get_instance() is singleton
+
+    def test_isolated_monitor_keeps_pending_handlers(self):
+        handler = ("pending_event", lambda: None)
+        Monitor.add_pending_event_handler(handler)
+        try:
+            Monitor(i_spec=None, i_isolated=True)
+            assert handler in Monitor._Monitor__pending_event_handlers
+        finally:
+            Monitor._Monitor__pending_event_handlers.remove(handler)
@@ -0,0 +1,153 @@
+import importlib.util
+import os
+import shutil
+
+import pytest
+
+from pydejavu.core.monitor import Monitor
+from pydejavu.jni.isolated_monitor import IsolatedMonitor
+from pydejavu.jni.jni_config import JarPaths
+
+# These tests synthesize, compile and link real monitors
+requires_jvm = pytest.mark.skipif(
+    shutil.which("java") is None or shutil.which("scalac") is None or importlib.util.find_spec("jnius") is None
+    or not os.path.exists(JarPaths.DEJAVU.value),
+    reason="Requires java, scalac, pyjnius and the DejaVu jar")
+
+
+def counting_handlers():
+    seen = 0
+
+    def handle_p(x: int):
+        # Every third p event is renamed to a q event
+        nonlocal seen
+        seen = seen + 1
+        if seen >= 3:
+            seen = 0
+            return "q", x
+        return None
+
+    def handle_r(x: int):
+        # A loop keeps this handler in Python
+        for _ in range(x):
+            pass
+        return "q", x
+
+    return handle_p, handle_r, lambda: seen
+
+
+@requires_jvm
+class TestJVMIntegration:
+    SPEC = "prop no_q : forall x . !q(x)"
+
+    @staticmethod
+    def monitor(i_tmp_path, i_spec=SPEC, **kwargs):
+        return Monitor(
+            i_spec=i_spec,
+            i_cache=False,
+            i_isolated=True,
+            i_workspace=str(i_tmp_path / "workspace"),
+            i_result_file=str(i_tmp_path / "output" / "resultFile"),
+            **kwargs)
+
+    def test_operational_spec_changes_the_verdicts(self, tmp_path):
+        # The pre-monitor drops the q events with a small argument
+        operational_spec = (
+            "on q(x: int)\n"
+            "  in_bound: bool := x > 10\n"
+            "  output ite(in_bound,\n"
+            "    q(x), skip)\n"
+        )
+        plain = self.monitor(tmp_path / "plain")
+        filtered = self.monitor(tmp_path / "filtered", i_operational_spec=operational_spec)
+
+        events = [{"name": "q", "args": [5]}, {"name": "q", "args": [20]}]
+        assert [plain.verify.process_event(event)["Eval result"] for event in events] == ["no_q=false", "no_q=false"]
+        assert [filtered.verify.process_event(event)["Eval result"] for event in events] == ["no_q=true", "no_q=false"]
+
+        # The file evaluation inside the JVM goes through the pre-monitor as well
+        trace = tmp_path / "trace.csv"
+        trace.write_text("q,5\nq,7\nq,20\n")
+        filtered_file = self.monitor(tmp_path / "filtered_file", i_operational_spec=operational_spec)
+        assert filtered_file.verify.verify_file(str(trace)).violating_events == [2]
+        with pytest.raises(RuntimeError):
+            filtered_file.reset()
+
+    def test_isolated_monitors_have_their_own_state(self, tmp_path):
+        q_seen = self.monitor(tmp_path / "q_seen", "prop no_q_yet : !exists x . P q(x)")
+        p_seen = self.monitor(tmp_path / "p_seen", "prop no_q_yet : !exists x . P q(x)\n"
+                                                   "prop no_p_yet : !exists x . P p(x)")
+
+        assert isinstance(q_seen.verify._Verify__m_dejavu_monitor, IsolatedMonitor)
+        assert q_seen.verify.process_event("q,1")["Eval result"] == "no_q_yet=false"
+        # The batch entry points are reached through reflection as well
+        results = p_seen.verify.process_events(["p,1", "p,2"])
+        verdicts = [set(result["Eval result"].split(",")) for result in results]
+        assert verdicts == [{"no_q_yet=true", "no_p_yet=false"}] * 2
+        assert q_seen.verify.process_event("p,1")["Eval result"] == "no_q_yet=false"
+
+    def test_translated_handlers_match_the_python_handlers(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_text("p,1\np,2\nr,0\np,3\np,4\np,5\np,6\nr,1\np,7\n")
+        summaries = []
+        for name, translate in (("python", False), ("jvm", True)):
+            monitor = self.monitor(tmp_path / name)
+            handle_p, handle_r, seen = counting_handlers()
+            monitor.register_event("p", handle_p)
+            monitor.register_event("r", handle_r)
+            if translate:
+                translation = monitor.translate_handlers()
+                assert translation.translated == ("p",)
+                assert set(translation.untranslated) == {"r"}
+            summaries.append(monitor.verify_file(str(trace)))
+            # The translated handler updates its variable inside the JVM only
+            assert seen() == (0 if translate else 1)
+
+        python, jvm = summaries
+        assert python.violating_events[0] == 2
+        assert (jvm.events, jvm.violations, jvm.violating_events) == \
+            (python.events, python.violations, python.violating_events)
+
+    def test_jvm_driven_trace_calls_back_for_handled_events(self, tmp_path):
+        lines = ["p,1", "q,2", "p,3", "p,20", "q,4", "p,5"]
+        trace = tmp_path / "trace.csv"
+        trace.write_text("\n".join(lines) + "\n")
+
+        def observing(i_monitor, i_observed):
+            def handle_p(x: int):
+                i_observed.append(i_monitor.last_eval("no_q"))
+                if x > 10:
+                    return "q", x
+                return None
+            return handle_p
+
+        # The q events have no handler, so only the p events call back into Python
+        jvm_observed, python_observed = [], []
+        jvm = self.monitor(tmp_path / "jvm")
+        jvm.register_event("p", observing(jvm, jvm_observed))
+        python = self.monitor(tmp_path / "python")
+        python.register_event("p", observing(python, python_observed))
+
+        summary = jvm.verify_file(str(trace))
+        results = [python.verify.process_event(line) for line in lines]
+
+        assert summary.events == len(lines)
+        assert summary.violations == {"no_q": 3}
+        assert summary.violating_events == [index for index, result in enumerate(results)
+                                            if result["Eval result"] == "no_q=false"] == [1, 3, 4]
+        assert jvm_observed == python_observed
+        assert jvm_observed[1:] == [False, False, False]
+        assert jvm.last_eval("no_q") is python.last_eval("no_q") is False
+
+    def test_trace_files_are_evaluated_alike_inside_and_outside_the_jvm(self, tmp_path):
+        # A quoted field spanning two lines, and the control event every shipped trace ends with
+        trace = tmp_path / "trace.csv"
+        trace.write_text('q,1\nq,"a\nb"\n#end#\n')
+        jvm = self.monitor(tmp_path / "jvm")
+        python = self.monitor(tmp_path / "python")
+
+        assert jvm.verify.supports_file_eval
+        assert jvm.verify_file(str(trace)) == (3, {"no_q": 2}, [0, 1])
+        assert [(violation.index, violation.original_event) for violation in python.iter_violations(str(trace))] == \
+            [(0, "q,1"), (1, "q,a\nb")]
+        assert python.last_eval("no_q") is False
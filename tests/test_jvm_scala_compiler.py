@@ -0,0 +1,55 @@
+import subprocess
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pydejavu.compilation.jvm_scala_compiler import JVMScalaCompiler
+from pydejavu.compilation.scala_monitor_compiler import ScalaMonitorCompiler
+
+
+class TestJVMScalaCompiler:
+    def test_compiler_jars_from_scala_home(self, tmp_path, monkeypatch):
+        lib_dir = tmp_path / "lib"
+        lib_dir.mkdir()
+        for jar in JVMScalaCompiler.COMPILER_JARS:
+            (lib_dir / jar).write_bytes(b"")
+        monkeypatch.setenv("SCALA_HOME", str(tmp_path))
+
+        assert JVMScalaCompiler.compiler_jars() == [str(lib_dir / jar) for jar in JVMScalaCompiler.COMPILER_JARS]
+
+    def test_compiler_jars_missing(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SCALA_HOME", str(tmp_path))
+        monkeypatch.setenv("PATH", str(tmp_path))
+
+        assert JVMScalaCompiler.compiler_jars() is None
+        with pytest.raises(RuntimeError):
+            JVMScalaCompiler("dejavu.jar", i_logger=Mock()).compile_to_dir(str(tmp_path / "A.scala"), str(tmp_path))
+
+
+class TestInProcessCompilation:
+    @pytest.fixture
+    def source(self, tmp_path):
+        source = tmp_path / "TraceMonitor.scala"
+        source.write_text("object TraceMonitor {\n  def eval(event: String): String = \"\"\n}\n")
+        return source
+
+    def test_in_process_compilation_skips_scalac(self, source, tmp_path):
+        compiler = ScalaMonitorCompiler(i_dejavu="dejavu.jar", i_source=str(source), i_dest=str(tmp_path),
+                                        i_logger=Mock(), i_in_process=True)
+        with patch.object(JVMScalaCompiler, 'compile_to_jar', side_effect=lambda src, jar: jar) as compile_to_jar, \
+                patch.object(subprocess, 'run') as run:
+            assert compiler.compile_monitor(generate_jar=True) == compiler.jar
+
+        compile_to_jar.assert_called_once_with(str(source), compiler.jar)
+        run.assert_not_called()
+
+    def test_in_process_failure_falls_back_to_scalac(self, source, tmp_path):
+        logger = Mock()
+        compiler = ScalaMonitorCompiler(i_dejavu="dejavu.jar", i_source=str(source), i_dest=str(tmp_path),
+                                        i_logger=logger, i_in_process=True)
+        with patch.object(JVMScalaCompiler, 'compile_to_jar', side_effect=RuntimeError("no compiler")), \
+                patch.object(subprocess, 'run') as run:
+            assert compiler.compile_monitor(generate_jar=True) == compiler.jar
+
+        assert run.call_args[0][0][0] == "scalac"
+        logger.warning.assert_called_once()
@@ -0,0 +1,124 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pydejavu.compilation.monitor_cache import MonitorCache
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
+
+
+class TestMonitorCache:
+    SPEC = "prop example : forall x . (p(x) -> P q(x))"
+
+    @pytest.fixture
+    def dejavu_jar(self, tmp_path):
+        jar = tmp_path / "dejavu.jar"
+        jar.write_bytes(b"dejavu")
+        return jar
+
+    @pytest.fixture
+    def cache(self, tmp_path, dejavu_jar):
+        return MonitorCache(i_cache_dir=str(tmp_path / "cache"), i_dejavu_jar=str(dejavu_jar))
+
+    @pytest.fixture
+    def compiled_jar(self, tmp_path):
+        jar = tmp_path / "TraceMonitor.jar"
+        jar.write_bytes(b"monitor")
+        return str(jar)
+
+    def test_key_depends_on_spec_and_dejavu_jar(self, cache, tmp_path, dejavu_jar):
+        key = cache.key(self.SPEC)
+
+        assert key == cache.key(f"\n  {self.SPEC}\n")
+        assert key != cache.key(self.SPEC.replace("P q", "H q"))
+
+        dejavu_jar.write_bytes(b"dejavu 2")
+        assert key != MonitorCache(i_cache_dir=cache.directory, i_dejavu_jar=str(dejavu_jar)).key(self.SPEC)
+
+    def test_key_depends_on_operational_spec(self, cache):
+        operational_spec = "on event p(x: int)\noutput q(x)"
+        key = cache.key(self.SPEC, operational_spec)
+
+        assert key != cache.key(self.SPEC)
+        assert key == cache.key(self.SPEC, f"{operational_spec}\n")
+        assert key != cache.key(self.SPEC, operational_spec.replace("q(x)", "r(x)"))
+
+    def test_key_depends_on_source_rewrite(self, cache, dejavu_jar, monkeypatch):
+        key = cache.key(self.SPEC)
+
+        monkeypatch.setattr(MonitorExtensions, 'VERSION', MonitorExtensions.VERSION + 1)
+        assert key != MonitorCache(i_cache_dir=cache.directory, i_dejavu_jar=str(dejavu_jar)).key(self.SPEC)
+
+        monkeypatch.undo()
+        monkeypatch.setattr(MonitorExtensions, 'SUBMIT_CALL', re.compile(r'\bonline_monitor\.submit_all\('))
+        assert key != MonitorCache(i_cache_dir=cache.directory, i_dejavu_jar=str(dejavu_jar)).key(self.SPEC)
+
+    def test_key_depends_on_compiler_backend(self, cache, tmp_path, dejavu_jar):
+        compiler_jars = [tmp_path / "scala-compiler.jar", tmp_path / "scala-reflect.jar"]
+        for jar in compiler_jars:
+            jar.write_bytes(b"2.13.12")
+
+        def key():
+            return MonitorCache(i_cache_dir=cache.directory, i_dejavu_jar=str(dejavu_jar),
+                                i_compiler_jars=[str(jar) for jar in compiler_jars]).key(self.SPEC)
+
+        in_jvm = key()
+        assert in_jvm != cache.key(self.SPEC)
+        assert in_jvm == key()
+
+        compiler_jars[0].write_bytes(b"2.13.14-RC1")
+        assert in_jvm != key()
+
+    def test_store_and_lookup(self, cache, compiled_jar):
+        key = cache.key(self.SPEC)
+        assert cache.lookup(key) is None
+
+        cached_jar = cache.store(key, compiled_jar, self.SPEC)
+
+        assert cache.lookup(key) == cached_jar
+        with open(cached_jar, 'rb') as jar:
+            assert jar.read() == b"monitor"
+        assert [entry['key'] for entry in cache.entries()] == [key]
+        assert cache.entries()[0]['specification'] == self.SPEC
+
+    def test_evict_by_prefix_and_clear(self, cache, compiled_jar):
+        first = cache.key(self.SPEC)
+        second = cache.key("prop other : p(1)")
+        cache.store(first, compiled_jar, self.SPEC)
+        cache.store(second, compiled_jar, "prop other : p(1)")
+
+        assert cache.evict(first[:12])
+        assert cache.lookup(first) is None
+        assert not cache.evict(first)
+
+        assert cache.clear() == 1
+        assert cache.entries() == []
+
+    def test_prune_least_recently_used(self, cache, compiled_jar):
+        keys = [cache.key(f"prop p{i} : p({i})") for i in range(3)]
+        for i, key in enumerate(keys):
+            jar = cache.store(key, compiled_jar, f"prop p{i} : p({i})")
+            used = time.time() - (3 - i) * 24 * 60 * 60
+            os.utime(jar, (used, used))
+
+        assert cache.prune(i_max_age_days=2.5) == 1
+        assert cache.prune(i_max_entries=1) == 1
+        assert [entry['key'] for entry in cache.entries()] == [keys[2]]
+
+    def test_concurrent_stores_publish_a_single_entry(self, cache, tmp_path):
+        key = cache.key(self.SPEC)
+        jars = []
+        for i in range(8):
+            jar = tmp_path / f"TraceMonitor{i}.jar"
+            jar.write_bytes(f"monitor {i}".encode())
+            jars.append(str(jar))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            paths = set(pool.map(lambda jar: cache.store(key, jar, self.SPEC), jars))
+
+        assert len(paths) == 1
+        assert len(cache.entries()) == 1
+        with open(paths.pop(), 'rb') as jar:
+            assert jar.read() in {f"monitor {i}".encode() for i in range(8)}
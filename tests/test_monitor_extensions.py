@@ -0,0 +1,77 @@
+import pytest
+
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
+
+
+class TestMonitorExtensions:
+    @pytest.fixture
+    def trace_monitor_source(self, tmp_path):
+        source = tmp_path / "TraceMonitor.scala"
+        source.write_text(
+            "class PropertyMonitor(preMonitor: PreMonitorTrait) extends Monitor(preMonitor) {\n"
+            "}\n"
+            "\n"
+            "object TraceMonitor {\n"
+            "  private lazy val online_monitor: PropertyMonitor = new PropertyMonitor(null)\n"
+            "  def eval(event: String): String = \"\"\n"
+            "}\n"
+        )
+        return source
+
+    def test_extend_injects_into_trace_monitor_object(self, trace_monitor_source):
+        assert MonitorExtensions().extend(str(trace_monitor_source))
+
+        source = trace_monitor_source.read_text()
+        assert MonitorExtensions.MARKER in source
+        assert "def eval_batch(events: Array[String]): Array[String]" in source
+        assert source.index("object TraceMonitor {") < source.index("def eval_batch")
+
+    def test_extend_is_idempotent(self, trace_monitor_source):
+        MonitorExtensions().extend(str(trace_monitor_source))
+        extended_once = trace_monitor_source.read_text()
+
+        MonitorExtensions().extend(str(trace_monitor_source))
+
+        assert trace_monitor_source.read_text() == extended_once
+
+    def test_extend_without_trace_monitor_object(self, tmp_path):
+        source = tmp_path / "Other.scala"
+        source.write_text("object Other {\n}\n")
+
+        assert not MonitorExtensions().extend(str(source))
+        assert source.read_text() == "object Other {\n}\n"
+
+    def test_online_monitor_is_made_resettable(self, trace_monitor_source):
+        MonitorExtensions().extend(str(trace_monitor_source))
+
+        source = trace_monitor_source.read_text()
+        assert "lazy val online_monitor" not in source
+        assert "private def online_monitor: PropertyMonitor = online_monitor_holder.value" in source
+        assert "private def new_online_monitor(): PropertyMonitor = new PropertyMonitor(null)" in source
+        assert "def reset(): Unit" in source
+
+    def test_reset_is_omitted_without_online_monitor_definition(self):
+        source = MonitorExtensions().extend_source("object TraceMonitor {\n  def eval(event: String): String = \"\"\n}\n")
+
+        assert "def eval_batch(" in source
+        assert "def reset()" not in source
+
+    def test_events_are_submitted_through_the_pre_monitor(self):
+        source = MonitorExtensions().extend_source(
+            "object PreMonitor extends PreMonitorTrait {\n"
+            "}\n"
+            "\n"
+            "object TraceMonitor {\n"
+            "  private lazy val online_monitor: PropertyMonitor = new PropertyMonitor(null)\n"
+            "  def eval(event: String): String = {\n"
+            "    val resultMap: Map[String, Boolean] = online_monitor.submit(name, args)\n"
+            "  }\n"
+            "}\n"
+        )
+
+        assert "private lazy val online_monitor: PropertyMonitor = new PropertyMonitor(PreMonitor)" in source
+        assert "online_monitor.preMonitor_(name, args: _*)" in source
+        assert "val resultMap: Map[String, Boolean] = submit_event(name, args)" in source
+        assert "val resultMap: Map[String, Boolean] = online_monitor.submit(" not in source
+        assert "def eval_mask(event: String): Long" in source
+        assert "def reset()" not in source
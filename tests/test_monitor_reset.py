@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import Mock
+
+from pydejavu.core.monitor import Monitor
+from pydejavu.core.verify import Verify
+
+
+class TestMonitorReset:
+    @pytest.fixture
+    def mock_monitor(self):
+        monitor = Mock()
+        monitor.eval.return_value = "a=false"
+        return monitor
+
+    def test_reset_recreates_the_monitor_state(self, mock_monitor):
+        verify = Verify(mock_monitor, i_bits=16, i_mode=None, i_statistics=False, i_reset=True,
+                        i_result_file="out/first")
+        verify.set_shared("counter", 3)
+        mock_monitor.config.reset_mock()
+
+        verify.reset("out/second")
+
+        mock_monitor.reset.assert_called_once_with()
+        mock_monitor.config.assert_called_once_with("16", "None", "False", "out/second")
+        assert verify.get_shared("counter") is None
+
+    def test_reset_keeps_the_handlers(self, mock_monitor):
+        verify = Verify(mock_monitor, i_reset=True)
+
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x + 1
+
+        verify.reset()
+
+        assert verify.process_event("q,1")["Modified Event"] == "q,2"
+
+    def test_reset_keeps_the_result_file(self, mock_monitor):
+        verify = Verify(mock_monitor, i_reset=True, i_result_file="out/first")
+        mock_monitor.config.reset_mock()
+
+        verify.reset()
+
+        assert mock_monitor.config.call_args.args[3] == "out/first"
+
+    def test_reset_without_support(self, mock_monitor):
+        verify = Verify(mock_monitor)
+
+        with pytest.raises(RuntimeError):
+            verify.reset()
+        mock_monitor.reset.assert_not_called()
+
+    def test_monitor_reset_initializes_the_verdicts(self, mock_monitor, tmp_path):
+        monitor = Monitor(i_spec=None, i_isolated=True)
+        monitor._Monitor__m_verify = Verify(mock_monitor, i_reset=True)
+
+        monitor.reset(str(tmp_path / "results" / "trace2"))
+
+        assert (tmp_path / "results").is_dir()
+        mock_monitor.eval.assert_called_with("#init#,")
+        assert monitor.last_eval("a") is False
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import tempfile
+
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.compilation.monitor_workspace import MonitorWorkspace
+from pydejavu.compilation.scala_monitor_compiler import ScalaMonitorCompiler
+from pydejavu.compilation.spec_parser_synthesizer import SpecParserSynthesizer
+from pydejavu.core.monitor import Monitor
+
+
+class TestMonitorWorkspace:
+    def test_workspaces_are_unique(self, tmp_path):
+        first = MonitorWorkspace(i_root=str(tmp_path), i_logger=Mock())
+        second = MonitorWorkspace(i_root=str(tmp_path), i_logger=Mock())
+
+        assert first.directory != second.directory
+        assert os.path.isdir(first.output_dir) and os.path.isdir(second.output_dir)
+        assert first.source == os.path.join(first.directory, "output", "TraceMonitor.scala")
+        assert first.jar == os.path.join(first.directory, "output", "TraceMonitor.jar")
+
+    def test_cleanup_removes_workspace(self, tmp_path):
+        with MonitorWorkspace(i_root=str(tmp_path), i_logger=Mock()) as workspace:
+            directory = workspace.directory
+        assert not os.path.exists(directory)
+
+    def test_synthesis_runs_in_workspace(self, tmp_path):
+        workspace = MonitorWorkspace(i_root=str(tmp_path), i_logger=Mock())
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=Mock())
+        with patch.object(subprocess, 'run', return_value=Mock(stdout="")) as run:
+            synthesizer.parse_and_synthesize("prop p : true", workspace.directory)
+
+        assert run.call_args[1]['cwd'] == workspace.directory
+        assert run.call_args[0][0][2] == f".:{os.path.abspath('dejavu.jar')}"
+
+    def test_compilation_stays_in_workspace(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "Other.class").write_bytes(b"")
+        workspace = MonitorWorkspace(i_root=str(tmp_path), i_logger=Mock())
+        with open(workspace.source, 'w') as source:
+            source.write("object TraceMonitor {\n}\n")
+
+        compiler = ScalaMonitorCompiler(i_dejavu="dejavu.jar", i_source=workspace.source,
+                                        i_dest=workspace.output_dir, i_logger=Mock())
+        with patch.object(subprocess, 'run') as run:
+            assert compiler.compile_monitor(generate_jar=True) == workspace.jar
+
+        assert run.call_args[0][0][-2:] == ["-d", workspace.jar]
+        assert (tmp_path / "Other.class").exists()
+
+    def test_failed_build_removes_the_temporary_workspace(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+        with patch.object(Monitor, 'synthesize_monitor', side_effect=RuntimeError("synthesis failed")), \
+                pytest.raises(RuntimeError):
+            Monitor(i_spec="prop p : true", i_isolated=True, i_cache=False)
+
+        assert os.listdir(tmp_path) == []
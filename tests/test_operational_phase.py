@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import Mock, patch
+from pydejavu.core.compact_verdicts import CompactVerdicts
 from pydejavu.core.monitor import Monitor, event, parser
 from pydejavu.core.verify import Verify
 
@@ -434,3 +435,190 @@ class TestOperationalPhase:
 
         assert result["Modified Event"] == "check_undefined,error"
         assert result["Eval result"] == "a=true,b=false,c=false"
+
+    @pytest.fixture
+    def batch_monitor(self, monitor, mock_monitor):
+        mock_monitor.eval_batch.side_effect = lambda events: ["a=true,b=false,c=true"] * len(events)
+        monitor._Monitor__m_verify = Verify(mock_monitor, i_batch_eval=True)
+        return monitor
+
+    def test_batch_eval_without_handlers(self, batch_monitor, mock_monitor):
+        events = ["p,1", {"name": "q", "args": [2, True]}, "r,3,4"]
+
+        results = batch_monitor.verify.process_events(events)
+
+        mock_monitor.eval_batch.assert_called_once_with(["p,1", "q,2,true", "r,3,4"])
+        mock_monitor.eval.assert_not_called()
+        assert [r["Original Event"] for r in results] == ["p,1", "q,2,true", "r,3,4"]
+        assert [r["Modified Event"] for r in results] == ["p,1", "q,2,true", "r,3,4"]
+        assert all(r["Eval result"] == "a=true,b=false,c=true" for r in results)
+        assert batch_monitor.last_eval("b") == False
+
+    def test_batch_eval_flushes_before_handled_event(self, batch_monitor, mock_monitor):
+        @event("q")
+        def handle_q(arg_y: int):
+            return ["q", arg_y, batch_monitor.last_eval("a")]
+
+        events = ["p,1", "p,2", "q,3", "p,4"]
+
+        results = batch_monitor.verify.process_events(events)
+
+        assert [call.args[0] for call in mock_monitor.eval_batch.call_args_list] == [["p,1", "p,2"], ["p,4"]]
+        mock_monitor.eval.assert_called_once_with("q,3,true")
+        assert [r["Modified Event"] for r in results] == ["p,1", "p,2", "q,3,true", "p,4"]
+
+    def test_batch_eval_error_entries(self, batch_monitor, mock_monitor):
+        mock_monitor.eval_batch.side_effect = lambda events: ["a=false,b=false,c=false", None]
+
+        results = batch_monitor.verify.process_events(["p,1", "p,2"])
+
+        assert results[0]["Eval result"] == "a=false,b=false,c=false"
+        assert results[1]["Eval result"] == "Error in eval"
+        assert batch_monitor.last_eval("a") == False
+
+    def test_dispatch_plan_built_on_registration(self, monitor):
+        @event("typed")
+        def handle_typed(x: int, flag: bool, name: str, extra=None):
+            return ["typed", x + 1, not flag, name]
+
+        plan = monitor.verify.event_mapper.dispatch_map["typed"]
+        assert plan.arity == 3
+        assert plan.converters[:3] == (int, plan.converters[1], str)
+
+        result = monitor.verify.process_event("typed,1,true,bob")
+        assert result["Modified Event"] == "typed,2,false,bob"
+
+    def test_dispatch_plan_replaced_on_re_registration(self, monitor):
+        @event("p")
+        def handle_p_first(arg_x: int):
+            return ["p", arg_x]
+
+        assert monitor.verify.process_event("p,1")["Modified Event"] == "p,1"
+
+        @event("p")
+        def handle_p_second(arg_x: int):
+            return ["p", arg_x * 10]
+
+        assert monitor.verify.process_event("p,1")["Modified Event"] == "p,10"
+
+    def test_dispatch_plan_cast_error(self, monitor):
+        @event("p")
+        def handle_p(arg_x: int):
+            return ["p", arg_x]
+
+        with pytest.raises(TypeError, match="Failed to cast the string 'abc'"):
+            monitor.verify.process_event("p,abc")
+
+    def test_compact_results(self, monitor, mock_monitor):
+        monitor._Monitor__m_verify = Verify(mock_monitor, i_compact_results=True)
+        mock_monitor.eval.side_effect = ["a=true,b=true,c=true", "a=true,b=false,c=true", "a=false,b=true,c=true"]
+
+        @event("w")
+        def handle_w(arg_x: int):
+            return None
+
+        results = monitor.verify(["w,0", "p,1", "p,2", "q,3"])
+
+        assert len(results) == 4
+        assert results.properties == ("a", "b", "c")
+        assert list(results.verdicts("a")) == [-1, 1, 1, 0]
+        assert list(results.verdicts("b")) == [-1, 1, 0, 1]
+        assert results.verdict("b", 2) == False
+        assert results.verdict("a", 0) is None
+        assert results.violations() == [2, 3]
+        assert results.violations("b") == [2]
+        assert results.event(2) == ("p,2", "p,2")
+        assert results.event(1) is None
+        with pytest.raises(KeyError):
+            results.verdicts("undefined_property")
+
+    @pytest.fixture
+    def structured_monitor(self, monitor, mock_monitor):
+        mock_monitor.properties.return_value = ["a", "b", "c"]
+        mock_monitor.eval_mask.return_value = 0b101
+        mock_monitor.eval_batch_mask.side_effect = lambda events: [0b011] * len(events)
+        monitor._Monitor__m_verify = Verify(mock_monitor, i_batch_eval=True, i_structured_eval=True)
+        return monitor
+
+    def test_structured_eval_last_eval(self, structured_monitor, mock_monitor):
+        @event("p")
+        def handle_p(arg_x: int):
+            return ["p", arg_x]
+
+        result = structured_monitor.verify.process_event("p,1")
+
+        mock_monitor.eval.assert_not_called()
+        assert structured_monitor.verify.properties == ("a", "b", "c")
+        assert result["Eval result"] == "a=true,b=false,c=true"
+        assert structured_monitor.last_eval("a") == True
+        assert structured_monitor.last_eval("b") == False
+        assert structured_monitor.last_eval("c") == True
+        with pytest.raises(SystemExit):
+            structured_monitor.last_eval("undefined_property")
+
+    def test_structured_eval_batch(self, structured_monitor, mock_monitor):
+        mock_monitor.eval_batch_mask.side_effect = lambda events: [0b011, -1]
+
+        results = structured_monitor.verify.process_events(["q,1", "q,2"])
+
+        mock_monitor.eval_batch.assert_not_called()
+        assert results[0]["Eval result"] == "a=true,b=true,c=false"
+        assert results[1]["Eval result"] == "Error in eval"
+        assert structured_monitor.last_eval("c") == False
+        assert structured_monitor.get_shared("#last_eval_a#") is None
+
+    def test_trace_ending_in_end_event(self, structured_monitor, mock_monitor, tmp_path):
+        masks = {"p": 0b111, "q": 0b011}
+        mock_monitor.eval_mask.side_effect = lambda event: masks.get(event.split(',')[0], Verify.CONTROL_MASK)
+        mock_monitor.eval_batch_mask.side_effect = lambda events: [
+            masks.get(event.split(',')[0], Verify.CONTROL_MASK) for event in events]
+        trace = tmp_path / "trace.csv"
+        trace.write_text("p,1\nq,2\n#end#\n")
+
+        # The control event reports its own result, and leaves the verdicts of the properties as they are
+        assert list(structured_monitor.iter_violations(str(trace))) == [(1, "c", "q,2", "q,2")]
+        assert structured_monitor.last_eval("b") == True
+        assert structured_monitor.last_eval("c") == False
+        result = structured_monitor.verify.process_event({"name": "#end#", "args": []})
+        assert result["Eval result"] == "#end#=true"
+        assert structured_monitor.last_eval("c") == False
+
+        results = structured_monitor.verify.process_events(["p,1", "#end#"])
+        assert [result["Eval result"] for result in results] == ["a=true,b=true,c=true", "#end#=true"]
+        assert structured_monitor.last_eval("c") == True
+
+        compact = CompactVerdicts(("a", "b", "c"))
+        compact.append("q,2", "q,2", "a=true,b=true,c=false")
+        compact.append("#end#", "#end#", "#end#=true")
+        assert compact.violations() == [0]
+        assert list(compact.verdicts("a")) == [1, -1]
+
+    def test_iter_violations(self, monitor, mock_monitor, tmp_path):
+        mock_monitor.eval.side_effect = ["a=true,b=true,c=true", "a=false,b=true,c=false", "a=true,b=true,c=true"]
+
+        @event("p")
+        def handle_p(arg_x: int):
+            return ["p", arg_x * 2]
+
+        trace = tmp_path / "trace.csv"
+        trace.write_text("p,1\np,2\np,3\n")
+
+        violations = list(monitor.iter_violations(str(trace)))
+
+        assert violations == [(1, "a", "p,2", "p,4"), (1, "c", "p,2", "p,4")]
+        assert violations[0].property_name == "a"
+
+    def test_iter_violations_from_iterable(self, monitor, mock_monitor):
+        mock_monitor.eval.side_effect = ["a=true,b=false,c=true", "Error", "a=true,b=true,c=true"]
+
+        violations = monitor.iter_violations(iter(["p,1", {"name": "q", "args": [2]}, "r,3"]))
+
+        assert next(violations) == (0, "b", "p,1", "p,1")
+        assert list(violations) == []
+
+    def test_control_events_are_not_violations(self, monitor, mock_monitor):
+        mock_monitor.eval.side_effect = ["a=false,b=true,c=true", "a=false,b=true,c=true", "#skip#=false"]
+
+        violations = list(monitor.iter_violations(iter(["#init#", "p,1", "#skip#"])))
+
+        assert violations == [(1, "a", "p,1", "p,1")]
@@ -0,0 +1,110 @@
+from pydejavu.core.property_groups import PropertyGroups
+from pydejavu.core.verify import Verify
+
+
+class FakeGroupConnection:
+    """Stands for the pipe to a group worker, whose monitor reports the verdict of the given properties."""
+
+    def __init__(self, i_properties, i_violated_by=None):
+        self.properties = i_properties
+        self.violated_by = i_violated_by
+        self.requests = []
+        self.__response = None
+
+    def send(self, request):
+        self.requests.append(request)
+        command, payload = request
+        if command == 'eval':
+            self.__response = self.__verdicts(payload)
+        elif command == 'eval_batch':
+            self.__response = [self.__verdicts(event) for event in payload]
+        else:
+            self.__response = None
+
+    def recv(self):
+        return self.__response
+
+    def __verdicts(self, event):
+        verdict = "false" if self.violated_by is not None and event.startswith(self.violated_by) else "true"
+        return ",".join(f"{name}={verdict}" for name in self.properties)
+
+
+class TestPropertyGroups:
+    SPEC = """
+    pred isp(x) = p(x)
+    prop a : forall x . ( isp(x) -> P q(x) )
+    // prop commented : true
+    prop b : forall x . ( q(x) -> P r(x) )
+    prop c : forall x . forall y . ( r(x) -> P ( q(x) & q(y) & p(y) ) )
+    """
+
+    @staticmethod
+    def groups(i_connections, i_properties):
+        groups = object.__new__(PropertyGroups)
+        groups._PropertyGroups__m_workers = [(None, connection) for connection in i_connections]
+        groups._PropertyGroups__m_properties = i_properties
+        return groups
+
+    def test_split_balances_properties(self):
+        groups = PropertyGroups.split(self.SPEC, 2)
+
+        assert len(groups) == 2
+        assert all(group.startswith("pred isp(x) = p(x)") for group in groups)
+        assert "prop c" in groups[0] and "prop c" not in groups[1]
+        assert "prop a" in groups[1] and "prop b" in groups[1]
+        assert groups[1].index("prop a") < groups[1].index("prop b")
+        assert "commented" not in "".join(groups)
+
+    def test_split_into_more_groups_than_properties(self):
+        assert len(PropertyGroups.split(self.SPEC, 8)) == 3
+        assert len(PropertyGroups.split(self.SPEC, 1)) == 1
+
+    def test_handlers_run_once_and_verdicts_are_merged(self):
+        first, second = FakeGroupConnection(["a", "b"]), FakeGroupConnection(["c"], i_violated_by="r")
+        groups = self.groups([first, second], ["a", "b", "c"])
+        verify = Verify(groups, i_batch_eval=True)
+
+        calls = []
+
+        @verify.event("p")
+        def p(x: int):
+            calls.append(x)
+            return "q", x
+
+        results = verify.process_events(["p,1", "q,1", "r,1"])
+
+        assert calls == [1]
+        assert [result["Modified Event"] for result in results] == ["q,1", "q,1", "r,1"]
+        assert [result["Eval result"] for result in results] == \
+            ["a=true,b=true,c=true", "a=true,b=true,c=true", "a=true,b=true,c=false"]
+        assert first.requests == second.requests == [('eval', "q,1"), ('eval_batch', ["q,1", "r,1"])]
+
+    def test_group_failure_marks_error(self):
+        failing = FakeGroupConnection(["c"])
+        failing.recv = lambda: [None]
+        groups = self.groups([FakeGroupConnection(["a"]), failing], ["a", "c"])
+
+        assert groups.eval_batch(["p,1"]) == [None]
+
+    def test_verdicts_follow_the_specification_order(self):
+        spec = """
+        prop a : forall x . ( p(x) -> P q(x) )
+        prop b : forall x . forall y . ( r(x) -> P ( q(x) & q(y) & p(y) ) )
+        prop c : forall x . ( q(x) -> P p(x) )
+        """
+        split = PropertyGroups.split(spec, 2)
+        assert "prop b" in split[0] and "prop a" in split[1] and "prop c" in split[1]
+
+        # The groups interleave the properties, so their verdicts are reordered by the specification
+        groups = self.groups([FakeGroupConnection(["b"]), FakeGroupConnection(["a", "c"], i_violated_by="r")],
+                             ["a", "b", "c"])
+        assert groups.eval("r,1") == "a=false,b=true,c=false"
+        assert groups.eval_batch(["p,1", "r,1"]) == ["a=true,b=true,c=true", "a=false,b=true,c=false"]
+
+    def test_control_events_are_passed_through(self):
+        first, second = FakeGroupConnection(["a", "b"]), FakeGroupConnection(["c"])
+        first.recv = second.recv = lambda: "#end#=true"
+        groups = self.groups([first, second], ["a", "b", "c"])
+
+        assert groups.eval("#end#") == "#end#=true"
+        assert Verify(groups).process_event({"name": "#end#", "args": []})["Eval result"] == "#end#=true"
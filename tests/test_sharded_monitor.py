@@ -0,0 +1,124 @@
+import pickle
+
+import pytest
+
+from pydejavu.core.compact_verdicts import CompactVerdicts
+from pydejavu.core.sharded_monitor import ShardedMonitor
+
+
+class FakeConnection:
+    """The parent end of the pipe to a shard worker, replying in-process."""
+
+    def __init__(self, i_fail_first: bool = False, i_verdict=lambda event: "a=true"):
+        self.fail_first = i_fail_first
+        self.verdict = i_verdict
+        self.replies = []
+
+    def send(self, i_events):
+        if self.fail_first:
+            self.fail_first = False
+            self.replies.append(RuntimeError("JVM crashed"))
+            return
+        verdicts = CompactVerdicts()
+        for event in i_events:
+            verdicts.append(event, event, self.verdict(event))
+        # The replies cross a process boundary
+        self.replies.append(pickle.loads(pickle.dumps(verdicts)))
+
+    def recv(self):
+        return self.replies.pop(0)
+
+
+class TestShardedMonitor:
+    @pytest.fixture
+    def sharded(self):
+        # Bypass the worker processes, which require a JVM
+        sharded = object.__new__(ShardedMonitor)
+        sharded._ShardedMonitor__m_shards = 4
+        sharded._ShardedMonitor__m_partition = {"successful_login": 0, "failed_in_row": 0}
+        return sharded
+
+    def test_infer_partition(self):
+        spec = "prop suspicious_login : forall ip . forall user . " \
+               "( successful_login(ip, user) -> ! P failed_in_row(ip, user) )"
+        assert ShardedMonitor.infer_partition(spec) == {"successful_login": 0, "failed_in_row": 0}
+
+    def test_infer_partition_multiple_properties(self):
+        spec = """
+        prop first : forall x . ( p(x) -> P q(1, x) )
+        // prop commented : forall y . p(y)
+        prop second : forall y . ( r(y) -> P q(2, y) & s(3) )
+        """
+        assert ShardedMonitor.infer_partition(spec) == {"p": 0, "q": 1, "r": 0}
+
+    def test_infer_partition_broadcasts_unkeyed_predicates(self):
+        spec = "prop example : forall x . forall y . ( p(x) -> P q(x, y) & P q(y, y) )"
+        assert ShardedMonitor.infer_partition(spec) == {"p": 0}
+
+    def test_infer_partition_conflicts(self):
+        with pytest.raises(ValueError):
+            ShardedMonitor.infer_partition("prop a : forall x . p(x, 1)\nprop b : forall y . p(2, y)")
+        with pytest.raises(ValueError):
+            ShardedMonitor.infer_partition("prop a : exists x . p(x)")
+
+    def test_shard_of_routes_by_key(self, sharded):
+        shard = sharded.shard_of("successful_login,10.0.0.1,alice")
+
+        assert 0 <= shard < 4
+        assert sharded.shard_of({"name": "failed_in_row", "args": ["10.0.0.1", "bob"]}) == shard
+        assert sharded.shard_of("other,10.0.0.1") is None
+
+    def test_shard_of_with_key_function(self, sharded):
+        sharded._ShardedMonitor__m_partition = lambda event: event.split(',')[-1]
+        assert sharded.shard_of("a,1,key") == sharded.shard_of("b,key")
+
+    def test_merge_verdicts(self):
+        assert ShardedMonitor.merge_verdicts(["a=true,b=false", None, "a=false,b=false"]) == "a=false,b=false"
+        assert ShardedMonitor.merge_verdicts(["a=true,b=true", "a=true,b=true"]) == "a=true,b=true"
+        assert ShardedMonitor.merge_verdicts([None, "Error in eval"]) is None
+
+    def test_failing_shard_does_not_leave_replies_behind(self, sharded):
+        connections = [FakeConnection(i_fail_first=shard == 1) for shard in range(4)]
+        sharded._ShardedMonitor__m_workers = [(None, connection) for connection in connections]
+        events = [f"successful_login,user{i}" for i in range(8)] + ["tick"]
+
+        with pytest.raises(RuntimeError):
+            sharded.verify(events)
+
+        assert all(not connection.replies for connection in connections)
+        verdicts = sharded.verify(events)
+        assert len(verdicts) == len(events)
+        assert verdicts.verdict("a", len(events) - 1) is True
+
+    def test_broadcast_verdicts_are_conjoined(self, sharded):
+        def verdict(event):
+            return None if event == "skipped" else "a=false,b=true" if event.endswith("alice") else "a=true,b=true"
+
+        sharded._ShardedMonitor__m_workers = [(None, FakeConnection(i_verdict=verdict)) for _ in range(4)]
+        shard = sharded.shard_of("successful_login,alice")
+        connections = [connection for _, connection in sharded._ShardedMonitor__m_workers]
+        connections[shard].verdict = lambda event: "a=false,b=true" if event == "tick" else verdict(event)
+        events = ["successful_login,bob", "successful_login,alice", "tick", "skipped"]
+
+        verdicts = sharded.verify(events)
+
+        assert verdicts.properties == ("a", "b")
+        assert [list(verdicts.row(index)) for index in range(4)] == [[1, 1], [0, 1], [0, 1], [-1, -1]]
+        assert verdicts.violations() == [1, 2]
+        assert verdicts.event(2) == ("tick", "tick")
+
+    def test_iter_violations(self, sharded):
+        sharded._ShardedMonitor__m_workers = [
+            (None, FakeConnection(i_verdict=lambda event: "a=false,b=true" if "alice" in event else "a=true,b=true"))
+            for _ in range(4)]
+        events = [f"successful_login,user{i}" for i in range(5)] + ["successful_login,alice"]
+
+        violations = list(sharded.iter_violations(events, i_chunk_size=4))
+
+        assert [(v.index, v.property_name, v.original_event) for v in violations] == \
+            [(5, "a", "successful_login,alice")]
+
+    def test_check_locality(self):
+        ShardedMonitor.check_locality("prop a : forall x . ( p(x) -> P q(x) )\n// prop b : forall x . @ p(x)")
+        with pytest.raises(ValueError):
+            ShardedMonitor.check_locality("prop a : forall x . ( q(x) -> @ p(x) )")
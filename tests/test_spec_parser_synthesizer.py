@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pydejavu.compilation.spec_parser_synthesizer import SpecParserSynthesizer
+
+
+class TestSpecParserSynthesizer:
+    def test_subprocess_is_used_by_default(self):
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=Mock())
+        with patch.object(subprocess, 'run', return_value=Mock(stdout="synthesized")) as run:
+            assert synthesizer.parse_and_synthesize("prop p : true") == "synthesized"
+
+        cmd = run.call_args[0][0]
+        assert cmd[:4] == ["java", "-cp", ".:dejavu.jar", "dejavu.Verify"]
+
+    def test_in_process_synthesis_skips_subprocess(self):
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=Mock(), i_in_process=True)
+        with patch.object(SpecParserSynthesizer, '_SpecParserSynthesizer__synthesize_in_process',
+                          return_value="in process") as in_process, \
+                patch.object(subprocess, 'run') as run:
+            assert synthesizer.parse_and_synthesize("prop p : true") == "in process"
+
+        args = in_process.call_args[0][0]
+        assert args[0] == "--specfile" and args[2:] == ["--execution", "1"]
+        run.assert_not_called()
+
+    def test_in_process_failure_falls_back_to_subprocess(self):
+        logger = Mock()
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=logger, i_in_process=True)
+        with patch.object(SpecParserSynthesizer, '_SpecParserSynthesizer__synthesize_in_process',
+                          side_effect=RuntimeError("no JVM")), \
+                patch.object(subprocess, 'run', return_value=Mock(stdout="synthesized")) as run:
+            assert synthesizer.parse_and_synthesize("prop p : true") == "synthesized"
+
+        run.assert_called_once()
+        logger.warning.assert_called_once()
+
+    def test_operational_spec_is_passed_as_prefile(self):
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=Mock())
+        operational_spec = "initiate\n  c: int := 0\non event p(x: int)\n  c := c + 1\noutput q(c)"
+        contents = {}
+
+        def run(i_cmd, **_):
+            prefile = i_cmd[i_cmd.index("--prefile") + 1]
+            with open(prefile) as f:
+                contents['prefile'] = (prefile, f.read())
+            return Mock(stdout="synthesized")
+
+        with patch.object(subprocess, 'run', side_effect=run):
+            synthesizer.parse_and_synthesize("prop p : true", i_operational_spec=operational_spec)
+
+        prefile, text = contents['prefile']
+        assert prefile.endswith(".pqtl") and text == operational_spec
+        assert not os.path.exists(prefile)
+
+    def test_in_process_specification_error_falls_back_to_subprocess(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        stale = tmp_path / "output" / "TraceMonitor.scala"
+        stale.parent.mkdir()
+        stale.write_text("object TraceMonitor {\n}\n")
+
+        classes = {}
+        jnius = Mock()
+        jnius.autoclass.side_effect = lambda name: classes.setdefault(name, Mock(name=name))
+        options = jnius.autoclass('dejavu.Options')
+        options.UNIT_TEST.return_value = False
+        unit_test = getattr(options, 'UNIT_TEST_$eq')
+
+        def main(_):
+            # DejaVu throws instead of exiting the JVM in its unit test mode
+            assert unit_test.call_args[0] == (True,) and not stale.exists()
+            raise Exception("WF_ERROR")
+
+        jnius.autoclass('dejavu.Verify').main.side_effect = main
+        jnius.autoclass('scala.Console').withOut.side_effect = lambda stream, thunk: thunk.apply()
+        logger = Mock()
+        synthesizer = SpecParserSynthesizer(i_dejavu_jar_path="dejavu.jar", i_logger=logger, i_in_process=True)
+        with patch.dict(sys.modules, {'jnius': jnius}), \
+                patch('pydejavu.jni.jni_config.JNIConfig'), \
+                patch('pydejavu.compilation.spec_parser_synthesizer._scala_thunk_class',
+                      return_value=lambda run: Mock(apply=run)), \
+                patch.object(subprocess, 'run', side_effect=subprocess.CalledProcessError(1, "java")) as run:
+            with pytest.raises(RuntimeError):
+                synthesizer.parse_and_synthesize("prop p : q(")
+
+        run.assert_called_once()
+        assert "WF_ERROR" in logger.warning.call_args[0][0]
+        assert unit_test.call_args[0] == (False,)
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+from unittest.mock import patch
+
+from pydejavu.utils.file_utils import FileUtils
+from pydejavu.utils.trace_index import TraceIndex
+
+
+class TestTraceIndex:
+    CONTENT = (
+        'login,10.0.0.1,alice,true\r\n'
+        '\n'
+        'p,1\n'
+        'msg,"hello, world",2\n'
+        'note,"first line\r\nsecond, line",3\r\n'
+        '   \n'
+        'q,a"b\n'
+        ',\n'
+        '"x,y",1\n'
+        'r,last'
+    )
+
+    @pytest.fixture
+    def trace(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_bytes(self.CONTENT.encode())
+        return str(trace)
+
+    @staticmethod
+    def expected(i_trace):
+        return [event for chunk in FileUtils.read_events_from_file_as_string(i_trace, raw=False) for event in chunk]
+
+    @pytest.mark.parametrize("block_size", [1, 7, 16, 1 << 22])
+    def test_events_are_read_at_their_index(self, trace, block_size):
+        with patch.object(TraceIndex, 'BLOCK_SIZE', block_size):
+            index = TraceIndex.build(trace)
+
+        expected = self.expected(trace)
+        assert len(index) == len(expected)
+        assert [index.event(i) for i in range(len(index))] == expected
+        assert index.events(2, 5) == expected[2:5]
+        assert index.event(-1) == "r,last"
+        assert index.counts == {"login": 1, "p": 1, "msg": 1, "note": 1, "   ": 1, "q": 1, "": 1, "x,y": 1, "r": 1}
+
+    def test_out_of_range_event(self, trace):
+        index = TraceIndex.build(trace)
+
+        with pytest.raises(IndexError):
+            index.event(len(index))
+
+    def test_index_is_saved_beside_the_trace_and_rebuilt_once_stale(self, trace):
+        index = FileUtils.index_trace(trace)
+        assert os.path.exists(TraceIndex.index_path(trace))
+
+        with patch.object(TraceIndex, 'build') as build:
+            loaded = FileUtils.index_trace(trace)
+        build.assert_not_called()
+        assert len(loaded) == len(index) and loaded.counts == index.counts
+        assert loaded.event(3) == index.event(3)
+
+        with open(trace, 'a') as trace_file:
+            trace_file.write('\ns,2\n')
+        assert TraceIndex.load(trace) is None
+        assert FileUtils.index_trace(trace).counts["s"] == 1
+
+    def test_empty_trace(self, tmp_path):
+        trace = tmp_path / "empty.csv"
+        trace.write_text("")
+
+        index = TraceIndex.build(str(trace))
+        assert len(index) == 0 and index.counts == {} and index.chunks(10) == []
+
+    def test_chunks_end_at_event_boundaries(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_text("".join(f"p,{i}\n\n" if i % 3 else f'q,"{i}\n{i}"\n' for i in range(25)))
+
+        index = TraceIndex.build(str(trace))
+        assert index.counts == {"p": 16, "q": 9}
+        chunks = [index.events(start, start + 10) for start in range(0, len(index), 10)]
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert sum(chunks, []) == self.expected(str(trace))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parallel_reader_matches_the_serial_readers(self, trace, workers):
+        chunks = list(FileUtils.read_events_parallel(trace, 4, workers=workers))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+        assert sum(chunks, []) == self.expected(trace)
+
+        events = sum(FileUtils.read_events_parallel(trace, 4, workers=workers, as_dict=True), [])
+        assert events == sum(FileUtils.read_events_from_file_as_dict(trace), [])
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from pydejavu.compilation.monitor_extensions import MonitorExtensions
+from pydejavu.core.verify import Verify
+from pydejavu.jni.handler_callback import HandlerCallback
+
+
+class TestVerifyFile:
+    @pytest.fixture
+    def trace(self, tmp_path):
+        trace = tmp_path / "trace.csv"
+        trace.write_text("p,1\nq,2\n\np,3\n")
+        return str(trace)
+
+    @pytest.fixture
+    def mock_monitor(self):
+        monitor = Mock()
+        monitor.properties.return_value = ["a", "b"]
+        # Bit 0 holds the verdict of 'a', bit 1 the verdict of 'b'
+        masks = {"p": 0b11, "q": 0b01}
+        monitor.eval_mask.side_effect = lambda event: masks.get(event.split(',')[0], 0)
+        monitor.eval_file.return_value = [3, 0, 1, 1]
+        return monitor
+
+    def test_without_handlers_the_file_is_evaluated_by_the_jvm(self, trace, mock_monitor):
+        verify = Verify(mock_monitor, i_structured_eval=True, i_file_eval=True)
+
+        summary = verify.verify_file(trace, 100)
+
+        mock_monitor.eval_file.assert_called_once_with(trace, 100)
+        assert summary.events == 3
+        assert summary.violations == {"a": 0, "b": 1}
+        assert summary.violating_events == [1]
+
+    def test_jvm_calls_back_only_for_handled_events(self, trace, mock_monitor):
+        requests = []
+
+        def eval_file_with(path, max_indices, handled, callback):
+            # The JVM side: handled events go through the callback, the others are evaluated directly
+            for event in ("p,1", "q,2", "q,30", "p,3"):
+                if event.split(',')[0] in handled.split("\n"):
+                    requests.append(event)
+                    callback.apply(f"3\n{event}")
+            return [4, 0, 1, 1]
+
+        mock_monitor.eval_file_with.side_effect = eval_file_with
+        verify = Verify(mock_monitor, i_structured_eval=True, i_file_eval=True)
+        last_evals = []
+
+        @verify.event("q")
+        def handle_q(x: int):
+            last_evals.append(verify.last_eval("b"))
+            return ("q", x) if x > 10 else None
+
+        with patch.object(HandlerCallback, 'java', lambda callback: callback):
+            summary = verify.verify_file(trace)
+
+        assert requests == ["q,2", "q,30"]
+        assert last_evals == [True, True]
+        assert summary.events == 4
+        mock_monitor.eval_file.assert_not_called()
+
+    def test_handler_errors_are_raised_after_the_file(self, trace, mock_monitor):
+        def eval_file_with(path, max_indices, handled, callback):
+            assert callback.apply("0\nq,not_a_number") is None
+            return [1, 0, 0]
+
+        mock_monitor.eval_file_with.side_effect = eval_file_with
+        verify = Verify(mock_monitor, i_structured_eval=True, i_file_eval=True)
+
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x
+
+        with patch.object(HandlerCallback, 'java', lambda callback: callback), pytest.raises(TypeError):
+            verify.verify_file(trace)
+
+    def test_python_path_with_handlers(self, trace, mock_monitor):
+        verify = Verify(mock_monitor, i_structured_eval=True)
+
+        @verify.event("q")
+        def handle_q(x: int):
+            return "q", x
+
+        summary = verify.verify_file(trace)
+
+        assert summary == (3, {"a": 0, "b": 1}, [1])
+
+    def test_python_path_without_support(self, trace, mock_monitor):
+        verify = Verify(mock_monitor, i_structured_eval=True)
+
+        summary = verify.verify_file(trace, 0)
+
+        mock_monitor.eval_file.assert_not_called()
+        assert summary == (3, {"a": 0, "b": 1}, [])
+
+    def test_file_eval_extension_is_injected(self):
+        source = MonitorExtensions().extend_source("object TraceMonitor {\n}\n")
+
+        assert "def eval_file(path: String, maxIndices: Int): Array[Long]" in source